@@ -0,0 +1,198 @@
+"""
+Bus transaction tracer for the SPI and I2C objects handed to the drivers
+
+Wrap the bus, hand the wrapper to the driver and mark the calls to
+profile, either explicitly or by instrumenting the driver's methods:
+
+    tracer = BusTracer()
+    pll = LMX2572(spi=TracedSPI(spi, tracer), cs=cs, en=en)
+    tracer.instrument(pll, ('setup', 'set_freq', 'trigger_calibration'), 'lmx.')
+    ...
+    tracer.report()
+
+The wrappers only bump integer counters per transaction (plus two
+ticks_us reads when bus_time is set). Each operation records the counter
+deltas and elapsed ticks between its begin() and end(); nested operations
+are inclusive, so setup() also counts the traffic of the set_freq() it
+calls. Works with the machine buses on target and the hostshim mocks.
+"""
+
+import time
+
+# Per-operation stats layout: [calls, transactions, bytes, total_us, max_us, bus_us]
+CALLS, TRANSACTIONS, BYTES, TOTAL_US, MAX_US, BUS_US = range(6)
+
+
+class BusTracer:
+    """Counts bus traffic and attributes it to named operations"""
+
+    def __init__(self, bus_time=False):
+        """
+        Args:
+            bus_time: Also time every transaction, to split bus time from CPU time
+        """
+        self.bus_time = bus_time
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_us = 0
+        self.stats = {}
+        self._stack = []
+
+    def reset(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.bus_us = 0
+        self.stats = {}
+        self._stack = []
+
+    def begin(self, name):
+        self._stack.append((name, time.ticks_us(), self.transactions, self.bytes, self.bus_us))
+
+    def end(self):
+        now = time.ticks_us()
+        name, start, transactions, nbytes, bus_us = self._stack.pop()
+        elapsed = time.ticks_diff(now, start)
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = [0, 0, 0, 0, 0, 0]
+        stats[CALLS] += 1
+        stats[TRANSACTIONS] += self.transactions - transactions
+        stats[BYTES] += self.bytes - nbytes
+        stats[TOTAL_US] += elapsed
+        stats[BUS_US] += self.bus_us - bus_us
+        if elapsed > stats[MAX_US]:
+            stats[MAX_US] = elapsed
+        return elapsed
+
+    def call(self, name, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) as operation name and return its result"""
+        self.begin(name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.end()
+
+    def instrument(self, obj, names, prefix=''):
+        """Replace the named methods of obj (on the instance) with traced wrappers
+
+        Operations are recorded as prefix + method name.
+        """
+        for name in names:
+            setattr(obj, name, self._wrap(prefix + name, getattr(obj, name)))
+
+    def _wrap(self, name, fn):
+        def traced(*args, **kwargs):
+            return self.call(name, fn, *args, **kwargs)
+        return traced
+
+    def slowest(self, n=5):
+        """
+        Operations ordered by their slowest call
+
+        Returns:
+            List of (name, calls, transactions, bytes, total_us, max_us, bus_us)
+        """
+        rows = [(name,) + tuple(stats) for name, stats in self.stats.items()]
+        rows.sort(key=lambda row: row[1 + MAX_US], reverse=True)
+        return rows[:n]
+
+    def report(self, n=10):
+        """Print the slowest operations with per-call averages"""
+        print("operation                          calls   txn/call  bytes/call   avg us   max us   bus us")
+        for name, calls, transactions, nbytes, total_us, max_us, bus_us in self.slowest(n):
+            print("{:<32s} {:>6d} {:>10.1f} {:>11.1f} {:>8.1f} {:>8d} {}".format(
+                name, calls, transactions / calls, nbytes / calls, total_us / calls, max_us,
+                "{:>8.1f}".format(bus_us / calls) if self.bus_time else "       -"))
+
+
+class TracedSPI:
+    """machine.SPI wrapper counting transactions and bytes into a BusTracer"""
+
+    def __init__(self, spi, tracer):
+        self.spi = spi
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self.spi, name)
+
+    def _count(self, nbytes, start):
+        tracer = self.tracer
+        tracer.transactions += 1
+        tracer.bytes += nbytes
+        if start is not None:
+            tracer.bus_us += time.ticks_diff(time.ticks_us(), start)
+
+    def write(self, buf):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        self.spi.write(buf)
+        self._count(len(buf), start)
+
+    def write_readinto(self, write_buf, read_buf):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        self.spi.write_readinto(write_buf, read_buf)
+        self._count(len(write_buf), start)
+
+    def read(self, nbytes, write=0x00):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        data = self.spi.read(nbytes, write)
+        self._count(nbytes, start)
+        return data
+
+    def readinto(self, buf, write=0x00):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        self.spi.readinto(buf, write)
+        self._count(len(buf), start)
+
+
+class TracedI2C:
+    """machine.I2C wrapper counting transactions and bytes into a BusTracer
+
+    Byte counts are payload only, without the address and register bytes.
+    """
+
+    def __init__(self, i2c, tracer):
+        self.i2c = i2c
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self.i2c, name)
+
+    def _count(self, nbytes, start):
+        tracer = self.tracer
+        tracer.transactions += 1
+        tracer.bytes += nbytes
+        if start is not None:
+            tracer.bus_us += time.ticks_diff(time.ticks_us(), start)
+
+    def writeto_mem(self, addr, memaddr, buf, **kwargs):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        self.i2c.writeto_mem(addr, memaddr, buf, **kwargs)
+        self._count(len(buf), start)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, **kwargs):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        data = self.i2c.readfrom_mem(addr, memaddr, nbytes, **kwargs)
+        self._count(nbytes, start)
+        return data
+
+    def readfrom_mem_into(self, addr, memaddr, buf, **kwargs):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        self.i2c.readfrom_mem_into(addr, memaddr, buf, **kwargs)
+        self._count(len(buf), start)
+
+    def writeto(self, addr, buf, stop=True):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        acks = self.i2c.writeto(addr, buf, stop)
+        self._count(len(buf), start)
+        return acks
+
+    def readfrom(self, addr, nbytes, stop=True):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        data = self.i2c.readfrom(addr, nbytes, stop)
+        self._count(nbytes, start)
+        return data
+
+    def readfrom_into(self, addr, buf, stop=True):
+        start = time.ticks_us() if self.tracer.bus_time else None
+        self.i2c.readfrom_into(addr, buf, stop)
+        self._count(len(buf), start)
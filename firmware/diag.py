@@ -0,0 +1,136 @@
+"""
+Structured diagnostics for the firmware drivers
+
+Drivers record compact binary events into a preallocated ring buffer
+instead of printing. Every call site is guarded by a level check:
+
+    if diag.level >= diag.DEBUG:
+        diag.log(diag.EV_WRITE, diag.SRC_LMX2572, reg, value)
+
+so with the default level OFF the cost is one attribute load and compare.
+log() itself only stores integers into the preallocated ring and does no
+arithmetic beyond small-int shifts, so it does not allocate and is safe
+to call from an interrupt handler as long as the caller passes small
+ints: on MicroPython (ESP32) values from 2**30 up are heap allocated
+bigints, so interrupt handlers must keep value below 2**30. Every event
+logged from the lock detect IRQ (EV_LOCK, EV_UNLOCK) is a counter.
+
+Record layout (RECORD_WORDS x u32):
+
+    word 0  event << 24 | source << 16 | reg   (event < 64, reg < 2**16)
+    word 1  value                              (u32)
+    word 2  time.ticks_us() at the event      (already below 2**30)
+
+dump() writes the records oldest first after a DUMP_FMT header; decode
+them on the host with tools/diagdecode.py.
+"""
+
+import struct
+import time
+from array import array
+
+# Levels
+OFF = 0
+ERROR = 1
+INFO = 2
+DEBUG = 3
+
+# Events
+EV_WRITE = 1  # reg = register address, value = data written
+EV_READ = 2  # reg = register address, value = data read
+EV_LOCK = 3  # value = lock events so far
+EV_UNLOCK = 4  # value = unlock events so far
+EV_READBACK = 5  # reg = 0, value = new R0 (MUXOUT_LD_SEL toggled for readback)
+EV_FREQ = 6  # reg = FREQ_*, value = frequency
+EV_DIVIDERS = 7  # value = hsdiv << 8 | n1
+EV_ERROR = 8  # reg = ERR_*, value = context
+EV_MISMATCH = 9  # reg = expected data, value = register address << 16 | value read back
+EV_RELOCK = 10  # reg = RELOCK_* method (0 = failed), value = recovery time in us
+
+# Sources
+SRC_LMX2572 = 1
+SRC_SI570 = 2
+
+# EV_FREQ kinds
+FREQ_OUT_HZ = 0
+FREQ_DCO_KHZ = 1
+
+# EV_ERROR codes
+ERR_NOT_INITIALIZED = 1
+ERR_DCO_RANGE = 2
+ERR_NO_DIVIDERS = 3
+ERR_READBACK = 4
+
+RECORD_WORDS = 3
+DUMP_MAGIC = b'DIAG'
+DUMP_VERSION = 2
+DUMP_FMT = '<4sHHII'  # magic, version, record_words, records, dropped
+
+level = OFF
+_ring = None
+_size = 0
+_head = 0  # Next record slot
+_total = 0  # Records logged since the last clear
+
+
+def enable(new_level=DEBUG, size=256):
+    """Start recording at new_level into a ring of size records"""
+    global level, _ring, _size
+    if _ring is None or size != _size:
+        _ring = array('I', [0] * (size * RECORD_WORDS))
+        _size = size
+        clear()
+    level = new_level
+
+
+def disable():
+    """Stop recording; the ring keeps its records for dump()"""
+    global level
+    level = OFF
+
+
+def clear():
+    global _head, _total
+    _head = 0
+    _total = 0
+
+
+def log(event, src, reg, value):
+    """Append one record, overwriting the oldest when the ring is full"""
+    global _head, _total
+    i = _head * RECORD_WORDS
+    _ring[i] = event << 24 | src << 16 | (reg & 0xFFFF)
+    _ring[i + 1] = value
+    _ring[i + 2] = time.ticks_us()
+    _head += 1
+    if _head == _size:
+        _head = 0
+    _total += 1
+
+
+def records():
+    """Yield (event, src, reg, value, ticks_us) oldest first"""
+    if _ring is None:
+        return
+    count = min(_total, _size)
+    start = (_head - count) % _size
+    for n in range(count):
+        i = ((start + n) % _size) * RECORD_WORDS
+        word = _ring[i]
+        yield word >> 24, (word >> 16) & 0xFF, word & 0xFFFF, _ring[i + 1], _ring[i + 2]
+
+
+def dump(path):
+    """Write the header and the records oldest first to path"""
+    count = min(_total, _size)
+    with open(path, 'wb') as f:
+        f.write(struct.pack(DUMP_FMT, DUMP_MAGIC, DUMP_VERSION, RECORD_WORDS, count, _total - count))
+        if count:
+            start = ((_head - count) % _size) * RECORD_WORDS
+            end = _head * RECORD_WORDS
+            if start < end:
+                f.write(_ring[start:end])
+            else:
+                f.write(_ring[start:])
+                f.write(_ring[:end])
+    return count
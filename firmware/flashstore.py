@@ -0,0 +1,228 @@
+"""
+On-flash storage of LMX2572 register images, frequency plans and VCO calibrations
+
+Fixed little-endian layout, read section by section straight into
+preallocated arrays with readinto() so loading does no parsing:
+
+    Header (HEADER_FMT, 52 bytes)
+        magic       4s  b'LMXB'
+        version     H   FORMAT_VERSION
+        header_size H   HEADER_SIZE
+        pfd_num     Q   phase detector frequency numerator (Hz)
+        pfd_den     I   phase detector frequency denominator
+        vco_freq    Q   VCO frequency of the stored image (Hz)
+        vco_sel_freq Q  output frequency of the last VCO selection (Hz)
+        image_words H   register image length (R0..R[n-1]), 0 if absent
+        plan_count  H   frequency plan entries
+        plan_stride H   words per plan entry (FreqPlan.STRIDE)
+        cal_count   H   VCO calibration entries
+        cal_bin_hz  I   VCO calibration bin width (Hz)
+        crc32       I   CRC32 of every byte after the header
+    image       image_words x u16
+    plan words  plan_count x plan_stride x u16
+    plan freqs  plan_count x u32   output frequency (kHz)
+    plan vcos   plan_count x u32   VCO frequency (kHz)
+    cal         cal_count x 4 x u32   (bin, vco_sel, capctrl, daciset)
+
+Plan frequencies are only used for calibration bookkeeping, so kHz
+resolution is enough; the register words themselves are exact. vco_freq
+and vco_sel_freq restore the driver state that set_freq() would have left,
+so relock() and the calibration cache work straight after a restore.
+
+The checksum uses binascii.crc32 where the port has it and a bitwise
+CRC32 with the same result otherwise.
+"""
+
+import struct
+from array import array
+
+try:
+    from binascii import crc32
+except ImportError:
+    crc32 = None
+
+from lmx2572 import FreqPlan, lmx2572_registers_default
+
+MAGIC = b'LMXB'
+FORMAT_VERSION = 3
+HEADER_FMT = '<4sHHQIQQHHHHII'
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+
+# Registers not worth restoring: readback only status words
+_SKIP_RESTORE = (110, 111, 112)
+
+
+class Blob:
+    """Contents of a loaded store; sections that were absent are None"""
+
+    def __init__(self, pfd_num, pfd_den, vco_freq, vco_sel_freq, image, plan, cal, cal_bin_hz):
+        self.pfd_num = pfd_num
+        self.pfd_den = pfd_den
+        self.vco_freq = vco_freq
+        self.vco_sel_freq = vco_sel_freq
+        self.image = image
+        self.plan = plan
+        self.cal = cal
+        self.cal_bin_hz = cal_bin_hz
+
+
+def _crc32(data, value=0):
+    """Bitwise CRC32 (same polynomial and result as binascii.crc32)"""
+    value ^= 0xFFFFFFFF
+    for byte in bytes(data):
+        value ^= byte
+        for _ in range(8):
+            value = (value >> 1) ^ (0xEDB88320 if value & 1 else 0)
+    return value ^ 0xFFFFFFFF
+
+
+def _crc(data, value=0):
+    if crc32 is None:
+        return _crc32(data, value)
+    return crc32(data, value) & 0xFFFFFFFF
+
+
+def register_image(pll):
+    """
+    Snapshot the driver's register cache as a full R0..R125 image
+
+    Registers never written fall back to their defaults; the RESET bit and
+    the readback-only status registers are cleared.
+    """
+    image = array('H', [0] * len(lmx2572_registers_default))
+    registers = pll.registers
+    for reg_data in lmx2572_registers_default:
+        addr = (reg_data >> 16) & 0x7F
+        image[addr] = registers.get(addr, reg_data & 0xFFFF)
+    for addr in _SKIP_RESTORE:
+        image[addr] = 0
+    image[0] &= ~0x2
+    return image
+
+
+def save(path, pll, plan=None, include_image=True):
+    """
+    Write the register image, frequency plan and calibration cache of `pll`
+
+    Args:
+        path: File to write
+        pll: LMX2572 instance, ideally locked on its last known-good frequency
+        plan: Optional FreqPlan to store
+        include_image: Store pll's current register image
+    """
+    image = register_image(pll) if include_image else array('H')
+
+    if plan is not None:
+        words = plan.words
+        freqs = array('I', [f // 1000 for f in plan.freqs])
+        vcos = array('I', [f // 1000 for f in plan.vco_freqs])
+        count = len(plan)
+    else:
+        words, freqs, vcos = array('H'), array('I'), array('I')
+        count = 0
+
+    cache = pll.cal_cache
+    cal = array('I')  # u32 so bin numbers of narrow bins fit
+    bin_hz = 0
+    if cache is not None:
+        bin_hz = cache.bin_hz
+        for key, entry in cache.entries.items():
+            cal.extend((key, entry[0], entry[1], entry[2]))
+
+    sections = (image, words, freqs, vcos, cal)
+    crc = 0
+    for section in sections:
+        crc = _crc(section, crc)
+
+    header = struct.pack(HEADER_FMT, MAGIC, FORMAT_VERSION, HEADER_SIZE,
+                         pll.pfd_num, pll.pfd_den, int(pll.vco_freq),
+                         int(getattr(pll, 'last_vco_sel_freq', 0)), len(image), count,
+                         FreqPlan.STRIDE, len(cal) // 4, bin_hz, crc)
+    with open(path, 'wb') as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+
+
+def load(path):
+    """
+    Read a store written by save()
+
+    Returns:
+        Blob, or None if the file is missing, from another format version,
+        or fails its checksum
+    """
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return None
+    with f:
+        header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE:
+            return None
+        (magic, version, header_size, pfd_num, pfd_den, vco_freq, vco_sel_freq,
+         image_words, count, stride, cal_count, bin_hz, crc) = struct.unpack(HEADER_FMT, header)
+        if magic != MAGIC or version != FORMAT_VERSION or header_size != HEADER_SIZE:
+            return None
+        if count and stride != FreqPlan.STRIDE:
+            return None
+
+        image = array('H', [0] * image_words)
+        words = array('H', [0] * (count * stride))
+        freqs = array('I', [0] * count)
+        vcos = array('I', [0] * count)
+        cal = array('I', [0] * (cal_count * 4))
+
+        check = 0
+        for section in (image, words, freqs, vcos, cal):
+            size = len(section) * section.itemsize
+            if size and f.readinto(section) != size:
+                return None
+            check = _crc(section, check)
+        if check != crc:
+            return None
+
+    plan = None
+    if count:
+        plan = FreqPlan([khz * 1000 for khz in freqs])
+        plan.words = words
+        plan.vco_freqs = [khz * 1000 for khz in vcos]
+
+    return Blob(pfd_num, pfd_den, vco_freq, vco_sel_freq, image if image_words else None, plan,
+                cal if cal_count else None, bin_hz)
+
+
+def restore(pll, blob, timeout_ms=100):
+    """
+    Bring `pll` up from a stored register image
+
+    Reloads the reference configuration, the VCO frequency bookkeeping of
+    the stored image and the calibration cache, resets the chip, writes the image as one burst once the reset has completed (R0
+    last, which starts the calibration) and waits for lock.
+
+    Returns:
+        True if the PLL locked within `timeout_ms`
+    """
+    if blob.image is None:
+        return False
+
+    pll.pfd_num = blob.pfd_num
+    pll.pfd_den = blob.pfd_den
+    pll.pfd_freq = blob.pfd_num / blob.pfd_den
+    pll.vco_freq = blob.vco_freq
+    pll.last_vco_sel_freq = blob.vco_sel_freq
+
+    cache = pll.cal_cache
+    if cache is not None and blob.cal is not None and blob.cal_bin_hz == cache.bin_hz:
+        cal = blob.cal
+        for i in range(0, len(cal), 4):
+            cache.store(cal[i] * cache.bin_hz, cal[i + 1], cal[i + 2], cal[i + 3])
+
+    image = blob.image
+    pll.reset()
+    if not pll.wait_reset():
+        return False
+    pll.write_registers([(addr << 16) | image[addr] for addr in range(len(image))
+                         if addr not in _SKIP_RESTORE], reverse=True)
+
+    return pll.wait_lock(timeout_ms)
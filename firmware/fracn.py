@@ -0,0 +1,120 @@
+"""
+Exact integer fractional-N solver for the LMX2572
+
+The phase detector frequency is kept as the exact rational
+pfd_num / pfd_den (reference * doubler * multiplier over pre-R * R), so
+N + NUM / DEN = f_VCO * pfd_den / pfd_num can be solved with integer
+arithmetic only.
+
+Denominator choice, best first:
+    1. DEN = pfd_num: every integer-Hz VCO frequency is exact and DEN stays
+       constant across hops, so hopping only rewrites NUM and N.
+    2. The reduced fraction, when it fits in max_den.
+    3. The best rational approximation with DEN <= max_den.
+"""
+
+DEN_MAX = 0xFFFFFFFF  # PLL_DEN is 32 bits (R38/R39)
+
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def best_fraction(num, den, max_den):
+    """
+    Best rational approximation of num/den (0 <= num < den) with a bounded denominator
+
+    Args:
+        num: Numerator
+        den: Denominator
+        max_den: Largest denominator allowed
+
+    Returns:
+        (p, q) with q <= max_den minimizing |p/q - num/den|
+    """
+    # Continued fraction convergents h/k with the last semiconvergent check
+    h0, h1 = 0, 1
+    k0, k1 = 1, 0
+    n, d = num, den
+    while d:
+        a = n // d
+        k2 = a * k1 + k0
+        if k2 > max_den:
+            # Largest semiconvergent that still fits
+            t = (max_den - k0) // k1
+            hs, ks = t * h1 + h0, t * k1 + k0
+            # Pick whichever of the semiconvergent and last convergent is closer
+            if abs(hs * den - num * ks) * k1 < abs(h1 * den - num * k1) * ks:
+                return hs, ks
+            return h1, k1
+        h0, h1 = h1, a * h1 + h0
+        k0, k1 = k1, k2
+        n, d = d, n - a * d
+    return h1, k1
+
+
+class FracNSolver:
+    """Integer N/NUM/DEN solver with a small result cache"""
+
+    def __init__(self, max_den=DEN_MAX, cache_size=64):
+        """
+        Args:
+            max_den: Largest PLL_DEN the search may use
+            cache_size: Number of solutions kept before the cache is cleared
+        """
+        self.max_den = max_den
+        self.cache_size = cache_size
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def solve(self, vco_freq, pfd_num, pfd_den=1, den=None):
+        """
+        Solve N/NUM/DEN for a VCO frequency
+
+        Args:
+            vco_freq: VCO frequency in Hz (integer)
+            pfd_num: Numerator of the phase detector frequency in Hz
+            pfd_den: Denominator of the phase detector frequency
+            den: Fixed PLL_DEN, or None to search for the best denominator
+
+        Returns:
+            (N, NUM, DEN, error) where error is the achieved minus the
+            requested VCO frequency in Hz
+        """
+        key = (vco_freq, pfd_num, pfd_den, den)
+        result = self.cache.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+
+        # f_VCO / f_PFD = x / pfd_num
+        x = vco_freq * pfd_den
+        N, rem = divmod(x, pfd_num)
+
+        if den is not None:
+            num = (rem * den * 2 + pfd_num) // (2 * pfd_num)
+        elif pfd_num <= self.max_den:
+            num, den = rem, pfd_num
+        else:
+            g = _gcd(rem, pfd_num)
+            num, den = rem // g, pfd_num // g
+            if den > self.max_den:
+                num, den = best_fraction(rem, pfd_num, self.max_den)
+        if den == 0:
+            num, den = 0, 1
+        if num >= den:
+            N += 1
+            num -= den
+
+        # Achieved minus requested, exact until the final division
+        error = ((N * den + num) * pfd_num - x * den) / (den * pfd_den)
+        result = (N, num, den, error)
+
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        self.cache[key] = result
+        return result
@@ -1,6 +1,15 @@
 import time
+from array import array
 
-lmx2572_registers_default = [
+import diag
+import lmx2572_fast
+from fracn import FracNSolver, DEN_MAX
+
+# Default register image, (addr << 16) | value for R0..R125. Kept as one
+# array('I') rather than a list; register/field descriptions for debug
+# output live in lmx2572_meta and are only imported by describe_register,
+# the ramp and FSK planners by configure_ramp and configure_fsk.
+lmx2572_registers_default = array('I', (
     0x00211C,  # R0
     0x010808,  # R1
     0x020500,  # R2
@@ -127,9 +136,170 @@ lmx2572_registers_default = [
     0x7B0000,  # R123
     0x7C0000,  # R124
     0x7D2288,  # R125
-]
+))
+
+# VCO partial assist table: [fmin MHz, fmax MHz, Cmin, Cmax, Amin, Amax] per VCO core
+ASSIST_TBL = (
+    (3200, 3650, 131, 19, 138, 137),
+    (3650, 4200, 143, 25, 162, 142),
+    (4200, 4650, 135, 34, 126, 114),
+    (4650, 5200, 136, 25, 195, 172),
+    (5200, 5750, 133, 20, 190, 163),
+    (5750, 6400, 151, 27, 256, 204),
+)
+
+# Strange divider table of R75, indexed by the number of /2 output stages
+DIVIDER_TBL = (0, 0, 1, 3, 5, 7, 9, 12, 14)
+
+# Fixed bits of words rebuilt from scratch on every tune, as this driver programs them
+R8_FIXED = 0x6000
+R19_FIXED = 0x2700
+R20_FIXED = 0x4448
+R37_FIXED = 0x0005
+R46_FIXED = 0x07F0
+R75_FIXED = 0x0800
+
+# Registers written by assist_words(), in that order
+ASSIST_REGS = (20, 17, 8, 16, 19, 78)
+
+VCO_CAL_THRESHOLD = 100000000  # 100 MHz threshold for a new VCO calibration
+
+# Power-on value of R125, read back to detect that the chip is responding
+R125_POWER_ON = 0x2288
+
+# Status registers whose readback reflects live chip state
+STATUS_REGISTERS = {55, 110, 111, 112}
+
+# rb_VCO_SEL, rb_VCO_CAPCTRL and rb_VCO_DACISET, read by capture_calibration
+CAL_STATUS_REGISTERS = (110, 111, 112)
+
+# Registers covered by a full readback (R0..R125)
+ALL_REGISTERS = range(126)
+
+# relock() results
+RELOCK_ASSIST = 1  # Locked with the cached full assist values
+RELOCK_FCAL = 2    # Locked after a full FCAL search
+
+# Frequency registers in the order set_freq must write them (N last)
+FREQ_WRITE_ORDER = (78, 75, 46, 45, 39, 38, 43, 42, 36, 34)
 
+# Register fields as (name, register, msb, lsb), bit positions as this driver programs them
+_FIELD_MAP = (
+    ("POWERDOWN", 0, 0, 0),
+    ("RESET", 0, 1, 1),
+    ("MUXOUT_LD_SEL", 0, 2, 2),
+    ("FCAL_EN", 0, 3, 3),
+    ("VCO_PHASE_SYNC", 0, 14, 14),
+    ("RAMP_EN", 0, 15, 15),
+    ("OSC_SINGLE_ENDED", 5, 2, 2),
+    ("IPBUF_TYPE", 5, 12, 11),
+    ("OSC_2X", 9, 12, 12),
+    ("MULT_HI", 9, 14, 14),
+    ("MULT", 10, 11, 7),
+    ("PLL_R", 11, 11, 4),
+    ("PLL_R_PRE", 12, 11, 0),
+    ("CPG", 14, 6, 3),
+    ("VCO_DACISET", 16, 8, 0),
+    ("VCO_DACISET_FORCE", 16, 4, 4),
+    ("VCO_DACISET_STRT", 17, 8, 0),
+    ("VCO_CAPCTRL", 19, 7, 0),
+    ("VCO_CAPCTRL_FORCE", 19, 5, 5),
+    ("VCO_SEL", 20, 13, 11),
+    ("VCO_SEL_FORCE", 20, 4, 4),
+    ("PFD_DLY_SEL", 37, 13, 8),
+    ("OUTA_PWR", 44, 13, 8),
+    ("OUTB_PD", 44, 7, 7),
+    ("OUTA_PD", 44, 6, 6),
+    ("MASH_RESET_N", 44, 5, 5),
+    ("MASH_ORDER", 44, 2, 0),
+    ("OUTA_MUX", 45, 12, 11),
+    ("OUTB_PWR", 45, 5, 0),
+    ("OUTB_MUX", 46, 1, 0),
+    ("INPIN_IGNORE", 58, 15, 15),
+    ("CHDIV", 75, 10, 6),
+    ("QUICK_RECAL_EN", 78, 9, 9),
+    ("VCO_CAPCTRL_STRT", 78, 8, 1),
+    ("FSK_EN", 114, 10, 10),
+    ("FSK_MODE_SEL", 114, 8, 7),
+    ("FSK_SPI_LEVEL", 114, 4, 2),
+)
 
+# Compiled field map: name -> (register, shift, mask)
+FIELDS = {}
+for _name, _reg, _msb, _lsb in _FIELD_MAP:
+    FIELDS[_name] = (_reg, _lsb, ((1 << (_msb - _lsb + 1)) - 1) << _lsb)
+del _FIELD_MAP
+
+
+# IPBUF_TYPE values as set_ref programs them
+IPBUF_DIFF = 1
+IPBUF_SINGLE_ENDED = 2
+
+# R0 control bits, taken from the field map once for the readback and lock paths
+POWERDOWN = FIELDS["POWERDOWN"][2]
+RESET = FIELDS["RESET"][2]
+MUXOUT_LD_SEL = FIELDS["MUXOUT_LD_SEL"][2]
+FCAL_EN = FIELDS["FCAL_EN"][2]
+
+
+def put_field(word, name, value):
+    """Return register word with field `name` replaced by value"""
+    reg, shift, mask = FIELDS[name]
+    return (word & ~mask) | ((value << shift) & mask)
+
+
+def assist_words(vco, C, A, force):
+    """
+    VCO assist words for ASSIST_REGS (R20, R17, R8, R16, R19, R78)
+
+    Args:
+        vco: VCO core (VCO_SEL)
+        C: VCO_CAPCTRL start value
+        A: VCO_DACISET start value
+        force: Force the core, CAPCTRL and DACISET instead of starting FCAL from them
+    """
+    r16 = put_field(0, "VCO_DACISET", A)
+    r19 = put_field(R19_FIXED, "VCO_CAPCTRL", C)
+    if force:
+        r16 = put_field(r16, "VCO_DACISET_FORCE", 1)
+        r19 = put_field(r19, "VCO_CAPCTRL_FORCE", 1)
+    r20 = put_field(put_field(R20_FIXED, "VCO_SEL_FORCE", 1 if force else 0), "VCO_SEL", vco)
+    return (r20, put_field(0, "VCO_DACISET_STRT", A), R8_FIXED, r16, r19,
+            put_field(0, "VCO_CAPCTRL_STRT", C))
+
+
+
+
+class FreqPlan:  
+    """  
+    Precompiled register images for fast frequency hopping  
+    
+    Each entry stores the words of REGS in the order set_freq writes them  
+    (N last), so switching to an entry is a plain run of register writes  
+    with no frequency arithmetic.  
+    """  
+    
+    # Registers captured per plan entry, in write order  
+    REGS = (20, 17, 8, 16, 19, 37, 78, 75, 46, 45, 39, 38, 43, 42, 36, 34)  
+    STRIDE = len(REGS)  
+    NUM_N_WORDS = 4  # PLL_NUM (R43, R42) and PLL_N (R36, R34) close each entry  
+    
+    def __init__(self, freqs):  
+        """  
+        Args:  
+            freqs: Frequencies in Hz, one per plan entry  
+        """  
+        self.freqs = tuple(int(f) for f in freqs)  
+        self.words = array('H', [0] * (self.STRIDE * len(self.freqs)))  
+        self.vco_freqs = [0] * len(self.freqs)  
+    
+    def __len__(self):  
+        return len(self.freqs)  
+    
+    def entry(self, index):  
+        """Return the register words of plan entry `index` as a list"""  
+        base = index * self.STRIDE  
+        return list(self.words[base:base + self.STRIDE])  
 
 
 class LMX2572:  
@@ -140,78 +310,7 @@ class LMX2572:
     via SPI communication.  
     """  
     
-    # Register descriptions dictionary - contains key registers and their functions  
-    REGISTER_DESCRIPTIONS = {  
-        0: "Main control: RAMP_EN, VCO_PHASE_SYNC_EN, FCAL settings, RESET, POWERDOWN",  
-        1: "Calibration clock divider settings",  
-        3: "Reset control: RESET_R123_TO_R4, etc.",  
-        4: "VCO settings and charge pump settings",  
-        5: "Input buffer configuration",  
-        6: "LDO delay settings",  
-        7: "Output force control",  
-        9: "OSC doubler and divider settings",  
-        10: "Charge pump linearity settings",  
-        12: "Analog enables for VCO subsystem",  
-        14: "VCO calibration settings",  
-        17: "Charge pump settings",  
-        19: "Phase detector trim settings",  
-        20: "VCO calibration configuration",  
-        24: "VCO subsystem configuration",  
-        31: "VCO subsystem configuration",  
-        36: "PLL_N: Integer division ratio",  
-        37: "PLL_NUM[31:16]: Upper 16 bits of fractional numerator",  
-        38: "PLL_DEN[31:16]: Upper 16 bits of fractional denominator",  
-        39: "PLL_DEN[15:0]: Lower 16 bits of fractional denominator",  
-        42: "PLL_NUM[31:16]: Upper 16 bits of fractional numerator",  
-        43: "PLL_NUM[15:0]: Lower 16 bits of fractional numerator",  
-        44: "Output power and MASH control settings",  
-        45: "OUTA_MUX and OUTB_PWR settings",  
-        46: "OUTB_MUX settings",  
-        71: "SYSREF configuration",  
-        72: "SYSREF divider",  
-        108: "Status register containing VCO calibration information", 
-        110: "Readback for LD_VTUNE and VCO_SEL",  
-        111: "Readback for VCO_CAPCTRL",  
-        112: "Readback for VCO_DACISET",  
-        114: "FSK mode configuration",  
-    }  
-    
-    # Field descriptions for selected important registers  
-    FIELD_DESCRIPTIONS = {  
-        0: {  
-            "15": "RAMP_EN: Enables frequency ramping (0: Normal, 1: Start ramping)",  
-            "14": "VCO_PHASE_SYNC_EN: Enables phase sync mode",  
-            "9-8": "FCAL_HPFD_ADJ: Fast calibration high PFD adjustment",  
-            "7-6": "FCAL_LPFD_ADJ: Fast calibration low PFD adjustment",  
-            "4": "FCAL_EN: Enables fast calibration (writing 0 is prohibited)",  
-            "2": "MUXOUT_LD_SEL: MUXout function (0: Register readback, 1: Lock detect)",  
-            "1": "RESET: Reset device (0: Normal operation, 1: Reset - self-clearing)",  
-            "0": "POWERDOWN: Power down device (0: Normal operation, 1: Power down)"  
-        },  
-        3: {  
-            "3": "RESET_R123_TO_R4: When set, R4-R123 load from predefined state",  
-        },  
-        36: {  
-            "15-0": "PLL_N: Integer division ratio"  
-        },  
-        44: {  
-            "15-12": "OUTA_PWR: Output A power level",  
-            "11": "OUTB_PD: Output B power down",  
-            "10": "OUTA_PD: Output A power down",  
-            "9": "MASH_RESET_N: MASH reset (active low)",  
-            "2-0": "MASH_ORDER: MASH modulator order (0: Integer-N, 1: MASH1, 2: MASH2, 3: MASH3, 4: MASH4)"  
-        },  
-        45: {  
-            "15-12": "OUTA_MUX: Output A multiplexer",  
-            "3-0": "OUTB_PWR: Output B power level"  
-        },  
-        110: {  
-            "10-9": "rb_LD_VTUNE: Vtune lock detect (0/1: Unlocked, 2: Locked, 3: Invalid)",  
-            "7-5": "rb_VCO_SEL: Selected VCO (1-6)"  
-        }  
-    }  
-    
-    def __init__(self, spi, cs, en, ref_freq=100e6,verbose=False):  
+    def __init__(self, spi, cs, en, ref_freq=100e6,verbose=False, ramp_clk=None, cal_cache=None, ld_pin=None, ramp_dir=None):  
         """  
         Initialize the LMX2572 driver  
         
@@ -221,10 +320,27 @@ class LMX2572:
             pll_select_pin: Pin used to select between synthesizers  
             synthesizer_type: 'txs' or 'los' to indicate which synthesizer this instance represents  
             ref_freq: Reference frequency in Hz  
+            ramp_clk: Optional RAMPCLK pin for manually clocked ramps  
+            cal_cache: Optional vcocal.VcoCalCache for full assist relocking  
+            ld_pin: Optional input pin on SDO/MUXOUT for sampling lock detect  
+            ramp_dir: Optional RAMPDIR pin, used with ramp_clk as FSK_D1/FSK_D0  
         """  
         self.spi = spi  
         self.cs = cs 
         self.en = en
+        self.ramp_clk = ramp_clk
+        self.ramp_dir = ramp_dir
+        self.ramp_info = None  # Last ramp programmed by configure_ramp
+        self.fsk_info = None   # Last FSK plan programmed by configure_fsk
+        
+        # Lock detect sampled from MUXOUT while MUXOUT_LD_SEL = 1
+        self.ld_pin = ld_pin
+        self.lock_callback = None
+        self.lock_irq_enabled = False  # Set by enable_lock_irq, masked during readback
+        self.lock_events = 0    # Lock edges seen by the lock detect IRQ
+        self.unlock_events = 0  # Unlock edges seen by the lock detect IRQ
+        self.last_lock_us = 0   # ticks_us of the last lock edge
+        self.last_unlock_us = 0 # ticks_us of the last unlock edge
     
 
         #Iniitiale conditions
@@ -235,26 +351,77 @@ class LMX2572:
         
         # Initialize the register values from the provided array  
         self.registers = {}  
+        
+        # Shadow of the values the chip actually holds, used to skip redundant writes  
+        self.shadow = {}  
+        self.words_written = 0  # Total SPI register writes issued  
+        self.words_skipped = 0  # Total writes skipped because the chip already held the value  
+        self.last_skipped = 0   # Writes skipped by the last set_freq/set_plan_entry  
+        
+        # Preallocated burst buffer with one 3-byte frame per register address  
+        self._burst = bytearray(3 * 128)  
+        burst_mv = memoryview(self._burst)  
+        self._burst_frames = [burst_mv[i:i + 3] for i in range(0, 3 * 128, 3)]  
+        self._pll_words = array('H', (0,) * len(lmx2572_fast.PLL_REGS))  # set_freq N/NUM/DEN split  
+        
         self.ref_freq = ref_freq  
         self.pfd_freq = ref_freq 
+        # Exact phase detector frequency as the rational pfd_num / pfd_den  
+        self.pfd_num = int(ref_freq)  
+        self.pfd_den = 1  
+        
+        # Fractional-N solver, PLL_DEN is searched unless set_freq is given one  
+        self.solver = FracNSolver()  
+        self.freq_error = 0  # Achieved minus requested output frequency of the last set_freq (Hz)  
+        self.vco_freq = 0    # VCO frequency of the last set_freq (Hz)  
+        
+        # VCO calibration results by frequency bin, consulted before the partial assist table  
+        self.cal_cache = cal_cache  
 
-        self.verbose = verbose  # Verbose output flag
+        # Verbose records register traffic in the diag ring; off keeps the hot path quiet  
+        self.verbose = verbose  
+        if verbose and diag.level < diag.DEBUG:  
+            diag.enable(diag.DEBUG)  
+        
+        # Persistent SPI frame buffers so register access does not allocate  
+        self._tx = bytearray(3)  
+        self._rx = bytearray(3)  
+        self._rb_values = array('H', (0,) * 128)  # Default output of read_registers  
+        self.readback_mismatches = 0  # Registers verify_registers found differing from the shadow  
 
  
         
-    def setup(self, port="A", power=50):  
+    def setup(self, port="A", power=50, freq=5.87e9, lock_timeout_ms=50):  
         """  
         Debug configuration method with simplified output port setup  
         
+        Each step polls for readiness instead of sleeping. The time spent in  
+        every phase is left in boot_report (microseconds):  
+        'reset', 'default_load', 'ref_config', 'output_config', 'first_lock'  
+        and 'total'.  
+        
         Args:  
             port: 'A' or 'B' to specify which port to enable (default: 'A')  
+            power: Output power level (0-63)  
+            freq: First frequency to lock on, pass the final target to avoid a retune  
+            lock_timeout_ms: Maximum time to wait for the first lock  
+            
+        Returns:  
+            True if the PLL locked within lock_timeout_ms  
         """  
+        self.boot_report = {}  
+        t_start = t = time.ticks_us()  
+        
         self.reset()  
-        time.sleep(0.1)  
+        self.wait_reset()  
+        t = self._boot_phase('reset', t)  
+        
         self.configure_default()  
+        t = self._boot_phase('default_load', t)  
+        
         self.set_ref()  
         self.set_osc_single_ended()  
-        time.sleep(0.1)  
+        t = self._boot_phase('ref_config', t)  
         
         # Normalize port to uppercase  
         port = port.upper()  
@@ -267,15 +434,28 @@ class LMX2572:
             # Enable port B with power 50, disable port A  
             self.set_output_port(['B'])  
             self.set_output_power('B', power) 
+        t = self._boot_phase('output_config', t)  
 
-        time.sleep(0.1)
-        self.set_freq(5.87e9)  
-        return self.is_locked()
+        self.set_freq(freq)  
+        locked = self.wait_lock(lock_timeout_ms)  
+        t = self._boot_phase('first_lock', t)  
+        
+        self.boot_report['total'] = time.ticks_diff(t, t_start)  
+        return locked
+    
+    def _boot_phase(self, name, start):  
+        """Record the time since `start` as boot phase `name` and return the current ticks"""  
+        now = time.ticks_us()  
+        self.boot_report[name] = time.ticks_diff(now, start)  
+        return now  
     
 
-    def enable(self):  
+    def enable(self, timeout_ms=10):  
         """  
         Enable the LTC5594 by setting the enable pin high  
+        
+        Waits until the serial interface answers (R125 reads back its  
+        power-on value) or timeout_ms has passed.  
         """  
         if not self.en:  
             return  
@@ -283,8 +463,18 @@ class LMX2572:
         if not self.is_enabled:
             self.en.on()  
             self.is_enabled = True
-
-        time.sleep_ms(10)  # Allow device to initialize  
+            
+            # Allow device to initialize. MUXOUT powers up as lock detect, so  
+            # select readback (without FCAL_EN) before every poll; writes  
+            # sent before the serial interface is up are lost  
+            r0_readback = lmx2572_registers_default[0] & 0xFFFF & ~(MUXOUT_LD_SEL | FCAL_EN)  
+            start = time.ticks_ms()  
+            while True:  
+                self.write_register(0, r0_readback)  
+                if self.read_register(125) == R125_POWER_ON:  
+                    break  
+                if time.ticks_diff(time.ticks_ms(), start) >= timeout_ms:  
+                    break  
 
     def disable(self):
         """  
@@ -296,8 +486,7 @@ class LMX2572:
         if self.is_enabled:
             self.en.off()  
             self.is_enabled = False
-
-        time.sleep_ms(10)
+            self.invalidate_shadow()
           
     
     def configure_default(self, registers=None, reverse=True):  
@@ -313,17 +502,7 @@ class LMX2572:
         if registers is None:  
             registers = lmx2572_registers_default  
         
-        # Create a copy of the registers list to avoid modifying the original  
-        reg_list = list(registers)  
-    
-        # Reverse the list if requested  
-        if reverse:  
-            reg_list.reverse()  
-        
-        for reg_data in reg_list:  
-            reg_addr = (reg_data >> 16) & 0x7F  # Extract address from upper byte  
-            reg_value = reg_data & 0xFFFF       # Extract 16-bit value  
-            self.write_register(reg_addr, reg_value)
+        self.write_registers(registers, reverse)
         
     
     def write_register(self, reg_addr, data):  
@@ -335,12 +514,14 @@ class LMX2572:
             data: 16-bit data to write  
         """  
 
-        # Update local register cache  
+        # Update local register cache and chip shadow  
         self.registers[reg_addr] = data  
+        self.shadow[reg_addr] = data  
+        self.words_written += 1  
         
         # Format: [R/W bit (0) + 7-bit address + 16-bit data]  
         # R/W bit 0 = write  
-        msg = bytearray(3)  
+        msg = self._tx  
         msg[0] = reg_addr & 0x7F  # 7-bit address, R/W bit = 0 for write  
         msg[1] = (data >> 8) & 0xFF  # Upper 8 bits of data  
         msg[2] = data & 0xFF  # Lower 8 bits of data  
@@ -348,6 +529,83 @@ class LMX2572:
         self.cs.value(0)  # Pull CS low to begin transaction  
         self.spi.write(msg)  
         self.cs.value(1)  # Pull CS high to end transaction  
+        
+        if diag.level >= diag.DEBUG:  
+            diag.log(diag.EV_WRITE, diag.SRC_LMX2572, reg_addr, data)  
+    
+    def write_registers(self, reg_list, reverse=False):  
+        """  
+        Write a list of registers as a burst from one preallocated buffer  
+        
+        All frames are packed up front and then clocked out back to back.  
+        The LMX2572 latches each 24-bit word on the rising edge of CS and  
+        has no address auto-increment, so CS still toggles once per frame.  
+        
+        Args:  
+            reg_list: Register data in format [(addr << 16) | value], at most 128 entries;  
+                array('I') images are packed by lmx2572_fast.pack_frames, other  
+                sequences by pack_frames_py  
+            reverse: If True, writes the list from last to first  
+        """  
+        n = len(reg_list)  
+        if n > len(self._burst_frames):  
+            raise ValueError("Burst of {} registers, at most {}".format(n, len(self._burst_frames)))  
+        buf = self._burst  
+        registers = self.registers  
+        shadow = self.shadow  
+        
+        # Pack every frame: [R/W bit (0) + 7-bit address + 16-bit data]  
+        # array('I') images take the viper path when lmx2572_fast has it  
+        if lmx2572_fast.is_word_array(reg_list):  
+            lmx2572_fast.pack_frames(buf, reg_list, n, reverse)  
+        else:  
+            lmx2572_fast.pack_frames_py(buf, reg_list, n, reverse)  
+        for j in range(0, 3 * n, 3):  
+            reg_value = buf[j + 1] << 8 | buf[j + 2]  
+            registers[buf[j]] = reg_value  
+            shadow[buf[j]] = reg_value  
+        
+        # Clock the frames out  
+        cs = self.cs  
+        write = self.spi.write  
+        frames = self._burst_frames  
+        for i in range(n):  
+            cs.value(0)  
+            write(frames[i])  
+            cs.value(1)  
+        
+        self.words_written += n  
+        
+        if diag.level >= diag.DEBUG:  
+            for i in range(n):  
+                j = 3 * i  
+                diag.log(diag.EV_WRITE, diag.SRC_LMX2572, buf[j], buf[j + 1] << 8 | buf[j + 2])  
+    
+    def flush(self, regs):  
+        """  
+        Write the cached value of each register that differs from the chip  
+        
+        Args:  
+            regs: Register addresses, written in the given order  
+            
+        Returns:  
+            Number of writes skipped  
+        """  
+        registers = self.registers  
+        shadow = self.shadow  
+        skipped = 0  
+        for reg_addr in regs:  
+            data = registers[reg_addr]  
+            if shadow.get(reg_addr) == data:  
+                skipped += 1  
+            else:  
+                self.write_register(reg_addr, data)  
+        self.words_skipped += skipped  
+        return skipped  
+    
+    def invalidate_shadow(self):  
+        """Forget what the chip holds so the next flush writes everything"""  
+        self.shadow = {}  
     
     def read_register(self, reg_addr):  
         """  
@@ -360,27 +618,72 @@ class LMX2572:
             16-bit register data  
         """  
         
-        # Check if register is a special case  
-        if reg_addr in [55, 110, 111, 112]:  
-            print(f"Note: Register R{reg_addr} is a special status register")  
-            
-        # Check if readback is enabled  
+        # Switch MUXOUT to readback if lock detect is selected  
+        orig_r0 = self._select_readback()  
+        
+        reg_value = self._read_frame(reg_addr)  
+        
+        # Update local register cache and chip shadow  
+        self.registers[reg_addr] = reg_value  
+        self.shadow[reg_addr] = reg_value  
+        
+        # If we temporarily enabled readback, restore original R0 value  
+        self._restore_readback(orig_r0)  
+        
+        if diag.level >= diag.DEBUG:  
+            diag.log(diag.EV_READ, diag.SRC_LMX2572, reg_addr, reg_value)  
+        
+        return reg_value  
+    
+    def _select_readback(self):  
+        """  
+        Select register readback on MUXOUT if the cache has lock detect selected  
+        
+        R0 is written with FCAL_EN clear, so switching does not restart  
+        the VCO calibration. The lock detect IRQ is detached until  
+        _restore_readback(): when ld_pin is the SDO line, the readback  
+        switch and the data bits would otherwise show up as lock edges.  
+        
+        Returns:  
+            The R0 value to hand to _restore_readback(), None if readback  
+            was already selected  
+        """  
+        if self.lock_irq_enabled:  
+            self.ld_pin.irq(handler=None)  
         r0_value = self.registers.get(0, 0)  
-        if (r0_value & 0x4) != 0:  # Check if MUXOUT_LD_SEL (bit 2) is set  
-            print("Warning: Register readback is disabled. Enabling temporarily.")  
-            # Store original value  
-            orig_r0 = r0_value  
-            # Clear bit 2 temporarily  
-            self.write_register(0, r0_value & ~0x4)  
+        if not r0_value & MUXOUT_LD_SEL:  # Readback already selected  
+            return None  
+        r0_readback = r0_value & ~(MUXOUT_LD_SEL | FCAL_EN)  
+        if diag.level >= diag.DEBUG:  
+            diag.log(diag.EV_READBACK, diag.SRC_LMX2572, 0, r0_readback)  
+        self.write_register(0, r0_readback)  
+        return r0_value  
+    
+    def _restore_readback(self, r0_value):  
+        """Undo _select_readback(), again without FCAL_EN, and reattach the lock IRQ"""  
+        if r0_value is not None:  
+            if diag.level >= diag.DEBUG:  
+                diag.log(diag.EV_READBACK, diag.SRC_LMX2572, 0, r0_value & ~FCAL_EN)  
+            self.write_register(0, r0_value & ~FCAL_EN)  
+            self.registers[0] = r0_value  # Keep FCAL_EN for the next intended R0 write  
+        if self.lock_irq_enabled:  
+            self._attach_lock_irq()  
+    
+    def _read_frame(self, reg_addr):  
+        """  
+        Clock one read frame and return the 16 bits on SDO  
         
+        Does not touch R0, the cache or the shadow: what comes back is  
+        register data only while MUXOUT_LD_SEL = 0 on the chip.  
+        """  
         # Format: [R/W bit (1) + 7-bit address] followed by 16 dummy bits  
         # R/W bit 1 = read  
-        tx_data = bytearray(3)  
+        tx_data = self._tx  
         tx_data[0] = (reg_addr & 0x7F) | 0x80  # 7-bit address, R/W bit = 1 for read  
         tx_data[1] = 0  # Dummy bytes for reading  
         tx_data[2] = 0  
         
-        rx_data = bytearray(3)  
+        rx_data = self._rx  
         
         # Ensure CS is initially high  
         self.cs.value(1)  
@@ -391,24 +694,16 @@ class LMX2572:
         self.cs.value(1)  # Pull CS high to end transaction  
         
         # Extract the 16-bit data (last 2 bytes)  
-        reg_value = (rx_data[1] << 8) | rx_data[2]  
-        
-        # If we temporarily enabled readback, restore original R0 value  
-        if 'orig_r0' in locals():  
-            self.write_register(0, orig_r0)  
-        
-        # Update local register cache  
-        self.registers[reg_addr] = reg_value  
-        
-        return reg_value  
+        return (rx_data[1] << 8) | rx_data[2]  
     
     def enable_readback(self):  
         """Enable register readback by clearing MUXOUT_LD_SEL bit in R0"""  
         r0_value = self.registers.get(0, 0x221C)  
         # Clear bit 2 (MUXOUT_LD_SEL) to enable readback  
-        new_r0_value = r0_value & ~0x4  
+        new_r0_value = put_field(r0_value, "MUXOUT_LD_SEL", 0)  
         
-        print(f"Enabling register readback. R0: 0x{r0_value:04X} → 0x{new_r0_value:04X}")  
+        if diag.level >= diag.INFO:  
+            diag.log(diag.EV_READBACK, diag.SRC_LMX2572, 0, new_r0_value)  
         self.write_register(0, new_r0_value)  
         
         return new_r0_value  
@@ -417,19 +712,143 @@ class LMX2572:
         """Disable register readback by setting MUXOUT_LD_SEL bit in R0"""  
         r0_value = self.registers.get(0, 0x221C)  
         # Set bit 2 (MUXOUT_LD_SEL) to disable readback and enable lock detect on MUXOUT  
-        new_r0_value = r0_value | 0x4  
+        new_r0_value = put_field(r0_value, "MUXOUT_LD_SEL", 1)  
         
-        print(f"Disabling register readback. R0: 0x{r0_value:04X} → 0x{new_r0_value:04X}")  
+        if diag.level >= diag.INFO:  
+            diag.log(diag.EV_READBACK, diag.SRC_LMX2572, 0, new_r0_value)  
         self.write_register(0, new_r0_value)  
         
         return new_r0_value  
     
+    def read_registers(self, regs=ALL_REGISTERS, out=None):  
+        """  
+        Read a block of registers with a single readback switch  
+        
+        If MUXOUT is in lock detect mode, R0 is written once to select  
+        register readback and once at the end to restore it, both with  
+        FCAL_EN clear so the VCO is not recalibrated. All reads reuse the  
+        same frame buffers. Unlike read_register, the register cache and  
+        the shadow are not updated, so the result can be checked against  
+        them (see verify_registers).  
+        
+        Args:  
+            regs: Register addresses to read (default R0..R125)  
+            out: array('H') with room for len(regs) values; defaults to an  
+                internal array that the next call overwrites  
+                
+        Returns:  
+            out, with out[i] holding the value of regs[i]  
+        """  
+        if out is None:  
+            out = self._rb_values  
+        orig_r0 = self._select_readback()  
+        
+        tx = self._tx  
+        rx = self._rx  
+        cs = self.cs  
+        xfer = self.spi.write_readinto  
+        tx[1] = 0  
+        tx[2] = 0  
+        cs.value(1)  
+        n = len(regs)  
+        for i in range(n):  
+            tx[0] = (regs[i] & 0x7F) | 0x80  
+            cs.value(0)  
+            xfer(tx, rx)  
+            cs.value(1)  
+            out[i] = (rx[1] << 8) | rx[2]  
+        
+        self._restore_readback(orig_r0)  
+        
+        if diag.level >= diag.DEBUG:  
+            for i in range(n):  
+                diag.log(diag.EV_READ, diag.SRC_LMX2572, regs[i], out[i])  
+        
+        return out  
+    
+    def verify_registers(self, regs=None, repair=False):  
+        """  
+        Read registers back in bulk and compare them with the shadow  
+        
+        Status registers are skipped. R0 is compared as the chip holds it  
+        during the read, i.e. with readback selected and FCAL_EN clear.  
+        Every mismatch is counted in readback_mismatches and logged as  
+        diag.EV_MISMATCH at ERROR level.  
+        
+        Args:  
+            regs: Register addresses to check (default: every register in the shadow)  
+            repair: Rewrite mismatching registers with their shadow value  
+            
+        Returns:  
+            List of (reg, shadow value, chip value), empty if everything matches  
+        """  
+        shadow = self.shadow  
+        if regs is None:  
+            regs = [reg for reg in sorted(shadow) if reg not in STATUS_REGISTERS]  
+        else:  
+            regs = [reg for reg in regs if reg in shadow and reg not in STATUS_REGISTERS]  
+        values = self.read_registers(regs)  
+        
+        mismatches = []  
+        for i in range(len(regs)):  
+            reg = regs[i]  
+            expected = shadow[reg]  
+            if reg == 0 and expected & MUXOUT_LD_SEL:  
+                expected &= ~(MUXOUT_LD_SEL | FCAL_EN)  
+            if values[i] != expected:  
+                mismatches.append((reg, expected, values[i]))  
+                if diag.level >= diag.ERROR:  
+                    diag.log(diag.EV_MISMATCH, diag.SRC_LMX2572, expected, reg << 16 | values[i])  
+        self.readback_mismatches += len(mismatches)  
+        
+        if repair:  
+            for reg, expected, _ in mismatches:  
+                if reg != 0:  
+                    self.write_register(reg, shadow[reg])  
+        return mismatches  
+    
+    def report_mismatches(self, mismatches):  
+        """Print verify_registers results, one line per register with the differing bits"""  
+        if not mismatches:  
+            print("LMX2572 registers match the shadow")  
+            return  
+        for reg, expected, actual in mismatches:  
+            print("R{:03d} shadow 0x{:04X} chip 0x{:04X} diff 0x{:04X}".format(  
+                reg, expected, actual, expected ^ actual))  
+    
     
     def reset(self):  
         """Reset the device by setting the RESET bit in R0"""  
-        # Get current R0 value, set RESET bit, preserve other bits  
+        # Get current R0 value, set RESET bit, preserve other bits. Readback  
+        # stays selected (MUXOUT_LD_SEL = 0, FCAL_EN = 0) so wait_reset can  
+        # see the RESET bit until the chip clears it  
         r0_value = self.registers.get(0, 0x221C)  # Default if not available  
-        self.write_register(0, r0_value | 0x2)  # Set RESET bit (bit 1)  
+        self.write_register(0, (r0_value | RESET) & ~(MUXOUT_LD_SEL | FCAL_EN))  
+        self.registers[0] = r0_value  # RESET self-clears, keep it out of later R0 writes  
+        self.invalidate_shadow()  # Chip is back to its reset state  
+    
+    def wait_reset(self, timeout_ms=10):  
+        """  
+        Poll R0 until the self-clearing RESET bit reads back as 0  
+        
+        Reads the frame directly: read_register would first rewrite R0  
+        without RESET when the cache has lock detect selected. The lock  
+        detect IRQ is detached while polling, as in _select_readback().  
+        
+        Returns:  
+            True if the reset completed within timeout_ms  
+        """  
+        if self.lock_irq_enabled:  
+            self.ld_pin.irq(handler=None)  
+        start = time.ticks_ms()  
+        done = True  
+        while self._read_frame(0) & RESET:  
+            if time.ticks_diff(time.ticks_ms(), start) >= timeout_ms:  
+                done = False  
+                break  
+        if self.lock_irq_enabled:  
+            self._attach_lock_irq()  
+        return done  
     
     def power_down(self, enable=True):  
         """Power down the device"""  
@@ -438,13 +857,26 @@ class LMX2572:
         
         if enable:  
             # Set POWERDOWN bit  
-            self.write_register(0, r0_value | 0x1)  
+            self.write_register(0, r0_value | POWERDOWN)  
         else:  
             # Clear POWERDOWN bit  
-            self.write_register(0, r0_value & ~0x1)  
+            self.write_register(0, r0_value & ~POWERDOWN)  
     
 
     
+    def describe_register(self, reg_addr):  
+        """  
+        Look up the description of a register and its fields  
+        
+        Imports lmx2572_meta on first use.  
+        
+        Returns:  
+            (description or None, {bits: description})  
+        """  
+        import lmx2572_meta  
+        return (lmx2572_meta.REGISTER_DESCRIPTIONS.get(reg_addr),  
+                lmx2572_meta.FIELD_DESCRIPTIONS.get(reg_addr, {}))  
+    
     def dump_registers(self, start_reg=0, end_reg=125):  
         """  
         Read and display all register values in hex format  
@@ -453,54 +885,23 @@ class LMX2572:
             start_reg: Starting register address (default: 0)  
             end_reg: Ending register address (default: 125)  
         """  
+        # Read everything first so the prints do not stretch the readback window  
+        regs = range(start_reg, end_reg + 1)  
+        values = self.read_registers(regs)  
+        
         print("LMX2572 Register Dump (Hex Values)")  
         print("==================================")  
         
-        # Check if readback is enabled, enable it temporarily if needed  
-        r0_value = self.registers.get(0, 0)  
-        readback_disabled = False  
-        if (r0_value & 0x4) != 0:  # Check if MUXOUT_LD_SEL (bit 2) is set  
-            print("Enabling register readback temporarily")  
-            orig_r0 = r0_value  
-            self.write_register(0, r0_value & ~0x4)  
-            readback_disabled = True  
-        
         # Print register values in groups of 4 per line  
-        for i in range(start_reg, end_reg + 1, 4):  
-            values = []  
-            for reg_addr in range(i, min(i + 4, end_reg + 1)):  
-                try:  
-                    reg_value = self.read_register(reg_addr)  
-                    values.append(f"R{reg_addr:03d}=0x{reg_value:04X}")  
-                except Exception as e:  
-                    values.append(f"R{reg_addr:03d}=ERROR")  
-            
-            print(" | ".join(values))  
-        
-        # Restore original R0 if we temporarily enabled readback  
-        if readback_disabled:  
-            self.write_register(0, orig_r0)  
-            print("Restored original register readback setting")  
+        for i in range(0, len(regs), 4):  
+            print(" | ".join(f"R{regs[j]:03d}=0x{values[j]:04X}" for j in range(i, min(i + 4, len(regs)))))  
 
 
     def simple_register_dump(self):  
         """Minimal register dump showing hex values only"""  
-        
-        # Enable readback if needed  
-        r0 = self.read_register(0)  
-        readback_was_disabled = False  
-        if (r0 & 0x4) != 0:  
-            self.write_register(0, r0 & ~0x4)  
-            readback_was_disabled = True  
-            
-        # Read and display all registers  
-        for reg in range(126):  
-            value = self.read_register(reg)  
-            print(f"R{reg:03d}: 0x{value:04X}")  
-            
-        # Restore original state  
-        if readback_was_disabled:  
-            self.write_register(0, r0)  
+        values = self.read_registers()  
+        for reg in ALL_REGISTERS:  
+            print(f"R{reg:03d}: 0x{values[reg]:04X}")  
 
 
     def set_output(self, enable_a=True, power_a=40, enable_b=False, power_b=40):  
@@ -520,20 +921,10 @@ class LMX2572:
         power_a &= 0x3F  
         power_b &= 0x3F  
         
-        # Configure register 44 for output A  
-        reg44 = 0x22 | (power_a << 8)  
-        if not enable_a:  
-            reg44 |= 0x40  # Set bit 6 to disable output A  
-        if not enable_b:  
-            reg44 |= 0x80  # Set bit 7 to disable output B  
-        
-        # Write register 44  
-        self.write_register(44, reg44)  
-        
-        # Configure and write register 45 for output B  
-        # Preserve upper bits, set lower 6 bits to power_b  
-        reg45 = (self.registers.get(45, 0) & 0xFFC0) | power_b  
-        self.write_register(45, reg45)  
+        # R44: output A power, both power downs and MASH2 out of reset; R45: output B power  
+        self.write_fields(("OUTA_PWR", power_a), ("OUTA_PD", 0 if enable_a else 1),  
+                          ("OUTB_PD", 0 if enable_b else 1), ("MASH_RESET_N", 1),  
+                          ("MASH_ORDER", 2), ("OUTB_PWR", power_b))  
         
         return 0
     
@@ -592,30 +983,112 @@ class LMX2572:
         """  
         Check if the PLL is locked by reading the digital lock detect status  
         
+        With a lock detect pin and MUXOUT in lock detect mode this samples  
+        the pin; otherwise rb_LD_VTUNE is read back over SPI.  
+        
         Returns:  
             Boolean: True if the PLL has achieved digital lock, False otherwise  
         """  
-        # Ensure readback is enabled  
-        r0_value = self.registers.get(0, 0x221C)  
-        temp_enable_readback = False  
-        
-        if (r0_value & 0x4) != 0:  # Check if MUXOUT_LD_SEL (bit 2) is set  
-            # Temporarily enable readback  
-            temp_enable_readback = True  
-            original_r0 = r0_value  
-            self.write_register(0, r0_value & ~0x4)  
+        if self.ld_pin is not None and self.registers.get(0, 0) & MUXOUT_LD_SEL:  
+            return self.ld_pin.value() == 1  
         
-        # Read the status register  
+        # Read the status register, with readback selected only for the read  
         status = self.read_register(110)  
         
-        # Restore original R0 value if we modified it  
-        if temp_enable_readback:  
-            self.write_register(0, original_r0)  
-        
         # Check bits [10:9] for digital lock detect (value of 2)  
         return ((status >> 9) & 3) == 2  
 
     
+    def set_lock_detect(self, enable=True):  
+        """  
+        Select lock detect (MUXOUT_LD_SEL = 1) or register readback on MUXOUT  
+        
+        Args:  
+            enable: True for lock detect, False for register readback  
+        """  
+        r0_value = self.registers.get(0, 0x221C)  
+        self.write_register(0, put_field(r0_value, "MUXOUT_LD_SEL", 1 if enable else 0))  
+    
+    def enable_lock_irq(self, callback=None):  
+        """  
+        Report lock and unlock edges on the lock detect pin  
+        
+        Edges update lock_events/unlock_events and last_lock_us/last_unlock_us.  
+        Edges while MUXOUT is switched to register readback are ignored, and  
+        read_register()/read_registers() detach the IRQ for the whole  
+        readback, so a lock change during a readback is not reported.  
+        
+        Args:  
+            callback: Optional callable(locked, ticks_us) run from the IRQ  
+        """  
+        self.lock_callback = callback  
+        self.lock_irq_enabled = True  
+        self._attach_lock_irq()  
+    
+    def disable_lock_irq(self):  
+        """Stop reporting lock detect edges"""  
+        self.lock_irq_enabled = False  
+        self.ld_pin.irq(handler=None)  
+    
+    def _attach_lock_irq(self):  
+        pin = self.ld_pin  
+        pin.irq(handler=self._lock_irq, trigger=pin.IRQ_RISING | pin.IRQ_FALLING)  
+    
+    def _lock_irq(self, pin):  
+        if not self.registers.get(0, 0) & MUXOUT_LD_SEL:  
+            return  # MUXOUT carries readback data, not lock detect  
+        now = time.ticks_us()  
+        locked = pin.value() == 1  
+        if locked:  
+            self.lock_events += 1  
+            self.last_lock_us = now  
+            if diag.level >= diag.INFO:  
+                diag.log(diag.EV_LOCK, diag.SRC_LMX2572, 0, self.lock_events)  
+        else:  
+            self.unlock_events += 1  
+            self.last_unlock_us = now  
+            if diag.level >= diag.INFO:  
+                diag.log(diag.EV_UNLOCK, diag.SRC_LMX2572, 0, self.unlock_events)  
+        if self.lock_callback is not None:  
+            self.lock_callback(locked, now)  
+    
+    def wait_for_lock(self, timeout_us=50000):  
+        """  
+        Busy-wait on the lock detect pin  
+        
+        Args:  
+            timeout_us: Maximum time to wait in microseconds  
+            
+        Returns:  
+            ticks_us timestamp at which lock was seen, or None on timeout  
+        """  
+        pin = self.ld_pin  
+        start = time.ticks_us()  
+        while True:  
+            now = time.ticks_us()  
+            if pin.value():  
+                return now  
+            if time.ticks_diff(now, start) >= timeout_us:  
+                return None  
+    
+    def wait_lock(self, timeout_ms=50):  
+        """  
+        Poll the lock detect status until locked or timeout  
+        
+        Uses wait_for_lock() when lock detect is available on a pin.  
+        
+        Returns:  
+            True if the PLL locked within timeout_ms  
+        """  
+        if self.ld_pin is not None and self.registers.get(0, 0) & MUXOUT_LD_SEL:  
+            return self.wait_for_lock(timeout_ms * 1000) is not None  
+        
+        start = time.ticks_ms()  
+        while not self.is_locked():  
+            if time.ticks_diff(time.ticks_ms(), start) >= timeout_ms:  
+                return False  
+        return True  
+    
     def read_bit(self, reg_addr, bit_pos):
         """  
         Read a specific bit from a register  
@@ -637,28 +1110,73 @@ class LMX2572:
         """  
         Set or clear a specific bit in a register  
         
+        The cached register is modified and flushed; the chip is not read.  
+        
         Args:  
             reg_addr: Register address (0-127)  
             bit_pos: Bit position to set/clear (0-15)  
             value: Boolean value to set (True for set, False for clear)  
             
         Returns:  
-            0 on success, -1 on failure  
+            0 on success  
         """  
-        # Read the current register value  
-        reg_value = self.read_register(reg_addr)  
-        
-        # Set or clear the specified bit based on the value argument  
+        reg_value = self._cached(reg_addr)  
         if value:  
-            reg_value |= (1 << bit_pos)
-        else:
-            reg_value &= ~(1 << bit_pos)
-        # Write the modified value back to the register
-        self.write_register(reg_addr, reg_value)
-        return 0 if value else -1  # Return 0 on success, -1 on failure
+            reg_value |= (1 << bit_pos)  
+        else:  
+            reg_value &= ~(1 << bit_pos)  
+        self.registers[reg_addr] = reg_value  
+        self.flush((reg_addr,))  
+        return 0  
+    
+    def _cached(self, reg_addr):  
+        """Cached value of a register, the default table value if never written"""  
+        value = self.registers.get(reg_addr)  
+        if value is None:  
+            value = lmx2572_registers_default[reg_addr] & 0xFFFF if reg_addr < len(lmx2572_registers_default) else 0  
+        return value  
+    
+    def set_field(self, name, value):  
+        """  
+        Update a field in the cached registers without touching the chip  
+        
+        Call flush() with the returned register (or use write_fields) to  
+        send the change.  
+        
+        Args:  
+            name: Field name from FIELDS  
+            value: New field value, truncated to the field width  
+            
+        Returns:  
+            Register address holding the field  
+        """  
+        reg, shift, mask = FIELDS[name]  
+        self.registers[reg] = (self._cached(reg) & ~mask) | ((value << shift) & mask)  
+        return reg  
+    
+    def get_field(self, name):  
+        """Value of a field in the cached registers (no SPI read)"""  
+        reg, shift, mask = FIELDS[name]  
+        return (self._cached(reg) & mask) >> shift  
+    
+    def write_fields(self, *fields):  
+        """  
+        Update several fields and write each changed register once  
+        
+        Args:  
+            fields: (name, value) pairs; registers are flushed in the order  
+                    their first field appears  
+            
+        Returns:  
+            Number of register writes skipped because the chip already held the value  
+        """  
+        regs = []  
+        for name, value in fields:  
+            reg = self.set_field(name, value)  
+            if reg not in regs:  
+                regs.append(reg)  
+        return self.flush(regs)  
     
-
-
     
     def set_ref(self, doubler=False, pre_R=1, multiplier=1, R=1, diff=False):  
         """  
@@ -684,49 +1202,34 @@ class LMX2572:
         multiplier &= 0x1F   # 5-bit multiplier  
         R &= 0xFF           # 8-bit R  
         
-        # Calculate PFD frequency  
-        self.pfd_freq = self.ref_freq * multiplier // pre_R // R  
-        
-        # Configure register 11 (R divider)  
-        self.registers[11] = 0xB008 | (R << 4)  
-        
-        # Configure register 10 (multiplier and pre-R)  
-        self.registers[10] = 0x1078 | (multiplier << 7)  
-        
-        # Configure register 9 (doubler and high/low frequency selector)  
-        self.registers[9] = 0x4  
-        if doubler:  
-            self.registers[9] |= 0x1000  
-        if self.pfd_freq > 100000000:  # 100 MHz threshold  
-            self.registers[9] |= 0x4000  
-        
-        # Write registers 9-11  
-        for i in range(9, 12):  
-            self.write_register(i, self.registers[i])  
+        # Calculate PFD frequency, kept exact as pfd_num / pfd_den  
+        self.pfd_num = int(self.ref_freq) * multiplier  
+        self.pfd_den = pre_R * R  
+        self.pfd_freq = self.pfd_num / self.pfd_den  
         
-        # Configure register 5 for differential/single-ended input  
-        self.registers[5] = 0x28C8 if diff else 0x30C8  
-        self.write_register(5, self.registers[5])  
+        # R9: doubler and the high frequency selector above a 100 MHz PFD,  
+        # R10-R12: multiplier, R and pre-R dividers, R5: input buffer type  
+        self.write_fields(("OSC_2X", 1 if doubler else 0),  
+                          ("MULT_HI", 1 if self.pfd_freq > 100000000 else 0),  
+                          ("MULT", multiplier), ("PLL_R", R), ("PLL_R_PRE", pre_R),  
+                          ("IPBUF_TYPE", IPBUF_DIFF if diff else IPBUF_SINGLE_ENDED))  
         
         return 0  
     
 
-    def set_freq(self, freq, sync_en=False, force_vco=False):  
+    def _calc_pll(self, freq, sync_en=False, den=None):  
         """  
-        Configure LMX2572 to output the specified frequency  
+        Work out the output divider, VCO frequency and N/FRAC for a frequency  
         
         Args:  
-            freq: Desired output frequency in Hz  
-            sync_en: Enable VCO phase synchronization mode  
-            force_vco: Enable manual VCO parameter override to reduce spurs  
-                
+            freq: Desired output frequency in Hz (integer)  
+            sync_en: VCO phase synchronization mode  
+            den: Fixed PLL_DEN, or None to let the solver pick it  
+            
         Returns:  
-            0 on success, -1 on failure  
+            (div, vco_freq, N, FRAC, denum, error), or None if out of range.  
+            error is the achieved minus requested output frequency in Hz.  
         """  
-        # Make sure we're working with integers  
-        freq = int(freq)  
-        denum = 0xFFFFFF  
-        
         # Allowed VCO range: 3.2G to 6.4G  
         vco_freq = freq  
         div = 0  
@@ -735,38 +1238,32 @@ class LMX2572:
             vco_freq *= 2  
         
         if div > 8:  
-            return -1  
+            return None  
         
         if sync_en and freq < 3200000000:  
             vco_freq //= 2  
         
-        # Make sure all calculations result in integers  
-        N = int(vco_freq // self.pfd_freq)  
-        FRAC = int((vco_freq - N * self.pfd_freq) * denum // self.pfd_freq)  
+        # Exact integer N/FRAC/DEN from the reference chain  
+        N, FRAC, denum, error = self.solver.solve(vco_freq, self.pfd_num, self.pfd_den, den)  
         
         if sync_en and freq < 3200000000:  
             vco_freq *= 2  
+            error *= 2  
         
-        self.registers[34] = ((N >> 16) & 0x7) | 0x10  
-        self.registers[36] = N & 0xFFFF  
-        self.registers[38] = denum >> 16  
-        self.registers[39] = denum & 0xFFFF  
-        self.registers[42] = FRAC >> 16  
-        self.registers[43] = FRAC & 0xFFFF  
-        self.registers[45] = ((0x0800 if div == 0 else 0) | (self.registers[45] & 0xE7FF))  # OUT_A MUX  
-        self.registers[46] = 0x07F1 if div == 0 else 0x07F0                               # OUT_B MUX  
-        
-        # Strange divider table of R75  
-        divider_tbl = [0, 0, 1, 3, 5, 7, 9, 12, 14]  
-        self.registers[75] = 0x0800 | (divider_tbl[div] << 6)  
-        
-        # Check if we need to recalibrate the VCO  
-        if not hasattr(self, 'last_vco_sel_freq'):  
-            self.last_vco_sel_freq = 0  
-        
-        VCO_CAL_THRESHOLD = 100000000  # 100 MHz threshold  
-        freq_delta = abs(self.last_vco_sel_freq - freq)  
+        return div, vco_freq, N, FRAC, denum, error / (1 << div)  
+    
+    def _calc_assist(self, freq, vco_freq, force_vco=False):  
+        """  
+        Interpolate the partial assist VCO core and C/A start values  
         
+        Args:  
+            freq: Output frequency in Hz  
+            vco_freq: VCO frequency in Hz  
+            force_vco: Enable manual VCO parameter override  
+            
+        Returns:  
+            (vco, C, A, force) where force is True when the force bits are set  
+        """  
         # Convert to MHz for easier comparison  
         freq_mhz = freq / 1000000  
         vco_freq_mhz = vco_freq / 1000000  
@@ -774,125 +1271,419 @@ class LMX2572:
         # Detect problematic frequency range (~5.81-5.99 GHz with 6.9 GHz leakage)  
         problematic_range = (5810 <= freq_mhz <= 5990)  
         
-        if freq_delta > VCO_CAL_THRESHOLD or force_vco:  
-            self.last_vco_sel_freq = freq  
-            self.registers[78] &= ~0x200  
-                
-            # Partial Assist  
-            mhz = int(vco_freq // 1000000)  
-            assist_tbl = [  
-                [3200, 3650, 131, 19, 138, 137],  
-                [3650, 4200, 143, 25, 162, 142],  
-                [4200, 4650, 135, 34, 126, 114],  
-                [4650, 5200, 136, 25, 195, 172],  
-                [5200, 5750, 133, 20, 190, 163],  
-                [5750, 6400, 151, 27, 256, 204],  
-            ]  
-                
-            select = -1  
-            for i in range(6):  
-                if mhz >= assist_tbl[i][0] and mhz <= assist_tbl[i][1]:  
-                    select = i  
+        # Partial Assist  
+        mhz = int(vco_freq // 1000000)  
+        assist_tbl = ASSIST_TBL  
             
-            if mhz > 6400:  
-                select = 5  
+        select = -1  
+        for i in range(6):  
+            if mhz >= assist_tbl[i][0] and mhz <= assist_tbl[i][1]:  
+                select = i  
+        
+        if mhz > 6400:  
+            select = 5  
+        
+        fmin, fmax, cmin, cmax, amin, amax = assist_tbl[select]  
+            
+        # Calculate C and A values for VCO selection - ensure integer result  
+        C = int(0.5 + cmin - float(mhz - fmin) * (cmin - cmax) / (fmax - fmin))  
+        A = int(0.5 + amin - float(mhz - fmin) * (amin - amax) / (fmax - fmin))  
+        vco = select + 1  
             
-            fmin = assist_tbl[select][0]  
-            fmax = assist_tbl[select][1]  
-            cmin = assist_tbl[select][2]  
-            cmax = assist_tbl[select][3]  
-            amin = assist_tbl[select][4]  
-            amax = assist_tbl[select][5]  
+        C += 10  
+        
+        # === VCO FORCE MODE HANDLING ===  
+        force = problematic_range or force_vco  
+        if force:  
+            # Force values to use a different VCO band to avoid the 6.9 GHz leakage  
+            # For the 5.81-5.99 GHz range, try using VCO from lower band  
+            if 5750 <= vco_freq_mhz <= 6400:  
+                # Force to a different VCO configuration  
+                vco = 5  # Use band 5 instead of 6  
                 
-            # Calculate C and A values for VCO selection - ensure integer result  
-            C = int(0.5 + cmin - float(mhz - fmin) * (cmin - cmax) / (fmax - fmin))  
-            A = int(0.5 + amin - float(mhz - fmin) * (amin - amax) / (fmax - fmin))  
-            vco = select + 1  
+                # Adjust tuning parameters - these may need experimentation  
+                C += 5  
+                A -= 10  
+        
+        return vco, C, A, force  
+    
+    def _assist_for(self, freq, vco_freq, force_vco=False):  
+        """  
+        VCO start values for a tune, preferring a cached calibration  
+        
+        A cache hit returns the stored VCO core, capacitor code and DAC  
+        current with force set, so the chip relocks with full assist.  
+        Otherwise falls back to the partial assist interpolation.  
+        """  
+        if self.cal_cache is not None:  
+            cached = self.cal_cache.lookup(vco_freq)  
+            if cached is not None:  
+                vco, C, A = cached  
+                return vco, C, A, True  
+        return self._calc_assist(freq, vco_freq, force_vco)  
+
+    def set_freq(self, freq, sync_en=False, force_vco=False, den=None):  
+        """  
+        Configure LMX2572 to output the specified frequency  
+        
+        Args:  
+            freq: Desired output frequency in Hz  
+            sync_en: Enable VCO phase synchronization mode  
+            force_vco: Enable manual VCO parameter override to reduce spurs  
+            den: Fixed PLL_DEN, or None to pick the most exact denominator  
                 
-            C += 10  
-            
-            # === VCO FORCE MODE HANDLING ===  
-            if problematic_range or force_vco:  
-                # Force values to use a different VCO band to avoid the 6.9 GHz leakage  
-                # For the 5.81-5.99 GHz range, try using VCO from lower band  
-                if 5750 <= vco_freq_mhz <= 6400:  
-                    # Force to a different VCO configuration  
-                    vco = 5  # Use band 5 instead of 6  
-                    
-                    # Adjust tuning parameters - these may need experimentation  
-                    C += 5  
-                    A -= 10  
-                    
-                # Set force bits in registers  
-                self.registers[20] = self.registers.get(20, 0) | (1 << 4)  # VCO_SEL_FORCE = 1  
-                self.registers[19] = self.registers.get(19, 0) | (1 << 5)  # VCO_CAPCTRL_FORCE = 1  
-                self.registers[16] = self.registers.get(16, 0) | (1 << 4)  # VCO_DACISET_FORCE = 1  
-            else:  
-                # Normal operation - ensure force bits are cleared  
-                self.registers[20] = self.registers.get(20, 0) & ~(1 << 4)  # VCO_SEL_FORCE = 0  
-                self.registers[19] = self.registers.get(19, 0) & ~(1 << 5)  # VCO_CAPCTRL_FORCE = 0  
-                self.registers[16] = self.registers.get(16, 0) & ~(1 << 4)  # VCO_DACISET_FORCE = 0  
+        Returns:  
+            0 on success, -1 on failure  
+        """  
+        # Make sure we're working with integers  
+        freq = int(freq)  
+        skipped = 0  
+        
+        pll = self._calc_pll(freq, sync_en, den)  
+        if pll is None:  
+            return -1  
+        div, vco_freq, N, FRAC, denum, self.freq_error = pll  
+        self.vco_freq = vco_freq  
+        
+        # R34/R36 (N), R38/R39 (DEN), R42/R43 (NUM)  
+        pll_words = self._pll_words  
+        lmx2572_fast.split_pll(pll_words, N, FRAC, denum)  
+        registers = self.registers  
+        for i, reg in enumerate(lmx2572_fast.PLL_REGS):  
+            registers[reg] = pll_words[i]  
+        self.registers[45] = put_field(self.registers[45], "OUTA_MUX", 1 if div == 0 else 0)  
+        self.registers[46] = put_field(R46_FIXED, "OUTB_MUX", 1 if div == 0 else 0)  
+        
+        # Strange divider table of R75  
+        self.registers[75] = put_field(R75_FIXED, "CHDIV", DIVIDER_TBL[div])  
+        
+        # Check if we need to recalibrate the VCO  
+        if not hasattr(self, 'last_vco_sel_freq'):  
+            self.last_vco_sel_freq = 0  
+        
+        freq_delta = abs(self.last_vco_sel_freq - freq)  
+        
+        if freq_delta > VCO_CAL_THRESHOLD or force_vco:  
+            self.last_vco_sel_freq = freq  
             
-            # Continue with register setup  
-            self.registers[78] = 0x000 | (C << 1)  
-            self.registers[20] = (self.registers[20] & (1 << 4)) | 0x4448 | (vco << 11)  # Preserve force bit  
-            self.registers[17] = A  
-            self.registers[8] = 0x6000  
-            self.write_register(20, self.registers[20])  
-            self.write_register(17, self.registers[17])  
-            self.write_register(8, self.registers[8])  
-                
-            # Full calibration  
-            self.registers[16] = (self.registers[16] & (1 << 4)) | A  # Preserve force bit  
-            self.registers[19] = (self.registers[19] & (1 << 5)) | 0x2700 | C  # Preserve force bit  
-            self.write_register(16, self.registers[16])  
-            self.write_register(19, self.registers[19])  
+            # Start values (or, forced, the final values) for the VCO core,  
+            # CAPCTRL and DACISET; R78 also clears QUICK_RECAL_EN  
+            vco, C, A, force = self._assist_for(freq, vco_freq, force_vco)  
+            words = assist_words(vco, C, A, force)  
+            for i, reg in enumerate(ASSIST_REGS):  
+                registers[reg] = words[i]  
+            skipped += self.flush((20, 17, 8, 16, 19))  # R78 goes out with FREQ_WRITE_ORDER  
         else:  
-            self.registers[78] |= 0x200  
+            registers[78] = put_field(registers[78], "QUICK_RECAL_EN", 1)  
             
         # Set PFD delay based on VCO frequency  
         pfd_dly_needed = 2 if vco_freq > 4000000000 else 1  
             
         # Get current value with default of 0 if not set  
         curr_reg37 = self.registers.get(37, 0)  
-        if ((curr_reg37 >> 8) & 0x3F) != pfd_dly_needed:  
-            self.registers[37] = (pfd_dly_needed << 8) | 5  
+        _, shift, mask = FIELDS["PFD_DLY_SEL"]  
+        if (curr_reg37 & mask) >> shift != pfd_dly_needed:  
+            self.registers[37] = put_field(R37_FIXED, "PFD_DLY_SEL", pfd_dly_needed)  
             self.write_register(37, self.registers[37])  
             
-        # Write registers in specific order  
-        self.write_register(78, self.registers[78])  
-        self.write_register(75, self.registers[75])  
-        self.write_register(46, self.registers[46])  
-        self.write_register(45, self.registers[45])  
-        self.write_register(39, self.registers[39])  
-        self.write_register(38, self.registers[38])  
-        self.write_register(43, self.registers[43])  
-        self.write_register(42, self.registers[42])  
-        self.write_register(36, self.registers[36])  
-        self.write_register(34, self.registers[34])  # Write N last  
+        # Write changed registers in specific order, N last  
+        skipped += self.flush(FREQ_WRITE_ORDER)  
             
         # Sync mode configuration  
         if sync_en:  
-            self.registers[58] &= ~(1 << 15)  
-            self.registers[0] |= 1 << 14  
+            self.registers[58] = put_field(self.registers[58], "INPIN_IGNORE", 0)  
+            self.registers[0] = put_field(self.registers[0], "VCO_PHASE_SYNC", 1)  
             self.registers[69] = 0  
             self.registers[70] = 30000  
-            self.write_register(58, self.registers[58])  
-            self.write_register(69, self.registers[69])  
-            self.write_register(70, self.registers[70])  
+            skipped += self.flush((58, 69, 70))  
         else:  
-            self.registers[58] |= 1 << 15  
-            self.registers[0] &= ~(1 << 14)  
-            self.write_register(0, self.registers[0])  # FCAL_EN = 1  
-            
-        self.write_register(58, self.registers[58])  
+            self.registers[58] = put_field(self.registers[58], "INPIN_IGNORE", 1)  
+            self.registers[0] = put_field(self.registers[0], "VCO_PHASE_SYNC", 0)  
+            self.write_register(0, self.registers[0])  # FCAL_EN = 1, always written to start FCAL  
+            skipped += self.flush((58,))  
             
+        self.last_skipped = skipped  
         return 0
     
+    def compile_freq_plan(self, freqs, force_vco=False):  
+        """  
+        Precompute register images for a list of frequencies  
+        
+        The images depend on the reference and output configuration, so  
+        compile the plan after setup()/set_ref()/set_output().  
+        
+        Args:  
+            freqs: Iterable of output frequencies in Hz  
+            force_vco: Enable manual VCO parameter override for every entry  
+            
+        Returns:  
+            FreqPlan to pass to set_plan_entry()  
+        """  
+        plan = FreqPlan(freqs)  
+        words = plan.words  
+        words_mv = memoryview(words)  
+        reg45 = self.registers.get(45, 0)  
+        
+        for i, freq in enumerate(plan.freqs):  
+            pll = self._calc_pll(freq)  
+            if pll is None:  
+                raise ValueError("Frequency out of range: {}".format(freq))  
+            div, vco_freq, N, FRAC, denum, error = pll  
+            vco, C, A, force = self._assist_for(freq, vco_freq, force_vco)  
+            plan.vco_freqs[i] = vco_freq  
+            
+            base = i * plan.STRIDE  
+            # R20, R17, R8, R16, R19 ahead of R37, R78 last of the assist words  
+            r20, r17, r8, r16, r19, r78 = assist_words(vco, C, A, force)  
+            words[base + 0] = r20  
+            words[base + 1] = r17  
+            words[base + 2] = r8  
+            words[base + 3] = r16  
+            words[base + 4] = r19  
+            words[base + 5] = put_field(R37_FIXED, "PFD_DLY_SEL", 2 if vco_freq > 4000000000 else 1)  
+            words[base + 6] = r78  
+            words[base + 7] = put_field(R75_FIXED, "CHDIV", DIVIDER_TBL[div])  
+            words[base + 8] = put_field(R46_FIXED, "OUTB_MUX", 1 if div == 0 else 0)  
+            words[base + 9] = put_field(reg45, "OUTA_MUX", 1 if div == 0 else 0)  
+            # R39, R38, R43, R42, R36, R34 in lmx2572_fast.PLL_REGS order  
+            lmx2572_fast.split_pll(words_mv[base + 10:base + 16], N, FRAC, denum)  
+        
+        return plan  
+    
+    def set_plan_entry(self, plan, index):  
+        """  
+        Switch to a precompiled frequency plan entry  
+        
+        Writes the stored register words that differ from the chip (N last)  
+        followed by R0 to start the calibration, equivalent to  
+        set_freq(plan.freqs[index]).  
+        
+        Args:  
+            plan: FreqPlan from compile_freq_plan()  
+            index: Entry number  
+            
+        Returns:  
+            0 on success  
+        """  
+        skipped = self.write_plan_words(plan, index)  
+        self.start_plan_entry(plan, index)  
+        
+        self.words_skipped += skipped  
+        self.last_skipped = skipped  
+        return 0  
+    
+    def write_plan_words(self, plan, index, start=0, stop=None):  
+        """  
+        Write part of a plan entry's register words  
+        
+        Writes the words start..stop-1 of the entry that differ from the  
+        chip. Starting at word 0 first sets INPIN_IGNORE in R58, so a SYNC  
+        edge cannot act on the part while it is being retuned. Follow the  
+        last word with start_plan_entry(); set_plan_entry() does both.  
+        
+        Args:  
+            plan: FreqPlan from compile_freq_plan()  
+            index: Entry number  
+            start: First word to write  
+            stop: Word after the last one to write, None for the end of the entry  
+            
+        Returns:  
+            Number of writes skipped because the chip already held the word  
+        """  
+        skipped = 0  
+        if start == 0:  
+            self.registers[58] = put_field(self.registers[58], "INPIN_IGNORE", 1)  
+            skipped = self.flush((58,))  
+        regs = plan.REGS  
+        words = plan.words  
+        shadow = self.shadow  
+        base = index * plan.STRIDE  
+        for k in range(start, plan.STRIDE if stop is None else stop):  
+            reg_addr = regs[k]  
+            data = words[base + k]  
+            if shadow.get(reg_addr) == data:  
+                skipped += 1  
+            else:  
+                self.write_register(reg_addr, data)  
+        return skipped  
+    
+    def start_plan_entry(self, plan, index):  
+        """  
+        Write R0 to calibrate onto a plan entry written by write_plan_words()  
+        
+        Args:  
+            plan: FreqPlan from compile_freq_plan()  
+            index: Entry number  
+        """  
+        self.last_vco_sel_freq = plan.freqs[index]  
+        self.vco_freq = plan.vco_freqs[index]  
+        self.registers[0] = put_field(self.registers[0], "VCO_PHASE_SYNC", 0)  
+        self.write_register(0, self.registers[0])  # FCAL_EN = 1  
+    
+    def arm_phase_sync(self, calibrate=False):  
+        """  
+        Arm VCO phase synchronization for the next SYNC pin edge  
+        
+        Enables the SYNC input (clears INPIN_IGNORE in R58), writes the  
+        phase sync registers and sets VCO_PHASE_SYNC_EN in R0. R0 goes out  
+        with FCAL_EN clear, so a locked part stays locked; pass calibrate  
+        after set_freq(sync_en=True) to start the FCAL for the new frequency  
+        and wait for lock before the SYNC edge.  
+        """  
+        self.registers[58] = put_field(self.registers[58], "INPIN_IGNORE", 0)  
+        self.registers[69] = 0  
+        self.registers[70] = 30000  
+        self.flush((58, 69, 70))  
+        r0_value = put_field(self.registers[0], "VCO_PHASE_SYNC", 1)  
+        self.write_register(0, r0_value if calibrate else put_field(r0_value, "FCAL_EN", 0))  
+        self.registers[0] = r0_value  # Keep FCAL_EN for the next intended R0 write  
+    
+    def disarm_phase_sync(self):  
+        """Clear VCO_PHASE_SYNC_EN and ignore the SYNC pin again"""  
+        self.registers[58] = put_field(self.registers[58], "INPIN_IGNORE", 1)  
+        self.registers[0] = put_field(self.registers[0], "VCO_PHASE_SYNC", 0)  
+        self.write_register(0, self.registers[0])  
+        self.flush((58,))  
+    
+    def configure_ramp(self, f_low, f_high, duration, mode='up', segments=None, bursts=0):  
+        """  
+        Program the hardware ramp generator for a linear FMCW chirp  
+        
+        Tunes to the chirp start frequency with set_freq, then writes the  
+        ramp registers. Call start_ramp() to run the chirp.  
+        
+        Args:  
+            f_low: Lower chirp frequency in Hz  
+            f_high: Upper chirp frequency in Hz  
+            duration: Ramp duration in seconds (one direction for 'triangle')  
+            mode: 'up', 'down' or 'triangle'  
+            segments: None for a ramp clocked by the phase detector, or the  
+                      number of steps for a ramp clocked by ramp_step()  
+            bursts: Number of chirps before stopping, 0 for continuous  
+            
+        Returns:  
+            Dictionary describing the programmed ramp (see lmx2572_ramp.ramp_registers)  
+        """  
+        import lmx2572_ramp  
+        
+        if segments is not None and self.ramp_clk is None:  
+            raise ValueError("Manual ramp needs the RAMPCLK pin")  
+        start = f_high if mode == 'down' else f_low  
+        low = self._calc_pll(int(f_low))  
+        high = self._calc_pll(int(f_high))  
+        if low is None or high is None or low[0] != high[0]:  
+            raise ValueError("Chirp must stay within one output divider setting")  
+        
+        # Ramp increments are in numerator units, so keep PLL_DEN large  
+        ramp_den = self.pfd_num if self.pfd_num <= DEN_MAX else DEN_MAX  
+        
+        self.stop_ramp()  
+        if self.set_freq(start, den=ramp_den) != 0:  
+            raise ValueError("Chirp start frequency out of range")  
+        
+        den = (self.registers[38] << 16) | self.registers[39]  
+        words, info = lmx2572_ramp.ramp_registers(  
+            f_low, f_high, duration, self.pfd_freq, den, out_div=1 << low[0],  
+            mode=mode, segments=segments, bursts=bursts,  
+            cal_threshold=VCO_CAL_THRESHOLD, r78=self._cached(78))  
+        self.write_registers(words)  
+        self.ramp_info = info  
+        return info  
+    
+    def start_ramp(self):  
+        """Start the programmed ramp by setting RAMP_EN in R0"""  
+        self.write_register(0, put_field(self.registers.get(0, 0x221C), "RAMP_EN", 1))  
+    
+    def stop_ramp(self):  
+        """Stop the ramp by clearing RAMP_EN in R0"""  
+        r0_value = self.registers.get(0, 0x221C)  
+        if r0_value & FIELDS["RAMP_EN"][2]:  
+            self.write_register(0, put_field(r0_value, "RAMP_EN", 0))  
+    
+    def ramp_step(self, count=1):  
+        """  
+        Advance a manually clocked ramp by pulsing RAMPCLK  
+        
+        Args:  
+            count: Number of ramp steps  
+        """  
+        ramp_clk = self.ramp_clk  
+        for _ in range(count):  
+            ramp_clk.value(1)  
+            ramp_clk.value(0)  
+    
+    def configure_fsk(self, center, freqs, mode='spi'):  
+        """  
+        Program FSK deviation words around a carrier  
+        
+        Tunes the carrier with a PLL_DEN small enough for the largest  
+        deviation to fit FSK_DEV, writes the deviation words and enables  
+        FSK on level 0. Switch levels with fsk_select() or fsk_pins().  
+        
+        Args:  
+            center: Carrier frequency in Hz  
+            freqs: Output frequency per level in Hz (up to 8, or 4 in pin mode)  
+            mode: 'spi' to select levels over SPI, 'pin' for the RAMPCLK/RAMPDIR pins  
+            
+        Returns:  
+            Dictionary describing the plan (see lmx2572_fsk.fsk_plan)  
+        """  
+        import lmx2572_fsk  
+        
+        pll = self._calc_pll(int(center))  
+        if pll is None:  
+            raise ValueError("Carrier frequency out of range")  
+        out_div = 1 << pll[0]  
+        if mode == 'pin' and (self.ramp_clk is None or self.ramp_dir is None):  
+            raise ValueError("Pin mode needs the RAMPCLK and RAMPDIR pins")  
+        
+        den = self.pfd_num if self.pfd_num <= DEN_MAX else DEN_MAX  
+        max_dev = max(abs(f - center) for f in freqs)  
+        if max_dev:  
+            den = max(1, min(den, int(lmx2572_fsk.FSK_DEV_MAX * self.pfd_freq / (max_dev * out_div))))  
+        
+        words, info = lmx2572_fsk.fsk_plan(center, freqs, self.pfd_freq, den, out_div,  
+                                           bands=ASSIST_TBL, mode=mode)  
+        
+        self.disable_fsk()  
+        if self.set_freq(center, den=den) != 0:  
+            raise ValueError("Carrier frequency out of range")  
+        self.write_registers(words)  
+        
+        r114 = put_field(self.registers.get(114, 0x7802), "FSK_SPI_LEVEL", 0)  
+        r114 = put_field(r114, "FSK_MODE_SEL", lmx2572_fsk.MODES[mode])  
+        self.write_register(114, put_field(r114, "FSK_EN", 1))  
+        self.fsk_info = info  
+        return info  
+    
+    def fsk_select(self, level):  
+        """  
+        Switch to FSK level `level` with a single R114 write (SPI mode)  
+        
+        Args:  
+            level: Deviation word index (0-7)  
+        """  
+        self.write_register(114, put_field(self.registers[114], "FSK_SPI_LEVEL", level))  
+    
+    def fsk_pins(self, level):  
+        """  
+        Switch to FSK level `level` (0-3) on the FSK_D0/FSK_D1 pins (pin mode)  
+        """  
+        self.ramp_clk.value(level & 1)  
+        self.ramp_dir.value((level >> 1) & 1)  
+    
+    def disable_fsk(self):  
+        """Leave FSK mode, returning to the carrier"""  
+        r114 = self.registers.get(114, 0x7802)  
+        if r114 & FIELDS["FSK_EN"][2]:  
+            self.write_register(114, put_field(put_field(r114, "FSK_EN", 0), "FSK_SPI_LEVEL", 0))  
+    
     def trigger_calibration(self, timeout_ms=1000):  
         """  
-        Trigger VCO calibration by setting the FCAL bit, wait for completion,  
-        and read out calibration status  
+        Trigger VCO calibration by rewriting R0 with FCAL_EN set, wait for  
+        completion, and read out calibration status  
+        
+        Completion is seen as rb_LD_VTUNE (R110) reporting lock.  
         
         Args:  
             timeout_ms: Maximum time to wait for calibration (milliseconds)  
@@ -910,45 +1701,42 @@ class LMX2572:
         
         # Store original readback state and make sure readback is enabled  
         r0_value = self.registers.get(0, 0x221C)  
-        readback_was_enabled = (r0_value & 0x4) == 0  
+        readback_was_enabled = (r0_value & MUXOUT_LD_SEL) == 0  
         
         if not readback_was_enabled:  
-            # Enable readback mode temporarily  
-            self.write_register(0, r0_value & ~0x4)  
+            # Enable readback mode temporarily, FCAL starts with the next write  
+            self.write_register(0, r0_value & ~(MUXOUT_LD_SEL | FCAL_EN))  
         
-        # Set the FCAL bit (bit 6 of R0)  
-        self.registers[0] |= (1 << 6)  
+        # Write R0 with FCAL_EN (bit 3) set, which starts a calibration  
+        self.registers[0] = put_field(self.registers[0], "FCAL_EN", 1)  
         self.write_register(0, self.registers[0])  
         
         # Get start time  
         start_time = time.ticks_ms()  
-        elapsed = 0  
         cal_complete = False  
         
-        # Poll until FCAL bit clears or timeout occurs  
-        while elapsed < timeout_ms:  
-            # Read register 0  
-            reg0 = self.read_register(0)  
-            
-            # Check if FCAL bit (bit 6) has cleared  
-            if (reg0 & (1 << 6)) == 0:  
+        # FCAL_EN does not self-clear; poll rb_LD_VTUNE until it reports lock  
+        while True:  
+            reg110 = self.read_register(110)  
+            if ((reg110 >> 9) & 3) == 2:  
                 cal_complete = True  
                 break  
-            
-            # Small delay to avoid hammering the SPI bus  
-            time.sleep_ms(5)  
-            elapsed = time.ticks_diff(time.ticks_ms(), start_time)  
+            if time.ticks_diff(time.ticks_ms(), start_time) >= timeout_ms:  
+                break  
         
-        # Read lock status from R110  
-        lock_status = self.is_locked()  
+        # Lock status and selected VCO (rb_VCO_SEL, bits [7:5]) from the same R110 read  
+        lock_status = cal_complete  
+        vco_num = (reg110 >> 5) & 0x7  
         
-        # Read VCO status from R110 bits [14:12] - indicates selected VCO num  
-        reg110 = self.read_register(110)  
-        vco_num = (reg110 >> 12) & 0x7  
+        # Remember where the VCO settled so the next visit can relock with full assist  
+        if lock_status and self.cal_cache is not None:  
+            self.capture_calibration()  
         
-        # Restore original readback setting if needed  
+        # Restore original readback setting if needed, without FCAL_EN so the  
+        # restore does not start another calibration  
         if not readback_was_enabled:  
-            self.write_register(0, r0_value)  
+            self.write_register(0, r0_value & ~FCAL_EN)  
+            self.registers[0] = r0_value  
         
         # Calculate time taken  
         time_ms = time.ticks_diff(time.ticks_ms(), start_time)  
@@ -960,6 +1748,64 @@ class LMX2572:
             'time_ms': time_ms  
         }  
     
+    def capture_calibration(self, temp=None):  
+        """  
+        Store the chip's current VCO calibration in the calibration cache  
+        
+        Reads back rb_VCO_SEL (R110), rb_VCO_CAPCTRL (R111) and  
+        rb_VCO_DACISET (R112) for the VCO frequency of the last tune, in  
+        one read_registers() block so R0 is switched once, without FCAL_EN.  
+        Call only while the PLL is locked.  
+        
+        Args:  
+            temp: Optional temperature, for VcoCalCache.invalidate_drift()  
+            
+        Returns:  
+            (vco_sel, capctrl, daciset) as stored  
+        """  
+        status = self.read_registers(CAL_STATUS_REGISTERS)  
+        vco_sel = (status[0] >> 5) & 0x7  
+        capctrl = status[1] & 0xFF  
+        daciset = status[2] & 0x1FF  
+        if self.cal_cache is not None:  
+            self.cal_cache.store(self.vco_freq, vco_sel, capctrl, daciset, temp)  
+        return vco_sel, capctrl, daciset  
+    
+    def relock(self, timeout_ms=5):  
+        """  
+        Recover lock at the current frequency, fastest method first  
+        
+        1. Full assist: force the cached VCO core, CAPCTRL and DACISET for  
+           vco_freq and rerun FCAL (needs a cal_cache entry for the bin)  
+        2. FCAL from the unforced start values (trigger_calibration)  
+        
+        Args:  
+            timeout_ms: Lock wait for each method (milliseconds)  
+            
+        Returns:  
+            RELOCK_ASSIST or RELOCK_FCAL for the method that locked, None if neither did  
+        """  
+        registers = self.registers  
+        cached = self.cal_cache.lookup(self.vco_freq) if self.cal_cache is not None else None  
+        if cached is not None:  
+            vco, C, A = cached  
+            words = assist_words(vco, C, A, True)  
+            for i, reg in enumerate(ASSIST_REGS):  
+                registers[reg] = words[i]  
+            self.flush(ASSIST_REGS)  
+            self.write_register(0, put_field(registers[0], "FCAL_EN", 1))  # Starts FCAL  
+            if self.wait_lock(timeout_ms):  
+                return RELOCK_ASSIST  
+        
+        # Cached values missing or stale: let FCAL search from the start values  
+        registers[20] = put_field(self._cached(20), "VCO_SEL_FORCE", 0)  
+        registers[19] = put_field(self._cached(19), "VCO_CAPCTRL_FORCE", 0)  
+        registers[16] = put_field(self._cached(16), "VCO_DACISET_FORCE", 0)  
+        self.flush((20, 19, 16))  
+        if self.trigger_calibration(timeout_ms)['success']:  
+            return RELOCK_FCAL  
+        return None  
+    
     def set_pd_gain(self, gain_setting):  
         """  
         Set the charge pump current gain  
@@ -972,16 +1818,8 @@ class LMX2572:
         """  
         if gain_setting < 0 or gain_setting > 15:  
             raise ValueError("Charge pump gain must be 0-15")  
-            
-        # Read current register value  
-        reg_14 = self.read_register(14)  
-        
-        # Clear bits [6:3] using mask 0x78 (0b01111000)  
-        # Then set new value (shifted to position)  
-        new_reg_14 = (reg_14 & ~0x78) | ((gain_setting & 0xF) << 3)  
         
-        # Write back to register  
-        self.write_register(14, new_reg_14)  
+        self.write_fields(("CPG", gain_setting))  
         
         return f"Charge pump gain set to {gain_setting}"  
 
@@ -993,14 +1831,7 @@ class LMX2572:
         Returns:  
             int: Current gain setting (0-15)  
         """  
-        # Read register 14  
-        reg_14 = self.read_register(14)  
-        
-        # Extract bits [6:3]  
-        # Mask with 0x78 (0b01111000) and shift right by 3  
-        gain_setting = (reg_14 & 0x78) >> 3  
-        
-        return gain_setting    
+        return self.get_field("CPG")  
     
     def set_osc_single_ended(self):  
         """  
@@ -1012,18 +1843,5 @@ class LMX2572:
         Returns:  
             str: Confirmation message  
         """  
-        # Read current register value  
-        reg_5 = self.read_register(5)  
-        
-        # Set bit 2 to enable single-ended mode (mask 0x04 = 0b00000100)  
-        new_reg_5 = reg_5 | 0x04  
-        
-        # Write back to register  
-        self.write_register(5, new_reg_5)  
-        
-        # Verify the configuration  
-        if self.read_register(5) & 0x04:  
-            return "Clock input configured for single-ended mode"  
-        else:  
-            return "Error: Failed to set single-ended mode"  
-    
\ No newline at end of file
+        self.write_fields(("OSC_SINGLE_ENDED", 1))  
+        return "Clock input configured for single-ended mode"
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Hot-path packing for the LMX2572 driver
+
+Frame packing for register images (write_registers) and the N/NUM/DEN
+split of set_freq/compile_freq_plan. On MicroPython the viper-compiled
+versions from lmx2572_viper are used when the port has the viper
+emitter; everywhere else, CPython included, the pure-Python versions
+below, which produce identical output.
+
+    IMPLEMENTATION   'viper' or 'python', whichever is active
+
+pack_frames needs a 32-bit array (array('I')) for the viper version,
+which reads it through ptr32 without bounds checks; check the words with
+is_word_array() and send anything else through pack_frames_py. Compare
+the two with tools/bench_fast.py.
+"""
+
+import sys
+from array import array
+
+# Register order of the split_pll output: PLL_DEN, PLL_NUM (low word first), then N
+PLL_REGS = (39, 38, 43, 42, 36, 34)
+
+
+def pack_frames_py(buf, words, n, reverse=False):
+    """
+    Pack register words into 3-byte SPI write frames
+
+    Args:
+        buf: Buffer of at least 3 * n bytes
+        words: Register data as (addr << 16) | value
+        n: Number of words to pack
+        reverse: Pack the words last to first
+    """
+    for i in range(n):
+        word = words[n - 1 - i] if reverse else words[i]
+        j = 3 * i
+        buf[j] = (word >> 16) & 0x7F
+        buf[j + 1] = (word >> 8) & 0xFF
+        buf[j + 2] = word & 0xFF
+
+
+def is_word_array(words):
+    """
+    Check that words may go to pack_frames
+
+    Returns:
+        True for a non-empty array('I'); MicroPython arrays have no
+        typecode, so there one element is sized through a memoryview
+    """
+    if not isinstance(words, array) or not len(words):
+        return False
+    typecode = getattr(words, 'typecode', None)
+    if typecode is not None:
+        return typecode == 'I'
+    return len(bytes(memoryview(words)[:1])) == 4
+
+
+def split_pll_py(out, n, frac, den):
+    """
+    Split N, PLL_NUM and PLL_DEN into register words
+
+    Args:
+        out: array('H') (or any 6-word sequence) receiving the PLL_REGS values
+        n: PLL_N (19 bits)
+        frac: PLL_NUM (32 bits)
+        den: PLL_DEN (32 bits)
+    """
+    out[0] = den & 0xFFFF
+    out[1] = den >> 16
+    out[2] = frac & 0xFFFF
+    out[3] = frac >> 16
+    out[4] = n & 0xFFFF
+    out[5] = ((n >> 16) & 0x7) | 0x10
+
+
+IMPLEMENTATION = 'python'
+pack_frames = pack_frames_py
+split_pll = split_pll_py
+
+if sys.implementation.name == 'micropython':
+    try:
+        from lmx2572_viper import pack_frames, split_pll
+        IMPLEMENTATION = 'viper'
+    except (ImportError, SyntaxError, NameError, ValueError):
+        # No viper emitter on this port
+        pass
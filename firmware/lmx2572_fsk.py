@@ -0,0 +1,79 @@
+"""
+LMX2572 FSK deviation planner
+
+Pure Python with no machine dependencies. In FSK mode the chip adds one of
+up to eight programmed deviation words (FSK_DEV0-7, signed 16-bit
+numerator offsets) to PLL_NUM. The active word is picked either by
+FSK_SPI_LEVEL in R114 (one register write) or by the FSK_D0/FSK_D1 pins,
+which share the RAMPCLK/RAMPDIR lines. Neither path touches N or the
+VCO, so every deviated frequency must stay inside the VCO core the
+carrier calibrated on.
+
+The R114 control bits (FSK_EN, FSK_MODE_SEL, FSK_SPI_LEVEL) are fields of
+lmx2572.FIELDS; MODES gives the FSK_MODE_SEL value of each mode.
+"""
+
+R_FSK_DEV0 = 115         # FSK_DEV0..FSK_DEV7 in R115-R122
+
+FSK_LEVELS = 8
+FSK_PIN_LEVELS = 4       # Two pins select among DEV0-DEV3
+FSK_DEV_MIN = -0x8000
+FSK_DEV_MAX = 0x7FFF
+
+MODES = {'spi': 0, 'pin': 1}  # FSK_MODE_SEL
+
+
+def fsk_plan(center, freqs, pfd_freq, den, out_div=1, bands=None, mode='spi'):
+    """
+    Compute FSK deviation words around a carrier
+
+    Args:
+        center: Carrier frequency at the output in Hz (tuned with set_freq)
+        freqs: Output frequencies for levels 0, 1, ... in Hz
+        pfd_freq: Phase detector frequency in Hz
+        den: PLL_DEN programmed for the carrier
+        out_div: Output divider between VCO and output (1, 2, 4, ...)
+        bands: VCO core table rows starting (fmin MHz, fmax MHz, ...), used
+               to check every level stays in the carrier's core
+        mode: 'spi' to select levels over SPI, 'pin' for FSK_D0/FSK_D1
+
+    Returns:
+        (words, info) where words is a list of (addr << 16) | value for the
+        deviation registers and info is a dictionary:
+        {
+            'devs': Deviation words per level,
+            'freqs': Achieved output frequency per level (Hz),
+            'band': Index of the VCO core in `bands` (None without bands)
+        }
+    """
+    if mode not in MODES:
+        raise ValueError("Mode must be one of {}".format(tuple(MODES)))
+    levels = FSK_PIN_LEVELS if mode == 'pin' else FSK_LEVELS
+    if not 1 <= len(freqs) <= levels:
+        raise ValueError("FSK {} mode supports 1 to {} levels".format(mode, levels))
+
+    band = None
+    if bands is not None:
+        vco_mhz = center * out_div / 1e6
+        for i, row in enumerate(bands):
+            if row[0] <= vco_mhz <= row[1]:
+                band = i
+        if band is None:
+            raise ValueError("Carrier VCO frequency outside every VCO core")
+        fmin, fmax = bands[band][0], bands[band][1]
+        for f in freqs:
+            if not fmin <= f * out_div / 1e6 <= fmax:
+                raise ValueError("{} Hz leaves VCO core {} ({}-{} MHz)".format(f, band + 1, fmin, fmax))
+
+    step = pfd_freq / den / out_div  # Output Hz per numerator count
+    devs = []
+    achieved = []
+    for f in freqs:
+        dev = int(round((f - center) / step))
+        if not FSK_DEV_MIN <= dev <= FSK_DEV_MAX:
+            raise ValueError("Deviation of {} Hz does not fit FSK_DEV; lower PLL_DEN".format(f - center))
+        devs.append(dev)
+        achieved.append(center + dev * step)
+
+    words = [((R_FSK_DEV0 + i) << 16) | (dev & 0xFFFF) for i, dev in enumerate(devs)]
+    return words, {'devs': devs, 'freqs': achieved, 'band': band}
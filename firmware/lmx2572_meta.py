@@ -0,0 +1,140 @@
+"""
+Human-readable LMX2572 register and field descriptions
+
+Only needed for debug output; LMX2572.describe_register() imports this
+module on first use so the strings stay off the heap otherwise.
+"""
+
+# Register descriptions dictionary - contains key registers and their functions
+REGISTER_DESCRIPTIONS = {
+    0: "Main control: RAMP_EN, VCO_PHASE_SYNC, FCAL_EN, MUXOUT_LD_SEL, RESET, POWERDOWN",
+    1: "Calibration clock divider settings",
+    3: "Reset control: RESET_R123_TO_R4, etc.",
+    4: "VCO settings and charge pump settings",
+    5: "Input buffer configuration",
+    6: "LDO delay settings",
+    7: "Output force control",
+    9: "OSC doubler and high PFD frequency select",
+    10: "MULT: Reference multiplier",
+    11: "PLL_R: Reference R divider",
+    12: "PLL_R_PRE: Reference pre-R divider",
+    14: "Charge pump gain",
+    16: "VCO_DACISET and its force bit",
+    17: "VCO_DACISET_STRT: DACISET start value for FCAL",
+    19: "VCO_CAPCTRL and its force bit",
+    20: "VCO_SEL and its force bit",
+    24: "VCO subsystem configuration",
+    31: "VCO subsystem configuration",
+    34: "PLL_N[18:16]: Upper bits of the integer division ratio",
+    36: "PLL_N[15:0]: Integer division ratio",
+    37: "PFD_DLY_SEL: Phase detector delay",
+    38: "PLL_DEN[31:16]: Upper 16 bits of fractional denominator",
+    39: "PLL_DEN[15:0]: Lower 16 bits of fractional denominator",
+    42: "PLL_NUM[31:16]: Upper 16 bits of fractional numerator",
+    43: "PLL_NUM[15:0]: Lower 16 bits of fractional numerator",
+    44: "Output power and MASH control settings",
+    45: "OUTA_MUX and OUTB_PWR settings",
+    46: "OUTB_MUX settings",
+    58: "SYNC input configuration",
+    71: "SYSREF configuration",
+    72: "SYSREF divider",
+    75: "CHDIV: Output channel divider",
+    78: "VCO_CAPCTRL_STRT, QUICK_RECAL_EN and RAMP_THRESH[32]",
+    108: "Status register containing VCO calibration information",
+    110: "Readback for LD_VTUNE and VCO_SEL",
+    111: "Readback for VCO_CAPCTRL",
+    112: "Readback for VCO_DACISET",
+    114: "FSK mode configuration",
+}
+
+# Field descriptions, keyed by bit range as "msb-lsb" or "bit". Fields the
+# driver programs use the names and bit positions of lmx2572.FIELDS
+# (tools/check_meta.py checks that the two tables agree).
+FIELD_DESCRIPTIONS = {
+    0: {
+        "15": "RAMP_EN: Enables frequency ramping (0: Normal, 1: Start ramping)",
+        "14": "VCO_PHASE_SYNC: Enables phase sync mode",
+        "3": "FCAL_EN: Enables fast calibration; writing R0 with it set starts FCAL",
+        "2": "MUXOUT_LD_SEL: MUXout function (0: Register readback, 1: Lock detect)",
+        "1": "RESET: Reset device (0: Normal operation, 1: Reset - self-clearing)",
+        "0": "POWERDOWN: Power down device (0: Normal operation, 1: Power down)"
+    },
+    3: {
+        "3": "RESET_R123_TO_R4: When set, R4-R123 load from predefined state",
+    },
+    5: {
+        "12-11": "IPBUF_TYPE: Input buffer type (1: Differential, 2: Single-ended)",
+        "2": "OSC_SINGLE_ENDED: Single-ended reference input"
+    },
+    9: {
+        "14": "MULT_HI: Set when the phase detector runs above 100 MHz",
+        "12": "OSC_2X: Reference doubler"
+    },
+    10: {
+        "11-7": "MULT: Reference multiplier"
+    },
+    11: {
+        "11-4": "PLL_R: Reference R divider"
+    },
+    12: {
+        "11-0": "PLL_R_PRE: Reference pre-R divider"
+    },
+    14: {
+        "6-3": "CPG: Charge pump gain"
+    },
+    16: {
+        "8-0": "VCO_DACISET: VCO amplitude DAC setting",
+        "4": "VCO_DACISET_FORCE: Use VCO_DACISET instead of calibrating it"
+    },
+    17: {
+        "8-0": "VCO_DACISET_STRT: DACISET start value for FCAL"
+    },
+    19: {
+        "7-0": "VCO_CAPCTRL: VCO capacitor bank setting",
+        "5": "VCO_CAPCTRL_FORCE: Use VCO_CAPCTRL instead of calibrating it"
+    },
+    20: {
+        "13-11": "VCO_SEL: VCO core (1-6)",
+        "4": "VCO_SEL_FORCE: Use VCO_SEL instead of calibrating it"
+    },
+    36: {
+        "15-0": "PLL_N: Integer division ratio"
+    },
+    37: {
+        "13-8": "PFD_DLY_SEL: Phase detector delay (1 up to 4 GHz VCO, 2 above)"
+    },
+    44: {
+        "13-8": "OUTA_PWR: Output A power level",
+        "7": "OUTB_PD: Output B power down",
+        "6": "OUTA_PD: Output A power down",
+        "5": "MASH_RESET_N: MASH reset (active low)",
+        "2-0": "MASH_ORDER: MASH modulator order (0: Integer-N, 1: MASH1, 2: MASH2, 3: MASH3, 4: MASH4)"
+    },
+    45: {
+        "12-11": "OUTA_MUX: Output A multiplexer (0: Channel divider, 1: VCO)",
+        "5-0": "OUTB_PWR: Output B power level"
+    },
+    46: {
+        "1-0": "OUTB_MUX: Output B multiplexer (0: Channel divider, 1: VCO)"
+    },
+    58: {
+        "15": "INPIN_IGNORE: Ignore the SYNC pin"
+    },
+    75: {
+        "10-6": "CHDIV: Channel divider setting"
+    },
+    78: {
+        "11": "RAMP_THRESH[32]: Upper bit of the ramp calibration threshold",
+        "9": "QUICK_RECAL_EN: Recalibrate starting from the current VCO settings",
+        "8-1": "VCO_CAPCTRL_STRT: CAPCTRL start value for FCAL"
+    },
+    110: {
+        "10-9": "rb_LD_VTUNE: Vtune lock detect (0/1: Unlocked, 2: Locked, 3: Invalid)",
+        "7-5": "rb_VCO_SEL: Selected VCO (1-6)"
+    },
+    114: {
+        "10": "FSK_EN: FSK mode enable",
+        "8-7": "FSK_MODE_SEL: FSK level select (0: SPI, 1: FSK_D0/FSK_D1 pins)",
+        "4-2": "FSK_SPI_LEVEL: FSK level selected over SPI"
+    }
+}
@@ -0,0 +1,180 @@
+"""
+LMX2572 ramp (FMCW chirp) register calculator
+
+Pure Python with no machine dependencies, so chirp plans can be computed
+and checked on the host as well as on the ESP32.
+
+The ramp generator adds RAMPx_INC to the fractional numerator once per
+ramp clock for RAMPx_LEN clocks. In automatic mode the ramp clock is the
+phase detector (halved when RAMPx_DLY is set); in manual mode every rising
+edge on the RAMPCLK pin advances the ramp by one step. Increments, limits
+and the calibration threshold are expressed in numerator units at the
+VCO, i.e. VCO frequency * PLL_DEN / f_PFD. RAMP_EN in R0 is the
+lmx2572.FIELDS entry of that name.
+"""
+
+# Ramp register addresses
+R_RAMP_THRESH_HI = 78   # bit 11: RAMP_THRESH[32]
+R_RAMP_THRESH = 79      # R79/R80: RAMP_THRESH[31:0]
+R_RAMP_LIMIT_HIGH = 81  # R81 bit 0: [32], R82/R83: [31:0]
+R_RAMP_LIMIT_LOW = 84   # R84 bit 0: [32], R85/R86: [31:0]
+R_RAMP_BURST = 96       # bit 15: RAMP_BURST_EN, bits 14-2: RAMP_BURST_COUNT
+R_RAMP0_RST = 97        # bit 15: RAMP0_RST
+R_RAMP0_INC = 98        # R98 bits 15-2: RAMP0_INC[29:16], bit 0: RAMP0_DLY; R99: RAMP0_INC[15:0]
+R_RAMP0_LEN = 100
+R_RAMP1_CFG = 101       # bit 6: RAMP1_DLY, bit 5: RAMP1_RST, bit 4: RAMP0_NEXT
+R_RAMP1_INC = 102       # R102 bits 13-0: RAMP1_INC[29:16]; R103: RAMP1_INC[15:0]
+R_RAMP1_LEN = 104
+R_RAMP_CFG = 105        # bits 15-6: RAMP_DLY_CNT, bit 5: RAMP_MANUAL, bit 4: RAMP1_NEXT
+R_RAMP_CAL = 106        # bit 4: RAMP_TRIG_CAL, bits 2-0: RAMP_SCALE_COUNT
+
+RAMP_MANUAL = 1 << 5     # R105
+RAMP_THRESH_32 = 1 << 11  # R78
+RAMP_DLY_CNT_DEFAULT = 0x4440 >> 6
+
+RAMP_LEN_MAX = 0xFFFF
+RAMP_BURST_MAX = 0x1FFF
+RAMP_INC_BITS = 30
+RAMP_LIMIT_BITS = 33
+
+MODES = ('up', 'down', 'triangle')
+
+
+def _twos(value, bits):
+    """Encode a signed integer as a `bits` wide two's complement field"""
+    if value < -(1 << (bits - 1)) or value >= (1 << (bits - 1)):
+        raise ValueError("Value {} does not fit in {} bits".format(value, bits))
+    return value & ((1 << bits) - 1)
+
+
+def ramp_registers(f_low, f_high, duration, pfd_freq, den, out_div=1, mode='up',
+                   segments=None, bursts=0, cal_threshold=100000000, r78=0):
+    """
+    Compute the ramp register set for a linear chirp
+
+    Args:
+        f_low: Lower chirp frequency at the output in Hz
+        f_high: Upper chirp frequency at the output in Hz
+        duration: Ramp duration in seconds (one direction for 'triangle')
+        pfd_freq: Phase detector frequency in Hz
+        den: PLL_DEN programmed for the start frequency
+        out_div: Output divider between VCO and output (1, 2, 4, ...)
+        mode: 'up' (low to high), 'down' (high to low) or 'triangle' (low-high-low)
+        segments: None for an automatic ramp clocked by the phase detector,
+                  or the number of steps for a manual ramp clocked from RAMPCLK
+        bursts: Number of chirps before the ramp stops, 0 to run continuously
+        cal_threshold: VCO travel in Hz after which the ramp recalibrates
+        r78: Current R78 word; its other fields (VCO_CAPCTRL_STRT,
+             QUICK_RECAL_EN) are kept around RAMP_THRESH[32]
+
+    Returns:
+        (words, info) where words is a list of (addr << 16) | value in write
+        order and info is a dictionary describing the programmed ramp:
+        {
+            'start': Frequency to tune before enabling the ramp (Hz),
+            'stop': Achieved end frequency of the first ramp (Hz),
+            'inc': RAMP0_INC numerator step,
+            'len': RAMP0_LEN clocks,
+            'dly': True when each step takes two phase detector cycles,
+            'manual': True when RAMPCLK clocks the ramp,
+            'step_period': Time per ramp step in seconds
+        }
+    """
+    if mode not in MODES:
+        raise ValueError("Mode must be one of {}".format(MODES))
+    if f_high <= f_low:
+        raise ValueError("f_high must be above f_low")
+    if duration <= 0:
+        raise ValueError("Duration must be positive")
+    if bursts < 0 or bursts > RAMP_BURST_MAX:
+        raise ValueError("Bursts must be between 0 and {}".format(RAMP_BURST_MAX))
+
+    manual = segments is not None
+    dly = False
+    if manual:
+        steps = int(segments)
+        if steps < 1 or steps > RAMP_LEN_MAX:
+            raise ValueError("Segments must be between 1 and {}".format(RAMP_LEN_MAX))
+        step_period = duration / steps
+    else:
+        steps = int(duration * pfd_freq + 0.5)
+        if steps > RAMP_LEN_MAX:
+            dly = True
+            steps = int(duration * pfd_freq / 2 + 0.5)
+        if steps > RAMP_LEN_MAX:
+            raise ValueError("Ramp too long for RAMP_LEN, use segments for a manual ramp")
+        if steps < 1:
+            raise ValueError("Ramp shorter than one phase detector cycle")
+        step_period = (2 if dly else 1) / pfd_freq
+
+    # Span in numerator units at the VCO
+    span = int((f_high - f_low) * out_div * den // pfd_freq)
+    inc = (span + steps // 2) // steps
+    if inc == 0:
+        raise ValueError("Chirp span smaller than one ramp increment")
+    travel = inc * steps
+
+    if mode == 'down':
+        start = f_high
+        inc0 = -inc
+        limit_high, limit_low = 0, -travel
+    else:
+        start = f_low
+        inc0 = inc
+        limit_high, limit_low = travel, 0
+
+    thresh = int(cal_threshold * den // pfd_freq)
+    if thresh >= (1 << 33):
+        thresh = (1 << 33) - 1
+
+    inc0_field = _twos(inc0, RAMP_INC_BITS)
+    high_field = _twos(limit_high, RAMP_LIMIT_BITS)
+    low_field = _twos(limit_low, RAMP_LIMIT_BITS)
+
+    if mode == 'triangle':
+        # RAMP1 retraces RAMP0 back down to the start frequency
+        inc1_field = _twos(-inc, RAMP_INC_BITS)
+        len1 = steps
+        ramp1_rst = 0
+    else:
+        # RAMP1 is a single clock that resets the accumulator to the start
+        inc1_field = 0
+        len1 = 1
+        ramp1_rst = 1 << 5
+
+    words = [
+        (R_RAMP_THRESH_HI << 16) | (r78 & ~RAMP_THRESH_32 & 0xFFFF) | (RAMP_THRESH_32 if thresh >> 32 else 0),
+        (R_RAMP_THRESH << 16) | ((thresh >> 16) & 0xFFFF),
+        ((R_RAMP_THRESH + 1) << 16) | (thresh & 0xFFFF),
+        (R_RAMP_LIMIT_HIGH << 16) | (high_field >> 32),
+        ((R_RAMP_LIMIT_HIGH + 1) << 16) | ((high_field >> 16) & 0xFFFF),
+        ((R_RAMP_LIMIT_HIGH + 2) << 16) | (high_field & 0xFFFF),
+        (R_RAMP_LIMIT_LOW << 16) | (low_field >> 32),
+        ((R_RAMP_LIMIT_LOW + 1) << 16) | ((low_field >> 16) & 0xFFFF),
+        ((R_RAMP_LIMIT_LOW + 2) << 16) | (low_field & 0xFFFF),
+        (R_RAMP_BURST << 16) | ((0x8000 | (bursts << 2)) if bursts else 0),
+        (R_RAMP0_RST << 16) | 0x8000,
+        (R_RAMP0_INC << 16) | (((inc0_field >> 16) << 2) & 0xFFFC) | (1 if dly else 0),
+        ((R_RAMP0_INC + 1) << 16) | (inc0_field & 0xFFFF),
+        (R_RAMP0_LEN << 16) | steps,
+        (R_RAMP1_CFG << 16) | ((1 << 6) if dly else 0) | ramp1_rst | (1 << 4),
+        (R_RAMP1_INC << 16) | ((inc1_field >> 16) & 0x3FFF),
+        ((R_RAMP1_INC + 1) << 16) | (inc1_field & 0xFFFF),
+        (R_RAMP1_LEN << 16) | len1,
+        (R_RAMP_CFG << 16) | (RAMP_DLY_CNT_DEFAULT << 6) | (RAMP_MANUAL if manual else 0),
+        (R_RAMP_CAL << 16) | (1 << 4) | 0x7,
+    ]
+
+    sign = -1 if mode == 'down' else 1
+    stop = start + sign * travel * pfd_freq / den / out_div
+
+    info = {
+        'start': start,
+        'stop': stop,
+        'inc': inc0,
+        'len': steps,
+        'dly': dly,
+        'manual': manual,
+        'step_period': step_period,
+    }
+    return words, info
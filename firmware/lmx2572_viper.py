@@ -0,0 +1,37 @@
+"""
+Viper-compiled LMX2572 packing helpers, loaded by lmx2572_fast on MicroPython
+
+Same signatures and output as the pure-Python versions in lmx2572_fast.
+The ptr8/ptr16/ptr32 casts only exist under the viper emitter, so this
+module is not importable on CPython or on ports built without it; import
+lmx2572_fast instead.
+"""
+
+import micropython
+
+
+@micropython.viper
+def pack_frames(buf, words, n: int, reverse: int):
+    """Pack n (addr << 16) | value words from a 32-bit array into 3-byte frames"""
+    b = ptr8(buf)
+    w = ptr32(words)
+    i = 0
+    while i < n:
+        word = w[n - 1 - i] if reverse else w[i]
+        j = 3 * i
+        b[j] = (word >> 16) & 0x7F
+        b[j + 1] = (word >> 8) & 0xFF
+        b[j + 2] = word & 0xFF
+        i += 1
+
+
+@micropython.viper
+def split_pll(out, n: uint, frac: uint, den: uint):
+    """Split N, PLL_NUM and PLL_DEN into the PLL_REGS words of an array('H')"""
+    o = ptr16(out)
+    o[0] = den & 0xFFFF
+    o[1] = den >> 16
+    o[2] = frac & 0xFFFF
+    o[3] = frac >> 16
+    o[4] = n & 0xFFFF
+    o[5] = ((n >> 16) & 0x7) | 0x10
@@ -4,6 +4,12 @@ import board as pins
 # Import pin definitions and power control functions
 from lmx2572 import LMX2572
 from si570 import Si570
+from vcocal import VcoCalCache
+from monitor import HealthMonitor
+import flashstore
+
+# Last known-good register image, plans and VCO calibrations for fast boot
+STORE_PATH = '/lmx2572.bin'
 
 # For heartbeat LED
 def heartbeat_callback(timer):
@@ -23,10 +29,21 @@ if __name__ == '__main__':
     pins.REF_CLK_EN.value(0)  # Enable the reference clock
     #si570 = Si570(i2c,0x55)  # Initialize with desired frequency of 100 MHz and specific I2C address
     
-    pll = LMX2572(spi=spi,cs=pins.LMX2572_CSB,en=pins.LMX2572_CE,ref_freq=100.0e6)
+    # Lock detect comes in on SDO, which is also the SPI MISO line: the driver
+    # detaches the lock IRQ while it clocks register readback on that pin
+    pll = LMX2572(spi=spi,cs=pins.LMX2572_CSB,en=pins.LMX2572_CE,ref_freq=100.0e6,ramp_clk=pins.LMX2572_RAMPCLK,cal_cache=VcoCalCache(),ld_pin=pins.LMX2572_SDO,ramp_dir=pins.LMX2572_RAMPDIR)
     pll.enable()
-    pll.setup()
-    pll.set_freq(5.8e9)
+
+    # Restore the stored image if there is one, full bring-up otherwise
+    blob = flashstore.load(STORE_PATH)
+    if blob is None or not flashstore.restore(pll, blob):
+        if pll.setup(freq=5.8e9):
+            pll.capture_calibration()
+            flashstore.save(STORE_PATH, pll)
+
+    # Watch lock and scrub the critical registers in the background
+    monitor = HealthMonitor(pll, period_ms=100, timer=Timer(1))
+    monitor.start()
 
 
     
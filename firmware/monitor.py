@@ -0,0 +1,183 @@
+"""
+Background health monitor for the LMX2572
+
+Checks lock on every timer tick and, every verify_every ticks, reads back
+the next batch of critical registers and compares it with the driver's
+shadow (LMX2572.verify_registers). Registers that drifted are rewritten
+from the shadow. On loss of lock, or when R0 itself no longer matches,
+the PLL is relocked with LMX2572.relock(): cached full assist first,
+FCAL if that fails. If neither locks, all critical registers are
+scrubbed before one more relock.
+
+    monitor = HealthMonitor(pll, timer=Timer(1))
+    monitor.start()
+    ...
+    monitor.stats()
+
+With MUXOUT in lock detect mode and ld_pin given to the driver a healthy
+tick is one pin read. The ESP32 port runs machine.Timer callbacks as
+soft interrupts, so the SPI traffic of a verify or relock is allowed
+there; the monitor shares the bus with the rest of the firmware, so
+stop() it around other driver calls. Without a timer, call poll() from
+an asyncio task or a main loop instead.
+"""
+
+import time
+
+import diag
+from lmx2572 import FREQ_WRITE_ORDER, RELOCK_ASSIST, RELOCK_FCAL
+
+# Frequency registers first, then VCO assist, reference path, PFD delay and R0
+CRITICAL_REGISTERS = FREQ_WRITE_ORDER + (20, 19, 17, 16, 8, 9, 10, 11, 12, 37, 0)
+
+
+class HealthMonitor:
+    """Timer driven lock supervisor and register scrubber for one LMX2572"""
+
+    def __init__(self, pll, period_ms=100, timer=None, verify_every=10, batch=8,
+                 regs=CRITICAL_REGISTERS, relock_timeout_ms=5):
+        """
+        Args:
+            pll: LMX2572 instance, set up and locked
+            period_ms: Lock check interval in milliseconds
+            timer: machine.Timer driving poll() (None to call poll() yourself)
+            verify_every: Ticks between register verifications, 0 to disable them
+            batch: Registers verified per verification; the batches rotate over regs
+            regs: Registers to keep verifying
+            relock_timeout_ms: Lock wait of each relock method
+        """
+        if period_ms <= 0:
+            raise ValueError("Period must be positive")
+        self.pll = pll
+        self.period_ms = int(period_ms)
+        self.timer = timer
+        self.verify_every = verify_every
+        self.relock_timeout_ms = relock_timeout_ms
+        self._all_regs = tuple(regs)
+        self._batches = [self._all_regs[i:i + batch] for i in range(0, len(regs), batch)]
+        self._next_batch = 0
+        self.running = False
+
+        self.ticks = 0
+        self.unlock_events = 0         # Ticks that found the PLL unlocked
+        self.verifications = 0         # Register batches read back
+        self.registers_corrected = 0   # Registers rewritten after a mismatch
+        self.relocks_assist = 0        # Recoveries by cached full assist
+        self.relocks_fcal = 0          # Recoveries by FCAL
+        self.relock_failures = 0       # Recoveries that did not lock
+        self.last_recovery_us = 0
+        self.max_recovery_us = 0
+        self.total_recovery_us = 0
+
+        # Bind the callback once so the timer does not allocate a bound method per tick
+        self._tick_cb = self._tick
+
+    def _tick(self, _timer):
+        if self.running:
+            self.poll()
+
+    def poll(self):
+        """
+        Run one monitor tick: lock check, then a register batch if one is due
+
+        Returns:
+            True if the PLL is locked at the end of the tick
+        """
+        pll = self.pll
+        if not pll.is_enabled:
+            return False
+        self.ticks += 1
+
+        if not pll.is_locked():
+            self.unlock_events += 1
+            if diag.level >= diag.INFO:
+                diag.log(diag.EV_UNLOCK, diag.SRC_LMX2572, 0, self.unlock_events)
+            if self.recover():
+                return True
+            # A corrupted register can keep the PLL from locking: scrub them all and retry
+            self._scrub(self._all_regs)
+            return self.recover()
+
+        if self.verify_every and self.ticks % self.verify_every == 0:
+            regs = self._batches[self._next_batch]
+            self._next_batch = (self._next_batch + 1) % len(self._batches)
+            mismatches = self._scrub(regs)
+            # Rewritten frequency registers or R0 need a new FCAL to lock again
+            if mismatches and (any(reg == 0 for reg, _, _ in mismatches) or not pll.is_locked()):
+                return self.recover()
+        return True
+
+    def _scrub(self, regs):
+        mismatches = self.pll.verify_registers(regs, repair=True)
+        self.verifications += 1
+        self.registers_corrected += len(mismatches)
+        return mismatches
+
+    def recover(self):
+        """
+        Relock the PLL, timing the recovery
+
+        Returns:
+            True if the PLL locked
+        """
+        start = time.ticks_us()
+        method = self.pll.relock(self.relock_timeout_ms)
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        self.last_recovery_us = elapsed
+        self.total_recovery_us += elapsed
+        if elapsed > self.max_recovery_us:
+            self.max_recovery_us = elapsed
+        if method == RELOCK_ASSIST:
+            self.relocks_assist += 1
+        elif method == RELOCK_FCAL:
+            self.relocks_fcal += 1
+        else:
+            self.relock_failures += 1
+        if diag.level >= (diag.INFO if method else diag.ERROR):
+            diag.log(diag.EV_RELOCK, diag.SRC_LMX2572, method or 0, elapsed)
+        return method is not None
+
+    def start(self):
+        """Start the periodic checks"""
+        self.running = True
+        if self.timer is not None:
+            self.timer.init(period=self.period_ms, mode=self.timer.PERIODIC, callback=self._tick_cb)
+
+    def stop(self):
+        """Stop the periodic checks"""
+        self.running = False
+        if self.timer is not None:
+            self.timer.deinit()
+
+    def stats(self):
+        """
+        Summarize the monitor counters
+
+        Returns:
+            Dictionary with:
+            {
+                'ticks': Lock checks run,
+                'unlock_events': Checks that found the PLL unlocked,
+                'verifications': Register batches read back,
+                'registers_corrected': Registers rewritten from the shadow,
+                'relocks_assist': Recoveries by cached full assist,
+                'relocks_fcal': Recoveries by FCAL,
+                'relock_failures': Recoveries that did not lock,
+                'last_recovery_us': Duration of the last recovery,
+                'max_recovery_us': Longest recovery,
+                'mean_recovery_us': Mean recovery duration
+            }
+        """
+        recoveries = self.relocks_assist + self.relocks_fcal + self.relock_failures
+        return {
+            'ticks': self.ticks,
+            'unlock_events': self.unlock_events,
+            'verifications': self.verifications,
+            'registers_corrected': self.registers_corrected,
+            'relocks_assist': self.relocks_assist,
+            'relocks_fcal': self.relocks_fcal,
+            'relock_failures': self.relock_failures,
+            'last_recovery_us': self.last_recovery_us,
+            'max_recovery_us': self.max_recovery_us,
+            'mean_recovery_us': self.total_recovery_us / recoveries if recoveries else 0,
+        }
@@ -0,0 +1,132 @@
+"""
+SYNC pin phase synchronization for one or several LMX2572 synthesizers
+
+Every participating part is armed over SPI (VCO_PHASE_SYNC_EN set, SYNC
+input enabled) and, once every part reports lock, a single edge on the
+shared SYNC line, generated with interrupts disabled, resets their
+dividers together. This completes the phase sync that
+set_freq(sync_en=True) prepares, so coherent channels can hop without
+relocking from scratch.
+"""
+
+import time
+
+import machine
+
+
+class PhaseSync:
+    """Arms synthesizers and fires one SYNC edge across them"""
+
+    def __init__(self, sync_pin, synths):
+        """
+        Args:
+            sync_pin: Output pin driving the SYNC input of every synthesizer
+            synths: An LMX2572 instance or a list of them
+        """
+        self.sync_pin = sync_pin
+        self.synths = list(synths) if isinstance(synths, (list, tuple)) else [synths]
+        self.sync_pin.value(0)
+        self.syncs = 0
+        self.last = None
+
+    def arm(self, calibrate=False):
+        """
+        Arm every synthesizer for the next SYNC edge
+
+        Args:
+            calibrate: Start an FCAL on every part while arming (after a retune)
+
+        Returns:
+            ticks_us when the last part was armed
+        """
+        for pll in self.synths:
+            pll.arm_phase_sync(calibrate)
+        return time.ticks_us()
+
+    def fire(self):
+        """
+        Pulse SYNC once with interrupts disabled
+
+        Returns:
+            ticks_us of the rising edge
+        """
+        pin = self.sync_pin
+        state = machine.disable_irq()
+        t_edge = time.ticks_us()
+        pin.value(1)
+        pin.value(0)
+        machine.enable_irq(state)
+        self.syncs += 1
+        return t_edge
+
+    def sync(self, wait_lock=True, timeout_ms=50, calibrate=False):
+        """
+        Arm every synthesizer, wait for all of them to lock and fire the SYNC edge
+
+        The edge is only fired once every part is locked, never in the
+        middle of a calibration.
+
+        Args:
+            wait_lock: Wait for every part to relock after the edge
+            timeout_ms: Maximum time to wait per part, before and after the edge
+            calibrate: Start an FCAL on every part while arming (after a retune)
+
+        Returns:
+            Dictionary describing the sync:
+            {
+                'arm_us': Time spent arming all parts,
+                'arm_to_sync_us': Time from the last part armed to the SYNC
+                    edge, including the wait for lock,
+                'fired': False if a part did not lock and no edge was sent,
+                'locked': True if every part locked (None when not waited for)
+            }
+        """
+        t_start = time.ticks_us()
+        t_armed = self.arm(calibrate)
+        for pll in self.synths:
+            if not pll.wait_lock(timeout_ms):
+                self.last = {
+                    'arm_us': time.ticks_diff(t_armed, t_start),
+                    'arm_to_sync_us': 0,
+                    'fired': False,
+                    'locked': False,
+                }
+                return self.last
+        t_edge = self.fire()
+
+        locked = None
+        if wait_lock:
+            locked = True
+            for pll in self.synths:
+                locked = pll.wait_lock(timeout_ms) and locked
+
+        self.last = {
+            'arm_us': time.ticks_diff(t_armed, t_start),
+            'arm_to_sync_us': time.ticks_diff(t_edge, t_armed),
+            'fired': True,
+            'locked': locked,
+        }
+        return self.last
+
+    def hop(self, freqs, timeout_ms=50):
+        """
+        Coherent hop: tune every synthesizer in sync mode, then sync them
+
+        Args:
+            freqs: Frequencies in Hz, one per synthesizer in order
+            timeout_ms: Maximum time to wait per part for lock
+
+        Returns:
+            Same dictionary as sync()
+        """
+        if len(freqs) != len(self.synths):
+            raise ValueError("Need one frequency per synthesizer")
+        for pll, freq in zip(self.synths, freqs):
+            if pll.set_freq(freq, sync_en=True) != 0:
+                raise ValueError("Frequency out of range: {}".format(freq))
+        return self.sync(timeout_ms=timeout_ms, calibrate=True)
+
+    def disarm(self):
+        """Leave phase sync mode on every synthesizer"""
+        for pll in self.synths:
+            pll.disarm_phase_sync()
@@ -1,15 +1,73 @@
+import time
 from machine import I2C
 
+import diag
+
+# Register 137 (Freeze DCO) values, preallocated so set_freq does not build them
+FREEZE_DCO = b'\x10'
+UNFREEZE_DCO = b'\x00'
+# Register 135 Freeze M (bit 5) values for small frequency changes
+FREEZE_M = b'\x20'
+UNFREEZE_M = b'\x00'
+
+# Retunes within this window of the centre frequency only update RFREQ
+SMALL_CHANGE_PPM = 3500
+
+# Legal output dividers, highest HSDIV first so ties go to the lower-power one
+HSDIV_VALUES = (11, 9, 7, 6, 5, 4)
+N1_VALUES = (1,) + tuple(range(2, 129, 2))  # 1 or any even value up to 128
+DCO_MIN = 4850000000  # Hz
+DCO_MAX = 5670000000  # Hz
+MAX_SOLUTIONS = 32  # Memoized divider solutions kept per Si570
+
+
+def solve_dividers(freq, fxtal):
+    """Find the HSDIV/N1 pair giving the lowest valid DCO frequency.
+
+    Every legal pair from HSDIV_VALUES and N1_VALUES is tried; the lowest
+    DCO frequency keeps the DCO current down, and on a tie the higher
+    HSDIV, tried first, wins. The N1 scan for one HSDIV stops at the
+    first DCO above DCO_MAX. freq and fxtal are integer Hz, so RFREQ is
+    computed without float rounding. Returns (hsdiv, n1, rfreq) with
+    rfreq being RFREQ * 2**28 rounded to an integer, or None if no pair
+    puts the DCO inside DCO_MIN..DCO_MAX.
+    """
+    best = None
+    for hsdiv in HSDIV_VALUES:
+        for n1 in N1_VALUES:
+            fdco = freq * hsdiv * n1
+            if fdco > DCO_MAX:
+                break
+            if fdco >= DCO_MIN and (best is None or fdco < best[0]):
+                best = (fdco, hsdiv, n1)
+    if best is None:
+        return None
+    fdco, hsdiv, n1 = best
+    return hsdiv, n1, (fdco * (2 ** 28) + fxtal // 2) // fxtal
+
+
 class Si570:
-    def __init__(self, i2c, address):
+    def __init__(self, i2c, address, verify=False):
         self.i2c = i2c
         self.address = address
         self.FXTAL = 114.285e6  # Fixed XTAL frequency in Hz (114.285 MHz)
 
+        # Registers 7-12 are transferred as one block through these buffers
+        self._buf = bytearray(6)
+        self._readback = bytearray(6)
+        self._rfreq = memoryview(self._buf)[1:]  # Registers 8-12
+        self.verify = verify  # Check every set_freq with a block readback
+        self.frozen_us = 0  # Time the DCO (or M) was frozen during the last set_freq
+        self.center_freq = None  # Centre of the small-change window
+        self.small_change = False  # Whether the last set_freq took the Freeze M path
+        self._solutions = {}  # Target frequency (Hz) -> (hsdiv, n1, rfreq)
+
         # Initialize variables
         self.REG = [0] * 6
         self.INITIAL_HSDIV = None
         self.INITIAL_N1 = None
+        self.HSDIV = None  # Dividers currently programmed
+        self.N1 = None
         self.DCO = None
         self.FOUT = None
 
@@ -17,19 +75,20 @@ class Si570:
         # Write to register 135 to recall NVM bits into RAM
         self.i2c.writeto_mem(self.address, 135, bytearray([0x01]))
 
-        # Read registers 7 to 12 and store them in REG
-        self.REG = [self.i2c.readfrom_mem(self.address, i + 7, 1)[0] for i in range(6)]
+        # Read registers 7 to 12 in one block and store them in REG
+        self.i2c.readfrom_mem_into(self.address, 7, self._buf)
+        self.REG = list(self._buf)
 
-        # Print register values to debug
-        print(f"Register Values (Hex): {[hex(reg) for reg in self.REG]}")
+        # Record register values to debug
+        if diag.level >= diag.DEBUG:
+            for i in range(6):
+                diag.log(diag.EV_READ, diag.SRC_SI570, i + 7, self._buf[i])
 
         # Extract INITIAL_HSDIV from REG[0]
         self.INITIAL_HSDIV = ((self.REG[0] & 0xE0) >> 5) + 4
-        print(f"Extracted INITIAL_HSDIV: {self.INITIAL_HSDIV}")
 
         # Extract INITIAL_N1 from REG[0] and REG[1]
         self.INITIAL_N1 = ((self.REG[0] & 0x1F) << 2) + ((self.REG[1] & 0xC0) >> 6)
-        print(f"Raw INITIAL_N1 Value: {self.INITIAL_N1}")
 
         # Handle special cases for N1
         if self.INITIAL_N1 == 0:  # If N1 is 0, set it to 1
@@ -37,11 +96,20 @@ class Si570:
         elif (self.INITIAL_N1 % 2) != 0:  # Ensure N1 is always even
             self.INITIAL_N1 += 1
         
-        print(f"FINAL INITIAL_N1: {self.INITIAL_N1}")
+        if diag.level >= diag.INFO:
+            diag.log(diag.EV_DIVIDERS, diag.SRC_SI570, 7, self.INITIAL_HSDIV << 8 | self.INITIAL_N1)
+
+        # The startup frequency is the first centre of the small-change window
+        rfreq = ((self.REG[1] & 0x3F) << 32) | (self.REG[2] << 24) | (self.REG[3] << 16) | (self.REG[4] << 8) | self.REG[5]
+        self.center_freq = rfreq * self.FXTAL / (2 ** 28) / (self.INITIAL_N1 * self.INITIAL_HSDIV)
+        self.HSDIV = self.INITIAL_HSDIV
+        self.N1 = self.INITIAL_N1
 
     def calculate_frequencies(self):
-        if self.REG is None:
-            print("REG is not initialized. Please call read_startup_configuration first.")
+        if self.INITIAL_N1 is None:
+            # REG is not initialized. Please call read_startup_configuration first.
+            if diag.level >= diag.ERROR:
+                diag.log(diag.EV_ERROR, diag.SRC_SI570, diag.ERR_NOT_INITIALIZED, 0)
             return
 
         # Initialize FRAC_BITS with double precision
@@ -53,9 +121,6 @@ class Si570:
         FRAC_BITS += (self.REG[4] * 256)                 # Extract bits 12-19 (8 bits)
         FRAC_BITS += self.REG[5]                         # Extract bits 20-27 (8 bits)
 
-        # Debug output for FRAC_BITS
-        print(f"FRAC_BITS: {FRAC_BITS}")
-
         # RFREQ is initially the fractional part divided by 2^28 for scaling
         RFREQ_FRAC = FRAC_BITS / (2 ** 28)
 
@@ -70,22 +135,20 @@ class Si570:
         # Add the integer portion to RFREQ
         RFREQ_INT = ((self.REG[1] & 0x3F) << 4) + ((self.REG[2] & 0xF0) >> 4)
 
-        print(f"RFREQ_INT: {RFREQ_INT}: RFREQ_FRAC: {RFREQ_FRAC}")  # Debug output for RFREQ_INT
-
         RFREQ = RFREQ_INT + RFREQ_FRAC  # Combine integer and fractional parts
-        # Final RFREQ output in hexadecimal
-        print(f"RFREQ: {RFREQ}")  # Print RFREQ
 
         # The DCO frequency calculation (DCO in proper units)
         self.DCO = RFREQ * self.FXTAL
 
         # Ensure DCO is within acceptable range
-        if not (4.85e9 <= self.DCO <= 5.67e9):
-            print(f"Warning: DCO frequency {self.DCO / 1e9:.6f} GHz is out of acceptable range!")
+        if not (DCO_MIN <= self.DCO <= DCO_MAX):
+            if diag.level >= diag.ERROR:
+                diag.log(diag.EV_ERROR, diag.SRC_SI570, diag.ERR_DCO_RANGE, int(self.DCO / 1000))
 
-        print(f"Calculated DCO: {self.DCO / 1e9:.6f} GHz")  # DCO in GHz
         self.FOUT = self.DCO / (self.INITIAL_N1 * self.INITIAL_HSDIV)
-        print(f"Calculated FOUT: {self.FOUT / 1e6:.6f} MHz")  # FOUT in MHz
+        if diag.level >= diag.INFO:
+            diag.log(diag.EV_FREQ, diag.SRC_SI570, diag.FREQ_DCO_KHZ, int(self.DCO / 1000))
+            diag.log(diag.EV_FREQ, diag.SRC_SI570, diag.FREQ_OUT_HZ, int(self.FOUT))
 
     def dump_register(self):
         # Ensure REG is not None
@@ -111,41 +174,112 @@ class Si570:
         print(f"DCO Frequency: {self.DCO / 1e9:.6f} GHz")      # DCO in GHz
         print(f"FOUT Frequency: {self.FOUT / 1e6:.6f} MHz")    # FOUT in MHz
 
-    def set_freq(self, desired_freq):
-        """Set the output frequency (FOUT) to the desired value."""
-        # Calculate the new DCO frequency
-        # Ensure INITIAL_N1 and INITIAL_HSDIV are obtained beforehand.
-        if self.INITIAL_N1 is None or self.INITIAL_HSDIV is None:
-            print("INITIAL_N1 or INITIAL_HSDIV not set. Please call read_startup_configuration first.")
-            return
+    def solve(self, freq):
+        """Memoized solve_dividers for an output frequency in Hz.
 
-        fdco = desired_freq * self.INITIAL_N1 * self.INITIAL_HSDIV
-        print(f"Calculated new DCO frequency: {fdco / 1e9:.6f} GHz")
+        freq is rounded to integer Hz, which is also the cache key, and
+        solved against the nominal FXTAL. At most MAX_SOLUTIONS results
+        are kept; the cache is cleared when it is full, so a sweep over
+        more frequencies than that runs at solve_dividers speed instead
+        of growing the heap. Returns (hsdiv, n1, rfreq) as solve_dividers
+        does, or None, which is not cached.
+        """
+        freq = int(round(freq))
+        solution = self._solutions.get(freq)
+        if solution is None:
+            solution = solve_dividers(freq, int(round(self.FXTAL)))
+            if solution is not None:
+                if len(self._solutions) >= MAX_SOLUTIONS:
+                    self._solutions.clear()
+                self._solutions[freq] = solution
+        return solution
+
+    def set_freq(self, desired_freq, verify=None):
+        """Set the output frequency (FOUT) to the desired value.
+
+        Within SMALL_CHANGE_PPM of the centre frequency only RFREQ
+        (registers 8-12) is written for the current dividers, under Freeze
+        M and without freezing the DCO, so the output does not glitch.
+        Larger changes pick the dividers giving the lowest valid DCO
+        (solve), write registers 7-12 as one block while the DCO is frozen
+        and become the new centre frequency. With verify (default: the
+        constructor setting) the registers are read back as one block
+        afterwards; returns False if the readback differs or no divider
+        pair can reach the frequency.
+        """
+        # Ensure the startup configuration has been read beforehand.
+        if self.N1 is None or self.HSDIV is None:
+            # INITIAL_N1 or INITIAL_HSDIV not set. Please call read_startup_configuration first.
+            if diag.level >= diag.ERROR:
+                diag.log(diag.EV_ERROR, diag.SRC_SI570, diag.ERR_NOT_INITIALIZED, 0)
+            return False
+
+        center = self.center_freq
+        self.small_change = abs(desired_freq - center) <= center * SMALL_CHANGE_PPM / 1e6
+        if self.small_change:
+            # Keep the dividers, RFREQ follows the output frequency
+            hsdiv, n1 = self.HSDIV, self.N1
+            fxtal = int(round(self.FXTAL))
+            rfreq = (int(round(desired_freq)) * hsdiv * n1 * (2 ** 28) + fxtal // 2) // fxtal
+        else:
+            solution = self.solve(desired_freq)
+            if solution is None:
+                # No HSDIV/N1 pair puts the DCO in range
+                if diag.level >= diag.ERROR:
+                    diag.log(diag.EV_ERROR, diag.SRC_SI570, diag.ERR_NO_DIVIDERS, int(desired_freq))
+                return False
+            hsdiv, n1, rfreq = solution
+
+        # Prepare register settings; N1 is stored as N1 - 1
+        n1_reg = n1 - 1
+        buf = self._buf
+        buf[0] = (hsdiv - 4) << 5 | (n1_reg >> 2)
+        buf[1] = (n1_reg & 0x03) << 6 | ((rfreq >> 32) & 0x3F)  # 0x3F = 63
+        buf[2] = (rfreq >> 24) & 0xFF
+        buf[3] = (rfreq >> 16) & 0xFF
+        buf[4] = (rfreq >> 8) & 0xFF
+        buf[5] = rfreq & 0xFF
+
+        start = time.ticks_us()
+        if self.small_change:
+            # Freeze M, write RFREQ only and release; the DCO keeps running
+            self.i2c.writeto_mem(self.address, 135, FREEZE_M)  # Freeze M (bit 5)
+            self.i2c.writeto_mem(self.address, 8, self._rfreq)  # Write new REG[1..5]
+            self.i2c.writeto_mem(self.address, 135, UNFREEZE_M)  # Unfreeze M (bit 5 = 0)
+        else:
+            # Freeze DCO and write registers 7-12 in one transaction
+            self.i2c.writeto_mem(self.address, 137, FREEZE_DCO)  # Freeze DCO (bit 4)
+            self.i2c.writeto_mem(self.address, 7, buf)  # Write new REG[0..5]
+
+            # Unfreeze DCO
+            self.i2c.writeto_mem(self.address, 137, UNFREEZE_DCO)  # Unfreeze DCO (bit 4 = 0)
+            self.center_freq = desired_freq
+            self.HSDIV = hsdiv
+            self.N1 = n1
+        self.frozen_us = time.ticks_diff(time.ticks_us(), start)
+        self.REG = list(buf)
+
+        if diag.level >= diag.DEBUG:
+            for i in range(1 if self.small_change else 0, 6):
+                diag.log(diag.EV_WRITE, diag.SRC_SI570, i + 7, buf[i])
+
+        if verify is None:
+            verify = self.verify
+        if verify:
+            self.i2c.readfrom_mem_into(self.address, 7, self._readback)
+            if self._readback != buf:
+                if diag.level >= diag.ERROR:
+                    for i in range(6):
+                        if self._readback[i] != buf[i]:
+                            diag.log(diag.EV_ERROR, diag.SRC_SI570, diag.ERR_READBACK, (i + 7) << 8 | self._readback[i])
+                return False
+
+        if diag.level >= diag.INFO:
+            diag.log(diag.EV_DIVIDERS, diag.SRC_SI570, 7, hsdiv << 8 | n1)
+            diag.log(diag.EV_FREQ, diag.SRC_SI570, diag.FREQ_DCO_KHZ, int(desired_freq * hsdiv * n1 / 1000))
+            diag.log(diag.EV_FREQ, diag.SRC_SI570, diag.FREQ_OUT_HZ, int(desired_freq))
+        return True
 
-        # Calculate RFREQ based on the new DCO
-        rf_freq = fdco / self.FXTAL
-        rf_freq_scaled = rf_freq * (2 ** 28)
-        
-        # Prepare register settings
-        reg0 = (self.INITIAL_HSDIV - 4) << 5 | (self.INITIAL_N1 >> 2)
-        reg1 = (self.INITIAL_N1 & 0x03) << 6 | ((int(rf_freq_scaled) >> 28) & 0x3F)  # 0x3F = 63
-        reg2 = (int(rf_freq_scaled) >> 24) & 0x0F
-        reg3 = (int(rf_freq_scaled) >> 16) & 0xFF
-        reg4 = (int(rf_freq_scaled) >> 8) & 0xFF
-        reg5 = int(rf_freq_scaled) & 0xFF
-
-        # Freeze DCO and set the new frequency configuration
-        self.i2c.writeto_mem(self.address, 137, bytearray([0x10]))  # Freeze DCO (bit 4)
-        self.i2c.writeto_mem(self.address, 7, bytearray([reg0]))  # Write new REG[0]
-        self.i2c.writeto_mem(self.address, 8, bytearray([reg1]))  # Write new REG[1]
-        self.i2c.writeto_mem(self.address, 9, bytearray([reg2]))  # Write new REG[2]
-        self.i2c.writeto_mem(self.address, 10, bytearray([reg3]))  # Write new REG[3]
-        self.i2c.writeto_mem(self.address, 11, bytearray([reg4]))  # Write new REG[4]
-        self.i2c.writeto_mem(self.address, 12, bytearray([reg5]))  # Write new REG[5]
-
-        # Unfreeze DCO
-        self.i2c.writeto_mem(self.address, 137, bytearray([0x00]))  # Unfreeze DCO (bit 4 = 0)
-        print(f"Frequency set to: {desired_freq} MHz")
 
 # Example usage
 # from machine import Pin
@@ -154,4 +288,4 @@ class Si570:
 # si570.read_startup_configuration()        # Read the startup configuration
 # si570.calculate_frequencies()              # Calculate the frequencies
 # si570.dump_register()                      # Output register values
-# si570.set_freq(161.132812)                # Set a new output frequency
\ No newline at end of file
+# si570.set_freq(161.132812e6)              # Set a new output frequency (Hz)
\ No newline at end of file
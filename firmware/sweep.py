@@ -0,0 +1,145 @@
+"""
+Stepped-frequency sweep scheduler for the LMX2572
+
+Walks a precompiled FreqPlan from a hardware Timer so the dwell per
+frequency is set by the timer rather than by the interpreter loop. Each
+tick writes the next register image and stores its timestamp in a
+preallocated array for jitter measurement; nothing is allocated per tick.
+
+On the host, pass a FakeClock and call simulate() instead of start().
+"""
+
+import time
+from array import array
+
+
+class FakeClock:
+    """Microsecond clock for host-side simulation, advanced explicitly"""
+
+    def __init__(self, start_us=0):
+        self.now = start_us
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, us):
+        self.now += us
+
+
+class Sweep:
+    """Timer driven sweep over the entries of a FreqPlan"""
+
+    def __init__(self, pll, plan, dwell_us, timer=None, clock=None, loops=0, log_size=256):
+        """
+        Args:
+            pll: LMX2572 instance
+            plan: FreqPlan from LMX2572.compile_freq_plan()
+            dwell_us: Time to spend on each frequency in microseconds; either
+                      whole milliseconds (Timer period) or a divisor of
+                      1000000 (Timer freq), so the timer runs the exact dwell
+            timer: machine.Timer used to pace the sweep (None for simulation)
+            clock: Callable returning microseconds (default time.ticks_us)
+            loops: Number of passes over the plan, 0 to sweep until stop()
+            log_size: Number of tick timestamps kept for jitter measurement
+        """
+        if dwell_us <= 0:
+            raise ValueError("Dwell must be positive")
+        dwell_us = int(dwell_us)
+        if dwell_us % 1000 and 1000000 % dwell_us:
+            raise ValueError("Dwell must be whole milliseconds or divide 1 s evenly")
+        self.pll = pll
+        self.plan = plan
+        self.dwell_us = dwell_us
+        self.timer = timer
+        self.clock = clock if clock is not None else time.ticks_us
+        self.loops = loops
+
+        self.timestamps = array('l', [0] * log_size)
+        self.index = 0      # Next plan entry to write
+        self.ticks = 0      # Ticks handled since start
+        self.running = False
+
+        # Bind the callback once so the timer does not allocate a bound method per tick
+        self._tick_cb = self._tick
+
+    def _tick(self, _timer):
+        if not self.running:
+            return
+        now = self.clock()
+        self.pll.set_plan_entry(self.plan, self.index)
+
+        self.timestamps[self.ticks % len(self.timestamps)] = now
+        self.ticks += 1
+        self.index += 1
+        if self.index >= len(self.plan):
+            self.index = 0
+            if self.loops and self.ticks >= self.loops * len(self.plan):
+                self.stop()
+
+    def start(self):
+        """Write the first entry and start the timer"""
+        self.index = 0
+        self.ticks = 0
+        self.running = True
+        self._tick(None)
+        if self.timer is not None and self.running:
+            if self.dwell_us % 1000 == 0:
+                self.timer.init(period=self.dwell_us // 1000, mode=self.timer.PERIODIC,
+                                callback=self._tick_cb)
+            else:
+                self.timer.init(freq=1000000 // self.dwell_us, mode=self.timer.PERIODIC,
+                                callback=self._tick_cb)
+
+    def stop(self):
+        """Stop the sweep, leaving the synthesizer on the last written entry"""
+        self.running = False
+        if self.timer is not None:
+            self.timer.deinit()
+
+    def simulate(self, ticks, jitter=None):
+        """
+        Run the sweep against a FakeClock without a hardware timer
+
+        Args:
+            ticks: Number of timer ticks to simulate
+            jitter: Optional callable(tick) returning extra latency in microseconds
+        """
+        clock = self.clock
+        self.start()
+        for k in range(1, ticks):
+            if not self.running:
+                break
+            clock.advance(self.dwell_us + (jitter(k) if jitter else 0))
+            self._tick(None)
+
+    def jitter(self):
+        """
+        Summarize the recorded tick intervals
+
+        Returns:
+            Dictionary with the interval statistics in microseconds:
+            {
+                'ticks': Number of intervals measured,
+                'mean_us': Mean interval,
+                'min_us': Shortest interval,
+                'max_us': Longest interval,
+                'jitter_us': Peak deviation from the programmed dwell
+            }
+        """
+        size = len(self.timestamps)
+        n = min(self.ticks, size)
+        first = self.ticks - n
+        intervals = []
+        for k in range(first + 1, self.ticks):
+            intervals.append(time.ticks_diff(self.timestamps[k % size], self.timestamps[(k - 1) % size]))
+        if not intervals:
+            return {'ticks': 0, 'mean_us': 0, 'min_us': 0, 'max_us': 0, 'jitter_us': 0}
+        lo = min(intervals)
+        hi = max(intervals)
+        return {
+            'ticks': len(intervals),
+            'mean_us': sum(intervals) / len(intervals),
+            'min_us': lo,
+            'max_us': hi,
+            'jitter_us': max(hi - self.dwell_us, self.dwell_us - lo),
+        }
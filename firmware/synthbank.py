@@ -0,0 +1,161 @@
+"""
+Coordinated control of several LMX2572 synthesizers on one SPI bus
+
+The dual-PLL board runs a TX and an LO synthesizer from the same SPI bus,
+each with its own CS and CE. SynthBank tunes them together by interleaving
+their register writes, so the NUM and N words (written last) and the R0
+writes that start calibration land back to back, and measures the skew between
+the parts' lock events.
+"""
+
+import time
+
+from lmx2572 import LMX2572, FreqPlan
+
+
+class SynthBank:
+    """Several LMX2572 instances sharing an SPI bus"""
+
+    def __init__(self, spi):
+        """
+        Args:
+            spi: Initialized SPI object shared by every synthesizer
+        """
+        self.spi = spi
+        self.synths = {}
+        self.order = []  # Write order within each interleaved step
+        self.last_tune = None
+
+    def add(self, name, cs, en, **kwargs):
+        """
+        Create and register a synthesizer on the shared bus
+
+        Args:
+            name: Name used to address the synthesizer, e.g. 'txs' or 'los'
+            cs: Chip select pin (active low)
+            en: Chip enable pin
+            **kwargs: Passed on to LMX2572 (ref_freq, ld_pin, cal_cache, ...)
+
+        Returns:
+            The LMX2572 instance
+        """
+        if name in self.synths:
+            raise ValueError("Synthesizer {} already added".format(name))
+        cs.value(1)
+        pll = LMX2572(spi=self.spi, cs=cs, en=en, **kwargs)
+        self.synths[name] = pll
+        self.order.append(name)
+        return pll
+
+    def __getitem__(self, name):
+        return self.synths[name]
+
+    def setup(self, freqs=None, **kwargs):
+        """
+        Enable and set up every synthesizer, then tune them together
+
+        Args:
+            freqs: Optional {name: frequency in Hz} to tune with tune()
+            **kwargs: Passed on to LMX2572.setup()
+
+        Returns:
+            {name: locked} from each part's setup
+        """
+        result = {}
+        for name in self.order:
+            pll = self.synths[name]
+            pll.enable()
+            result[name] = pll.setup(**kwargs)
+        if freqs:
+            self.tune(freqs)
+        return result
+
+    def tune(self, freqs, timeout_us=50000):
+        """
+        Tune several synthesizers with interleaved register writes
+
+        Each part's register image is compiled first; the words are then
+        written register by register across the parts with
+        LMX2572.write_plan_words() (skipping words a part already holds),
+        N last, followed by every part's start_plan_entry() R0 write back
+        to back.
+
+        Args:
+            freqs: {name: frequency in Hz}
+            timeout_us: Maximum time to wait for all parts to lock
+
+        Returns:
+            Dictionary describing the tune:
+            {
+                'locked': True if every part locked,
+                'lock_us': {name: ticks_us of the lock event, None if not seen},
+                'lock_skew_us': Spread between the earliest and latest lock,
+                'n_skew_us': Time across the NUM and N word writes (R43..R34),
+                'fcal_skew_us': Time between the first and last R0 write
+            }
+        """
+        names = [name for name in self.order if name in freqs]
+        tuned = []
+        for name in names:
+            pll = self.synths[name]
+            tuned.append((pll, pll.compile_freq_plan([freqs[name]])))
+
+        stride = FreqPlan.STRIDE
+        num_n = stride - FreqPlan.NUM_N_WORDS
+        skipped = [0] * len(tuned)
+        n_first = 0
+        for k in range(stride):
+            if k == num_n:
+                n_first = time.ticks_us()
+            for i, (pll, plan) in enumerate(tuned):
+                skipped[i] += pll.write_plan_words(plan, 0, k, k + 1)
+        n_last = time.ticks_us()
+
+        fcal_first = time.ticks_us()
+        for pll, plan in tuned:
+            pll.start_plan_entry(plan, 0)
+        fcal_last = time.ticks_us()
+        for i, (pll, plan) in enumerate(tuned):
+            pll.words_skipped += skipped[i]
+            pll.last_skipped = skipped[i]
+
+        lock_us = self.wait_for_lock(names, timeout_us)
+        seen = [t for t in lock_us.values() if t is not None]
+        skew = 0
+        if len(seen) > 1:
+            skew = max(time.ticks_diff(t, seen[0]) for t in seen) - min(time.ticks_diff(t, seen[0]) for t in seen)
+
+        self.last_tune = {
+            'locked': len(seen) == len(names),
+            'lock_us': lock_us,
+            'lock_skew_us': skew,
+            'n_skew_us': time.ticks_diff(n_last, n_first),
+            'fcal_skew_us': time.ticks_diff(fcal_last, fcal_first),
+        }
+        return self.last_tune
+
+    def wait_for_lock(self, names=None, timeout_us=50000):
+        """
+        Wait until every named synthesizer reports lock
+
+        Parts with a lock detect pin are sampled directly so their lock
+        times are resolved to the polling loop; the others fall back to
+        is_locked() over SPI.
+
+        Returns:
+            {name: ticks_us at which lock was first seen, or None on timeout}
+        """
+        if names is None:
+            names = self.order
+        pending = list(names)
+        lock_us = {name: None for name in names}
+        start = time.ticks_us()
+        while pending:
+            now = time.ticks_us()
+            for name in pending:
+                if self.synths[name].is_locked():
+                    lock_us[name] = now
+            pending = [name for name in pending if lock_us[name] is None]
+            if time.ticks_diff(now, start) >= timeout_us:
+                break
+        return lock_us
@@ -0,0 +1,97 @@
+"""
+VCO calibration cache for the LMX2572
+
+After a successful lock the chip reports the VCO core, capacitor code and
+DAC current it settled on (rb_VCO_SEL, rb_VCO_CAPCTRL, rb_VCO_DACISET in
+R110-R112). Storing those per VCO frequency bin lets a later tune to the
+same bin force the known-good values (full assist) instead of searching
+from the partial assist estimate.
+"""
+
+# Entry layout: [vco_sel, capctrl, daciset, temperature, last_used]
+_SEL, _CAP, _DAC, _TEMP, _USED = range(5)
+
+
+class VcoCalCache:
+    """Least recently used cache of VCO calibration results by frequency bin"""
+
+    def __init__(self, bin_hz=10000000, max_entries=32):
+        """
+        Args:
+            bin_hz: Width of a VCO frequency bin in Hz
+            max_entries: Number of bins kept before the least recently used is evicted
+        """
+        self.bin_hz = bin_hz
+        self.max_entries = max_entries
+        self.entries = {}
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _bin(self, vco_freq):
+        return int(vco_freq) // self.bin_hz
+
+    def lookup(self, vco_freq):
+        """
+        Find the calibration stored for a VCO frequency
+
+        Returns:
+            (vco_sel, capctrl, daciset) or None if the bin is not cached
+        """
+        entry = self.entries.get(self._bin(vco_freq))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._clock += 1
+        entry[_USED] = self._clock
+        return entry[_SEL], entry[_CAP], entry[_DAC]
+
+    def store(self, vco_freq, vco_sel, capctrl, daciset, temp=None):
+        """
+        Store a calibration result, evicting the least recently used bin if full
+
+        Args:
+            vco_freq: VCO frequency the result was obtained at (Hz)
+            vco_sel: VCO core (1-6)
+            capctrl: VCO capacitor code
+            daciset: VCO DAC current code
+            temp: Optional temperature at calibration time, for invalidate_drift()
+        """
+        key = self._bin(vco_freq)
+        entries = self.entries
+        if key not in entries and len(entries) >= self.max_entries:
+            oldest = None
+            for k, entry in entries.items():
+                if oldest is None or entry[_USED] < entries[oldest][_USED]:
+                    oldest = k
+            del entries[oldest]
+            self.evictions += 1
+        self._clock += 1
+        entries[key] = [vco_sel, capctrl, daciset, temp, self._clock]
+
+    def invalidate(self, vco_freq=None):
+        """Drop the bin of `vco_freq`, or every bin when it is None"""
+        if vco_freq is None:
+            self.entries = {}
+        else:
+            self.entries.pop(self._bin(vco_freq), None)
+
+    def invalidate_drift(self, temp, max_delta):
+        """
+        Drop calibrations taken more than `max_delta` away from temperature `temp`
+
+        Entries stored without a temperature are dropped as well.
+
+        Returns:
+            Number of entries removed
+        """
+        stale = [k for k, entry in self.entries.items()
+                 if entry[_TEMP] is None or abs(entry[_TEMP] - temp) > max_delta]
+        for k in stale:
+            del self.entries[k]
+        return len(stale)
@@ -0,0 +1,113 @@
+"""
+Per-write cost of the lmx2572_fast packing implementations
+
+Packs the 126-word default image into SPI frames with the bytecode loop
+write_register uses, with pack_frames_py and, on a MicroPython build with
+the viper emitter, the viper pack_frames; also times the N/NUM/DEN split.
+Every implementation is checked to produce the same bytes before timing.
+
+    mpremote run tools/bench_fast.py     # copy firmware/ to the board first
+    python tools/bench_fast.py [runs]    # host: pure Python only
+
+Bus time and CS toggling are not included; they are the same for every
+implementation.
+"""
+
+import sys
+import time
+from array import array
+
+try:
+    import hostshim  # noqa: F401  (host: machine shims and firmware/ on sys.path)
+except ImportError:
+    pass
+
+import lmx2572_fast
+from lmx2572 import lmx2572_registers_default
+
+N_TEST, FRAC_TEST, DEN_TEST = 0x4ABCD, 0xDEADBEEF, 0xFFFFFFFF
+
+
+def pack_bytecode(buf, words, n, reverse=False):
+    """The per-register packing of write_register, one word at a time"""
+    for i in range(n):
+        reg_data = words[n - 1 - i] if reverse else words[i]
+        reg_addr = (reg_data >> 16) & 0x7F
+        data = reg_data & 0xFFFF
+        j = 3 * i
+        buf[j] = reg_addr & 0x7F
+        buf[j + 1] = (data >> 8) & 0xFF
+        buf[j + 2] = data & 0xFF
+
+
+def split_bytecode(out, n, frac, den):
+    """The inline N/NUM/DEN split set_freq used before lmx2572_fast"""
+    out[5] = ((n >> 16) & 0x7) | 0x10
+    out[4] = n & 0xFFFF
+    out[1] = den >> 16
+    out[0] = den & 0xFFFF
+    out[3] = frac >> 16
+    out[2] = frac & 0xFFFF
+
+
+def implementations():
+    packs = [("bytecode", pack_bytecode), ("python", lmx2572_fast.pack_frames_py)]
+    splits = [("bytecode", split_bytecode), ("python", lmx2572_fast.split_pll_py)]
+    if lmx2572_fast.IMPLEMENTATION != 'python':
+        packs.append((lmx2572_fast.IMPLEMENTATION, lmx2572_fast.pack_frames))
+        splits.append((lmx2572_fast.IMPLEMENTATION, lmx2572_fast.split_pll))
+    return packs, splits
+
+
+def check(packs, splits):
+    words = lmx2572_registers_default
+    n = len(words)
+    for reverse in (False, True):
+        expected = bytearray(3 * n)
+        pack_bytecode(expected, words, n, reverse)
+        for name, fn in packs:
+            buf = bytearray(3 * n)
+            fn(buf, words, n, reverse)
+            if buf != expected:
+                raise AssertionError("{} pack_frames differs (reverse={})".format(name, reverse))
+    expected = array('H', (0,) * 6)
+    split_bytecode(expected, N_TEST, FRAC_TEST, DEN_TEST)
+    for name, fn in splits:
+        out = array('H', (0,) * 6)
+        fn(out, N_TEST, FRAC_TEST, DEN_TEST)
+        if out != expected:
+            raise AssertionError("{} split_pll differs".format(name))
+
+
+def bench(runs):
+    packs, splits = implementations()
+    check(packs, splits)
+
+    words = lmx2572_registers_default
+    n = len(words)
+    buf = bytearray(3 * n)
+    print("implementation {} ({})".format(lmx2572_fast.IMPLEMENTATION, sys.implementation.name))
+    print("pack_frames, {} words/image".format(n))
+    base = None
+    for name, fn in packs:
+        start = time.ticks_us()
+        for _ in range(runs):
+            fn(buf, words, n, True)
+        us = time.ticks_diff(time.ticks_us(), start) / (runs * n)
+        base = base or us
+        print("  {:<10s} {:8.3f} us/write  {:5.2f}x".format(name, us, base / us))
+
+    out = array('H', (0,) * 6)
+    print("split_pll")
+    base = None
+    for name, fn in splits:
+        start = time.ticks_us()
+        for _ in range(runs * 10):
+            fn(out, N_TEST, FRAC_TEST, DEN_TEST)
+        us = time.ticks_diff(time.ticks_us(), start) / (runs * 10)
+        base = base or us
+        print("  {:<10s} {:8.3f} us/call   {:5.2f}x".format(name, us, base / us))
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
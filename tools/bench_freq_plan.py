@@ -0,0 +1,61 @@
+"""
+Per-hop latency of LMX2572.set_freq against a precompiled FreqPlan
+
+Runs on the host against a mock SPI bus:
+
+    python tools/bench_freq_plan.py [hops]
+"""
+
+import sys
+import time
+
+import hostshim
+from lmx2572 import LMX2572
+
+# Hops wider than VCO_CAL_THRESHOLD so set_freq takes the full assist path
+FREQS = [3.3e9 + ((k * 7) % 20) * 150e6 for k in range(20)]
+
+# Small fractional hops that only move PLL_NUM
+FINE_FREQS = [5.8e9 + k * 250e3 for k in range(64)]
+
+
+def bench(hops):
+    spi = hostshim.MockSPI()
+    pll = LMX2572(spi=spi, cs=hostshim.MockPin(), en=hostshim.MockPin())
+    pll.configure_default()
+    pll.set_ref()
+
+    start = time.ticks_us()
+    plan = pll.compile_freq_plan(FREQS)
+    compile_us = time.ticks_diff(time.ticks_us(), start)
+
+    n = len(FREQS)
+    spi.reset()
+    start = time.ticks_us()
+    for k in range(hops):
+        pll.set_freq(FREQS[k % n])
+    direct_us = time.ticks_diff(time.ticks_us(), start)
+    direct_writes = spi.writes
+
+    spi.reset()
+    start = time.ticks_us()
+    for k in range(hops):
+        pll.set_plan_entry(plan, k % n)
+    plan_us = time.ticks_diff(time.ticks_us(), start)
+    plan_writes = spi.writes
+
+    print("plan compile : {} entries in {} us".format(n, compile_us))
+    print("set_freq     : {:8.2f} us/hop  {:5.1f} SPI writes/hop".format(direct_us / hops, direct_writes / hops))
+    print("plan entry   : {:8.2f} us/hop  {:5.1f} SPI writes/hop".format(plan_us / hops, plan_writes / hops))
+    print("speedup      : {:.2f}x".format(direct_us / plan_us))
+
+    n = len(FINE_FREQS)
+    spi.reset()
+    pll.words_skipped = 0
+    for k in range(hops):
+        pll.set_freq(FINE_FREQS[k % n])
+    print("fine hops    : {:5.1f} SPI writes/hop  {:5.1f} skipped/hop".format(spi.writes / hops, pll.words_skipped / hops))
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,57 @@
+"""
+Init time of LMX2572.configure_default: per-register writes against the burst path
+
+Runs on the host against a mock SPI bus and checks both paths put the
+same frames on the wire:
+
+    python tools/bench_init.py [runs]
+"""
+
+import sys
+import time
+
+import hostshim
+from lmx2572 import LMX2572, lmx2572_registers_default
+
+
+def configure_default_per_register(pll):
+    """The original init path: one write_register call per register, highest address first"""
+    for reg_data in reversed(lmx2572_registers_default):
+        pll.write_register((reg_data >> 16) & 0x7F, reg_data & 0xFFFF)
+
+
+def bench(runs):
+    spi = hostshim.MockSPI()
+    pll = LMX2572(spi=spi, cs=hostshim.MockPin(), en=hostshim.MockPin())
+
+    spi.record = True
+    configure_default_per_register(pll)
+    old_frames = spi.log
+    spi.reset()
+    pll.configure_default()
+    if spi.log != old_frames:
+        raise AssertionError("burst path wrote different frames")
+    spi.record = False
+
+    spi.reset()
+    start = time.ticks_us()
+    for _ in range(runs):
+        configure_default_per_register(pll)
+    old_us = time.ticks_diff(time.ticks_us(), start)
+    old_writes = spi.writes
+
+    spi.reset()
+    start = time.ticks_us()
+    for _ in range(runs):
+        pll.configure_default()
+    new_us = time.ticks_diff(time.ticks_us(), start)
+    new_writes = spi.writes
+
+    print("registers      : {}".format(len(lmx2572_registers_default)))
+    print("write_register : {:8.1f} us/init  {} spi.write/init".format(old_us / runs, old_writes // runs))
+    print("burst          : {:8.1f} us/init  {} spi.write/init".format(new_us / runs, new_writes // runs))
+    print("speedup        : {:.2f}x".format(old_us / new_us))
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
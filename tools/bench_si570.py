@@ -0,0 +1,125 @@
+"""
+Frozen window of Si570.set_freq: per-register writes, block write and Freeze M
+
+Runs on the host against a mock I2C bus that spends the wire time of each
+transaction (start, address, register, data, stop at the given bus clock),
+so the window between freeze and unfreeze reflects the transaction count.
+Large retunes alternate by 1% so each one freezes the DCO; small retunes
+stay inside the Freeze M window. Also checks the old and new paths leave
+the same values in registers 7-12:
+
+    python tools/bench_si570.py [runs] [bus_hz]
+"""
+
+import sys
+import time
+
+import hostshim
+from si570 import Si570
+
+ADDRESS = 0x55
+# Registers 7-12 as shipped for a 10 MHz part (HSDIV=11, N1=12)
+STARTUP_REGS = b'\xe2\xc2\xbc\x01\x1e\xb8'
+
+
+class WireI2C(hostshim.MockI2C):
+    """MockI2C that busy-waits for the time each transaction takes on the wire"""
+
+    def __init__(self, bus_hz=400000):
+        super().__init__()
+        self.bit_ns = 1000000000 // bus_hz
+        self.frozen_transactions = 0
+        self._frozen = False
+
+    def _wire(self, nbytes):
+        # Address + register byte + payload, 9 clocks per byte, plus start/stop
+        end = time.perf_counter_ns() + ((2 + nbytes) * 9 + 2) * self.bit_ns
+        while time.perf_counter_ns() < end:
+            pass
+
+    def writeto_mem(self, addr, memaddr, buf):
+        if memaddr == 137:
+            self._frozen = bool(buf[0] & 0x10)
+        elif memaddr == 135:
+            self._frozen = bool(buf[0] & 0x20)
+        elif self._frozen:
+            self.frozen_transactions += 1
+        self._wire(len(buf))
+        super().writeto_mem(addr, memaddr, buf)
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        self._wire(len(buf) + 1)  # repeated start and address for the read
+        super().readfrom_mem_into(addr, memaddr, buf)
+
+
+def set_freq_per_register(si, desired_freq):
+    """The pre-block write path: one transaction per register while frozen"""
+    hsdiv, n1, rfreq = si.solve(desired_freq)
+    n1_reg = n1 - 1
+    regs = ((hsdiv - 4) << 5 | (n1_reg >> 2),
+            (n1_reg & 0x03) << 6 | ((rfreq >> 32) & 0x3F),
+            (rfreq >> 24) & 0xFF,
+            (rfreq >> 16) & 0xFF,
+            (rfreq >> 8) & 0xFF,
+            rfreq & 0xFF)
+    start = time.ticks_us()
+    si.i2c.writeto_mem(si.address, 137, bytearray([0x10]))
+    for i, reg in enumerate(regs):
+        si.i2c.writeto_mem(si.address, 7 + i, bytearray([reg]))
+    si.i2c.writeto_mem(si.address, 137, bytearray([0x00]))
+    return time.ticks_diff(time.ticks_us(), start)
+
+
+def bench(runs, bus_hz):
+    i2c = WireI2C(bus_hz)
+    i2c.writeto_mem(ADDRESS, 7, STARTUP_REGS)
+    si = Si570(i2c, ADDRESS)
+    freqs = [10e6 * (1.01 if i & 1 else 1.0) + 1e3 * i for i in range(runs)]
+
+    si.read_startup_configuration()
+
+    set_freq_per_register(si, freqs[-1])
+    old_regs = bytes(i2c.mem[ADDRESS][7:13])
+    if not si.set_freq(freqs[-1], verify=True) or bytes(i2c.mem[ADDRESS][7:13]) != old_regs:
+        raise AssertionError("block write left different register values")
+
+    i2c.frozen_transactions = 0
+    old_us = 0
+    for freq in freqs:
+        old_us += set_freq_per_register(si, freq)
+    old_transactions = i2c.frozen_transactions
+
+    i2c.frozen_transactions = 0
+    new_us = 0
+    for freq in freqs:
+        si.set_freq(freq)
+        new_us += si.frozen_us
+    new_transactions = i2c.frozen_transactions
+
+    # Fine trims around the centre left by the last large retune
+    fine_freqs = [si.center_freq + 100 * (i % 50) for i in range(runs)]
+    i2c.frozen_transactions = 0
+    fine_us = 0
+    for freq in fine_freqs:
+        si.set_freq(freq)
+        if not si.small_change:
+            raise AssertionError("fine retune froze the DCO")
+        fine_us += si.frozen_us
+    fine_transactions = i2c.frozen_transactions
+
+    start = time.ticks_us()
+    for freq in freqs:
+        si.set_freq(freq, verify=True)
+    verify_us = time.ticks_diff(time.ticks_us(), start)
+
+    print("bus clock      : {} Hz".format(bus_hz))
+    print("per-register   : {:8.1f} us frozen  {} writes while frozen".format(old_us / runs, old_transactions // runs))
+    print("block          : {:8.1f} us frozen  {} writes while frozen".format(new_us / runs, new_transactions // runs))
+    print("freeze M       : {:8.1f} us frozen  {} writes while frozen (DCO not frozen)".format(fine_us / runs, fine_transactions // runs))
+    print("block + verify : {:8.1f} us/set_freq".format(verify_us / runs))
+    print("speedup        : {:.2f}x".format(old_us / new_us))
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+          int(sys.argv[2]) if len(sys.argv) > 2 else 400000)
@@ -0,0 +1,50 @@
+"""
+Check that lmx2572_meta agrees with the driver's field map
+
+Every field in lmx2572.FIELDS must have a FIELD_DESCRIPTIONS entry under
+its register and bit range, and no description may name a FIELDS field
+at another register or bit range. Descriptions of fields the driver does
+not program (readback, reset control) are not checked.
+
+    python tools/check_meta.py
+"""
+
+import sys
+
+import hostshim
+from lmx2572 import FIELDS
+from lmx2572_meta import FIELD_DESCRIPTIONS
+
+
+def bit_key(shift, mask):
+    """FIELD_DESCRIPTIONS key ("msb-lsb" or "bit") of a FIELDS entry"""
+    msb = mask.bit_length() - 1
+    return str(shift) if msb == shift else "{}-{}".format(msb, shift)
+
+
+def main():
+    described = {}
+    for reg, fields in FIELD_DESCRIPTIONS.items():
+        for key, text in fields.items():
+            described.setdefault(text.split(":")[0], []).append((reg, key))
+
+    failures = []
+    for name in sorted(FIELDS):
+        reg, shift, mask = FIELDS[name]
+        want = (reg, bit_key(shift, mask))
+        got = described.get(name)
+        if got is None:
+            failures.append("{}: no description (FIELDS R{} bits {})".format(name, *want))
+        elif got != [want]:
+            failures.append("{}: described at {}, FIELDS R{} bits {}".format(
+                name, ", ".join("R{} bits {}".format(*where) for where in got), *want))
+
+    for failure in failures:
+        print("FAIL: " + failure)
+    if not failures:
+        print("OK: {} fields described as FIELDS programs them".format(len(FIELDS)))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Check SynthBank write ordering on a mock SPI bus
+
+Every frame is logged with the chip select that was low while it was
+clocked out. The script verifies that the TX and LO NUM and N words
+(R43/R42/R36/R34) and the R0 writes that start calibration are adjacent
+on the bus, then prints the bus log of the tune.
+
+    python tools/check_synthbank.py
+"""
+
+import sys
+
+import hostshim
+from synthbank import SynthBank
+
+
+class BusLog(hostshim.MockSPI):
+    """Mock SPI that tags every frame with the selected chip"""
+
+    def __init__(self):
+        super().__init__()
+        self.selected = None
+        self.frames = []
+
+    def write(self, buf):
+        super().write(buf)
+        self.frames.append((self.selected, buf[0] & 0x7F, (buf[1] << 8) | buf[2]))
+
+
+class CsPin(hostshim.MockPin):
+    def __init__(self, bus, name):
+        super().__init__(value=1)
+        self.bus = bus
+        self.name = name
+
+    def value(self, v=None):
+        if v is not None:
+            self.bus.selected = self.name if not v else None
+        return super().value(v)
+
+
+def main():
+    bus = BusLog()
+    bank = SynthBank(bus)
+    for name in ("txs", "los"):
+        ld = hostshim.MockPin(value=1)
+        bank.add(name, CsPin(bus, name), hostshim.MockPin(), ld_pin=ld)
+    for name in bank.order:
+        bank[name].configure_default()
+        bank[name].set_ref()
+
+    bus.frames = []
+    report = bank.tune({"txs": 5.8e9, "los": 5.7e9})
+    frames = bus.frames
+
+    for chip, reg, value in frames:
+        print("{:4s} R{:03d} = 0x{:04X}".format(chip, reg, value))
+    print(report)
+
+    def positions(reg):
+        return [i for i, (_, r, _) in enumerate(frames) if r == reg]
+
+    failures = []
+    r0 = positions(0)
+    if len(r0) != 2 or r0[1] - r0[0] != 1:
+        failures.append("R0 writes not adjacent: {}".format(r0))
+    # NUM and N words (R43, R42, R36, R34) of both chips must be the last frames before the R0 pair
+    n = sorted(positions(43) + positions(42) + positions(36) + positions(34))
+    if not r0 or not n or n != list(range(r0[0] - len(n), r0[0])):
+        failures.append("NUM/N words not directly ahead of R0: {}".format(n))
+    elif {frames[i][0] for i in n} != {"txs", "los"}:
+        failures.append("N words missing a chip: {}".format(n))
+    chips = [chip for chip, _, _ in frames]
+    if None in chips:
+        failures.append("frame written with no chip selected")
+
+    for failure in failures:
+        print("FAIL: " + failure)
+    if not failures:
+        print("OK: write ordering interleaved as expected")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
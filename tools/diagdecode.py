@@ -0,0 +1,106 @@
+"""
+Decode a diagnostics ring dump written by firmware/diag.py
+
+    python tools/diagdecode.py diag.bin
+    python tools/diagdecode.py --demo diag.bin
+
+Copy the dump off the board with e.g. `mpremote cp :/diag.bin diag.bin`.
+--demo first writes a dump by running the drivers against mock buses, to
+exercise the format on the host.
+"""
+
+import argparse
+import struct
+import sys
+
+import hostshim
+import diag
+
+EVENTS = {getattr(diag, n): n[3:] for n in dir(diag) if n.startswith("EV_")}
+SOURCES = {getattr(diag, n): n[4:] for n in dir(diag) if n.startswith("SRC_")}
+ERRORS = {getattr(diag, n): n[4:] for n in dir(diag) if n.startswith("ERR_")}
+RELOCK_METHODS = {0: "failed", 1: "full assist", 2: "FCAL"}
+FREQ_KINDS = {diag.FREQ_OUT_HZ: ("FOUT", 1, "Hz"), diag.FREQ_DCO_KHZ: ("DCO", 1000, "Hz")}
+
+
+def describe(event, src, reg, value):
+    if event in (diag.EV_WRITE, diag.EV_READ):
+        prefix = "R" if src == diag.SRC_LMX2572 else "reg "
+        return "{}{:<3d} = 0x{:04X}".format(prefix, reg, value)
+    if event == diag.EV_READBACK:
+        return "R0 = 0x{:04X} (readback {})".format(value, "off" if value & 0x4 else "on")
+    if event in (diag.EV_LOCK, diag.EV_UNLOCK):
+        return "#{}".format(value)
+    if event == diag.EV_FREQ:
+        name, scale, unit = FREQ_KINDS.get(reg, ("freq{}".format(reg), 1, "?"))
+        return "{} = {} {}".format(name, value * scale, unit)
+    if event == diag.EV_DIVIDERS:
+        return "HSDIV = {}, N1 = {}".format(value >> 8, value & 0xFF)
+    if event == diag.EV_MISMATCH:
+        return "R{:<3d} expected 0x{:04X} read 0x{:04X}".format(value >> 16, reg, value & 0xFFFF)
+    if event == diag.EV_RELOCK:
+        return "{} in {} us".format(RELOCK_METHODS.get(reg, reg), value)
+    if event == diag.EV_ERROR:
+        return "{} (0x{:X})".format(ERRORS.get(reg, reg), value)
+    return "reg {} value 0x{:X}".format(reg, value)
+
+
+def decode(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    header_size = struct.calcsize(diag.DUMP_FMT)
+    if len(raw) < header_size:
+        raise SystemExit("Truncated header")
+    magic, version, words, count, dropped = struct.unpack_from(diag.DUMP_FMT, raw)
+    if magic != diag.DUMP_MAGIC or version != diag.DUMP_VERSION:
+        raise SystemExit("Not a diag dump (magic {}, version {})".format(magic, version))
+    if len(raw) < header_size + count * words * 4:
+        raise SystemExit("Truncated records")
+    print("records      : {} ({} older records overwritten)".format(count, dropped))
+
+    t0 = None
+    for n in range(count):
+        word, value, ticks = struct.unpack_from("<III", raw, header_size + n * words * 4)
+        event, src, reg = word >> 24, (word >> 16) & 0xFF, word & 0xFFFF
+        if t0 is None:
+            t0 = ticks
+        print("{:>10d} us  {:<8s} {:<9s} {}".format(
+            (ticks - t0) & 0xFFFFFFFF, SOURCES.get(src, str(src)), EVENTS.get(event, str(event)),
+            describe(event, src, reg, value)))
+
+
+def demo(path):
+    from lmx2572 import LMX2572
+    from si570 import Si570
+
+    diag.enable(diag.DEBUG, size=128)
+    pll = LMX2572(spi=hostshim.MockSPI(), cs=hostshim.MockPin(), en=hostshim.MockPin())
+    pll.configure_default()
+    pll.set_freq(5.8e9)
+    pll.read_register(110)
+
+    i2c = hostshim.MockI2C()
+    i2c.writeto_mem(0x55, 7, b'\xe2\xc2\xbc\x01\x1e\xb8')
+    si = Si570(i2c, 0x55)
+    si.read_startup_configuration()
+    si.calculate_frequencies()
+    si.set_freq(156.25e6)
+    si.set_freq(156.26e6)
+    diag.disable()
+    print("wrote {} records to {}".format(diag.dump(path), path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("dump")
+    parser.add_argument("--demo", action="store_true", help="write a dump from the mock drivers first")
+    args = parser.parse_args()
+    if sys.byteorder != "little" and args.demo:
+        raise SystemExit("Dumps are little-endian; run the demo on a little-endian host")
+    if args.demo:
+        demo(args.dump)
+    decode(args.dump)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Offline N/NUM/DEN planning for thousands of LMX2572 frequencies
+
+Vectorized with numpy when it is installed, otherwise falls back to the
+firmware solver one frequency at a time. Rows whose reduced denominator
+does not fit in PLL_DEN are always finished by the firmware solver.
+
+    python tools/fracn_plan.py 3.2e9 6.4e9 1e5 --ref 100e6 --check
+"""
+
+import argparse
+
+import hostshim  # noqa: F401  (puts firmware/ on sys.path)
+from fracn import DEN_MAX, FracNSolver
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VCO_MIN = 3200000000
+DIV_MAX = 8
+
+
+def _output_divider(freq):
+    div = 0
+    while freq << div < VCO_MIN:
+        div += 1
+    return div
+
+
+def plan_scalar(freqs, pfd_num, pfd_den, max_den=DEN_MAX):
+    """Plan with the firmware solver; returns a list of (freq, div, N, NUM, DEN, error)"""
+    solver = FracNSolver(max_den=max_den, cache_size=1)
+    rows = []
+    for freq in freqs:
+        freq = int(freq)
+        div = _output_divider(freq)
+        if div > DIV_MAX:
+            rows.append((freq, -1, 0, 0, 0, 0.0))
+            continue
+        N, num, den, error = solver.solve(freq << div, pfd_num, pfd_den)
+        rows.append((freq, div, N, num, den, error / (1 << div)))
+    return rows
+
+
+def plan_vectorized(freqs, pfd_num, pfd_den, max_den=DEN_MAX):
+    """
+    Plan with numpy; returns arrays (freq, div, N, NUM, DEN, error)
+
+    Out of range frequencies get div = -1.
+    """
+    freq = np.asarray(freqs, dtype=np.int64)
+    div = np.zeros(freq.shape, dtype=np.int64)
+    vco = freq.copy()
+    for _ in range(DIV_MAX + 1):
+        low = vco < VCO_MIN
+        vco[low] *= 2
+        div[low] += 1
+    bad = div > DIV_MAX
+    vco[bad] = VCO_MIN
+
+    x = vco * pfd_den
+    N = x // pfd_num
+    rem = x % pfd_num
+    error = np.zeros(freq.shape, dtype=np.float64)
+
+    if pfd_num <= max_den:
+        num = rem
+        den = np.full(freq.shape, pfd_num, dtype=np.int64)
+    else:
+        g = np.gcd(rem, pfd_num)
+        num = rem // g
+        den = pfd_num // g
+        solver = FracNSolver(max_den=max_den, cache_size=1)
+        for i in np.nonzero(den > max_den)[0]:
+            N[i], num[i], den[i], error[i] = solver.solve(int(vco[i]), pfd_num, pfd_den)
+        error /= 1 << div
+
+    div[bad] = -1
+    N[bad] = num[bad] = den[bad] = 0
+    return freq, div, N, num, den, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("start", type=float, help="First output frequency in Hz")
+    parser.add_argument("stop", type=float, help="Last output frequency in Hz (exclusive)")
+    parser.add_argument("step", type=float, help="Frequency step in Hz")
+    parser.add_argument("--ref", type=float, default=100e6, help="Reference frequency in Hz")
+    parser.add_argument("--mult", type=int, default=1, help="Reference multiplier (doubler included)")
+    parser.add_argument("--pre-r", type=int, default=1, help="Pre-R divider")
+    parser.add_argument("--r", type=int, default=1, help="R divider")
+    parser.add_argument("--max-den", type=int, default=DEN_MAX, help="Largest PLL_DEN")
+    parser.add_argument("--check", action="store_true", help="Cross-check against the firmware solver")
+    parser.add_argument("--csv", help="Write the plan to this CSV file")
+    args = parser.parse_args()
+
+    pfd_num = int(args.ref) * args.mult
+    pfd_den = args.pre_r * args.r
+    freqs = range(int(args.start), int(args.stop), int(args.step))
+
+    if np is not None:
+        rows = list(zip(*(a.tolist() for a in plan_vectorized(freqs, pfd_num, pfd_den, args.max_den))))
+    else:
+        rows = plan_scalar(freqs, pfd_num, pfd_den, args.max_den)
+
+    valid = [r for r in rows if r[1] >= 0]
+    exact = sum(1 for r in valid if r[5] == 0)
+    worst = max((abs(r[5]) for r in valid), default=0.0)
+    print("frequencies   : {} ({} out of range)".format(len(rows), len(rows) - len(valid)))
+    print("backend       : {}".format("numpy" if np is not None else "scalar"))
+    print("exact         : {}".format(exact))
+    print("max |error|   : {:.3g} Hz".format(worst))
+    print("distinct DEN  : {}".format(len(set(r[4] for r in valid))))
+
+    if args.check:
+        reference = plan_scalar(freqs, pfd_num, pfd_den, args.max_den)
+        mismatches = [(a, b) for a, b in zip(rows, reference)
+                      if a[:5] != b[:5] or abs(a[5] - b[5]) > 1e-6]
+        print("check         : {} mismatches".format(len(mismatches)))
+        for a, b in mismatches[:10]:
+            print("  {} != {}".format(a, b))
+
+    if args.csv:
+        with open(args.csv, "w") as f:
+            f.write("freq,div,N,NUM,DEN,error_hz\n")
+            for r in rows:
+                f.write("{},{},{},{},{},{}\n".format(*r))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Host-side stand-ins for the MicroPython modules used by the firmware
+
+Importing this module on CPython installs minimal ``machine`` and
+``micropython`` modules, adds the MicroPython ``time`` helpers
+(sleep_ms, ticks_ms, ticks_us, ticks_diff, ...) and puts firmware/ on
+sys.path, so the drivers can be imported and exercised on Linux.
+"""
+
+import os
+import sys
+import time
+import types
+
+FIRMWARE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "firmware")
+if FIRMWARE_DIR not in sys.path:
+    sys.path.insert(0, FIRMWARE_DIR)
+
+
+def _install_time():
+    if not hasattr(time, "sleep_ms"):
+        time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+        time.sleep_us = lambda us: time.sleep(us / 1000000)
+        time.ticks_ms = lambda: time.perf_counter_ns() // 1000000
+        time.ticks_us = lambda: time.perf_counter_ns() // 1000
+        time.ticks_cpu = time.perf_counter_ns
+        time.ticks_diff = lambda new, old: new - old
+        time.ticks_add = lambda ticks, delta: ticks + delta
+
+
+class MockPin:
+    """GPIO stand-in that remembers its level"""
+
+    IN = 0
+    OUT = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    def __init__(self, id=None, mode=None, value=0):
+        self.id = id
+        self._value = value
+        self.handler = None
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = 1 if v else 0
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def irq(self, handler=None, trigger=None):
+        self.handler = handler
+
+
+class MockSPI:
+    """SPI stand-in that counts transactions and bytes"""
+
+    def __init__(self, *args, **kwargs):
+        self.writes = 0
+        self.bytes_written = 0
+        self.log = []
+        self.record = False
+
+    def write(self, buf):
+        self.writes += 1
+        self.bytes_written += len(buf)
+        if self.record:
+            self.log.append(bytes(buf))
+
+    def write_readinto(self, tx, rx):
+        self.write(tx)
+        for i in range(len(rx)):
+            rx[i] = 0
+
+    def reset(self):
+        self.writes = 0
+        self.bytes_written = 0
+        self.log = []
+
+
+class MockI2C:
+    """I2C stand-in backed by a 256-byte register file per address"""
+
+    def __init__(self, *args, **kwargs):
+        self.mem = {}
+        self.transactions = 0
+
+    def _regs(self, addr):
+        return self.mem.setdefault(addr, bytearray(256))
+
+    def writeto_mem(self, addr, memaddr, buf):
+        self.transactions += 1
+        self._regs(addr)[memaddr:memaddr + len(buf)] = bytes(buf)
+
+    def readfrom_mem(self, addr, memaddr, nbytes):
+        self.transactions += 1
+        return bytes(self._regs(addr)[memaddr:memaddr + nbytes])
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        self.transactions += 1
+        buf[:] = self._regs(addr)[memaddr:memaddr + len(buf)]
+
+
+class MockTimer:
+    """Timer stand-in; call fire() to run the callback"""
+
+    PERIODIC = 1
+    ONE_SHOT = 0
+
+    def __init__(self, id=0):
+        self.id = id
+        self.callback = None
+        self.period = None
+        self.freq = None
+
+    def init(self, period=None, freq=None, mode=PERIODIC, callback=None):
+        self.period = period if period is not None else 1000 // freq
+        self.freq = freq
+        self.callback = callback
+
+    def deinit(self):
+        self.callback = None
+
+    def fire(self):
+        if self.callback is not None:
+            self.callback(self)
+
+
+def _install_machine():
+    if "machine" in sys.modules:
+        return
+    machine = types.ModuleType("machine")
+    machine.Pin = MockPin
+    machine.SPI = MockSPI
+    machine.SoftSPI = MockSPI
+    machine.I2C = MockI2C
+    machine.Timer = MockTimer
+    machine.ADC = object
+    machine.disable_irq = lambda: 0
+    machine.enable_irq = lambda state: None
+    sys.modules["machine"] = machine
+
+
+def _install_micropython():
+    if "micropython" in sys.modules:
+        return
+    micropython = types.ModuleType("micropython")
+    micropython.const = lambda x: x
+    micropython.native = lambda f: f
+    micropython.viper = lambda f: f
+    micropython.schedule = lambda func, arg: func(arg)
+    sys.modules["micropython"] = micropython
+
+
+_install_time()
+_install_machine()
+_install_micropython()
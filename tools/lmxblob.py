@@ -0,0 +1,116 @@
+"""
+Generate and inspect LMX2572 flash store blobs (see firmware/flashstore.py)
+
+    python tools/lmxblob.py generate lmx2572.bin --tune 5.8e9 --plan 5.7e9 5.9e9 10e6
+    python tools/lmxblob.py inspect lmx2572.bin
+
+Generation runs the firmware driver against a mock SPI bus, so the image
+is exactly what setup() and set_freq() would program. Copy the blob to
+the board with e.g. `mpremote cp lmx2572.bin :/lmx2572.bin`.
+"""
+
+import argparse
+import struct
+import sys
+
+import hostshim
+import flashstore
+from lmx2572 import LMX2572
+from vcocal import VcoCalCache
+
+
+def generate(args):
+    if sys.byteorder != "little":
+        raise SystemExit("Blobs are little-endian; generate them on a little-endian host")
+    pll = LMX2572(spi=hostshim.MockSPI(), cs=hostshim.MockPin(), en=hostshim.MockPin(),
+                  ref_freq=args.ref, cal_cache=VcoCalCache(bin_hz=args.cal_bin))
+    pll.enable()
+    pll.setup(port=args.port, power=args.power)
+    if pll.set_freq(args.tune) != 0:
+        raise SystemExit("Tune frequency out of range")
+
+    for spec in args.cal:
+        mhz, sel, cap, dac = (int(v, 0) for v in spec.split(":"))
+        pll.cal_cache.store(mhz * 1000000, sel, cap, dac)
+
+    plan = None
+    if args.plan:
+        start, stop, step = args.plan
+        freqs = []
+        f = start
+        while f < stop:
+            freqs.append(int(f))
+            f += step
+        plan = pll.compile_freq_plan(freqs)
+
+    flashstore.save(args.blob, pll, plan)
+    print("wrote {}".format(args.blob))
+    inspect(args)
+
+
+def inspect(args):
+    with open(args.blob, "rb") as f:
+        raw = f.read()
+    if len(raw) < flashstore.HEADER_SIZE:
+        raise SystemExit("Truncated header")
+    (magic, version, header_size, pfd_num, pfd_den, vco_freq, vco_sel_freq,
+     image_words, count, stride, cal_count, bin_hz, crc) = struct.unpack_from(flashstore.HEADER_FMT, raw)
+    print("magic        : {}".format(magic))
+    print("version      : {} (firmware reads {})".format(version, flashstore.FORMAT_VERSION))
+    print("size         : {} bytes".format(len(raw)))
+    print("pfd          : {}/{} Hz = {:.6f} MHz".format(pfd_num, pfd_den, pfd_num / pfd_den / 1e6))
+    print("vco          : {:.6f} MHz (VCO selected at {:.6f} MHz out)".format(vco_freq / 1e6, vco_sel_freq / 1e6))
+    print("image words  : {}".format(image_words))
+    print("plan entries : {} x {} words".format(count, stride))
+    print("cal entries  : {} ({} Hz bins)".format(cal_count, bin_hz))
+    print("crc32        : 0x{:08X}".format(crc))
+
+    blob = flashstore.load(args.blob)
+    if blob is None:
+        raise SystemExit("INVALID: wrong magic/version or checksum mismatch")
+    print("status       : valid")
+
+    if blob.image is not None and args.verbose:
+        for addr in range(0, len(blob.image), 4):
+            print("  " + " | ".join("R{:03d}=0x{:04X}".format(a, blob.image[a])
+                                    for a in range(addr, min(addr + 4, len(blob.image)))))
+    if blob.plan is not None:
+        for i, freq in enumerate(blob.plan.freqs):
+            words = blob.plan.entry(i) if args.verbose else []
+            print("  plan[{:3d}] {:12.3f} MHz {}".format(
+                i, freq / 1e6, " ".join("{:04X}".format(w) for w in words)))
+    if blob.cal is not None:
+        cal = blob.cal
+        for i in range(0, len(cal), 4):
+            print("  cal bin {:5d} ({:8.1f} MHz): VCO{} CAPCTRL={} DACISET={}".format(
+                cal[i], cal[i] * bin_hz / 1e6, cal[i + 1], cal[i + 2], cal[i + 3]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Build a blob with the firmware driver")
+    gen.add_argument("blob")
+    gen.add_argument("--ref", type=float, default=100e6, help="Reference frequency in Hz")
+    gen.add_argument("--port", default="A", help="Output port enabled by setup()")
+    gen.add_argument("--power", type=int, default=50, help="Output power (0-63)")
+    gen.add_argument("--tune", type=float, default=5.8e9, help="Frequency of the stored image in Hz")
+    gen.add_argument("--plan", type=float, nargs=3, metavar=("START", "STOP", "STEP"),
+                     help="Frequency plan range in Hz")
+    gen.add_argument("--cal", action="append", default=[], metavar="MHZ:SEL:CAP:DAC",
+                     help="VCO calibration entry, may be repeated")
+    gen.add_argument("--cal-bin", type=int, default=10000000, help="Calibration bin width in Hz")
+    gen.set_defaults(func=generate, verbose=False)
+
+    ins = sub.add_parser("inspect", help="Validate and print a blob")
+    ins.add_argument("blob")
+    ins.add_argument("-v", "--verbose", action="store_true", help="Print register words")
+    ins.set_defaults(func=inspect)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Behavioral LMX2572 simulator for running the driver on the host
+
+Stands in for the machine.SPI bus and the CS/EN/MUXOUT pins of one or
+more LMX2572s and models what the driver relies on:
+
+    * the register file, with R125 reading back its power-on value
+    * 24-bit frames latched while CS is low, readback framing on SDO
+      (MUXOUT): register data when MUXOUT_LD_SEL = 0, the lock detect
+      level on every bit when MUXOUT_LD_SEL = 1
+    * RESET (R0 bit 1): registers return to their defaults and the bit
+      reads back as 1 until reset_us has passed
+    * POWERDOWN (R0 bit 0) and the EN pin
+    * FCAL: an R0 write with FCAL_EN (bit 3) calibrates for fcal_us
+      (fcal_assist_us with VCO_SEL_FORCE), then locks if the VCO is in
+      3.2-6.4 GHz; moving the VCO out of the calibrated core band
+      without a new FCAL drops lock
+    * R110 (rb_LD_VTUNE bits 10:9, rb_VCO_SEL bits 7:5), R111
+      (rb_VCO_CAPCTRL) and R112 (rb_VCO_DACISET)
+
+SimClock replaces time.ticks_us/ticks_ms/ticks_diff/sleep_ms/sleep_us
+with a virtual clock. Every SPI frame advances it by its wire time and
+every ticks read by poll_us, so polling loops terminate and the reported
+latency is the simulated one, independent of host speed.
+
+    clock = SimClock().install()
+    chip = LMX2572Sim(clock)
+    pll = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout)
+
+Register defaults are the driver's lmx2572_registers_default, so images
+compare against what the driver programs rather than against silicon.
+"""
+
+import time
+
+import hostshim
+from lmx2572 import lmx2572_registers_default, R125_POWER_ON
+
+# R0 bits
+POWERDOWN = 1 << 0
+RESET = 1 << 1
+MUXOUT_LD_SEL = 1 << 2
+FCAL_EN = 1 << 3
+
+# VCO cores (MHz) as reported in rb_VCO_SEL
+VCO_CORES = ((3200, 3650), (3650, 4200), (4200, 4650), (4650, 5200), (5200, 5750), (5750, 6400))
+
+# rb_LD_VTUNE values
+LD_UNLOCKED_LOW = 0
+LD_LOCKED = 2
+
+
+class SimClock:
+    """Virtual microsecond clock behind the MicroPython time shims"""
+
+    def __init__(self, poll_us=1):
+        self.now_us = 0.0
+        self.poll_us = poll_us
+        self.devices = []  # Chips whose pending events follow the clock
+        self._saved = None
+
+    def advance(self, us):
+        self.now_us += us
+        for dev in self.devices:
+            dev.tick()
+
+    def ticks_us(self):
+        self.advance(self.poll_us)
+        return int(self.now_us)
+
+    def ticks_ms(self):
+        return self.ticks_us() // 1000
+
+    def sleep_us(self, us):
+        self.advance(us)
+
+    def sleep_ms(self, ms):
+        self.advance(ms * 1000)
+
+    def install(self):
+        names = ("ticks_us", "ticks_ms", "sleep_us", "sleep_ms")
+        self._saved = {name: getattr(time, name) for name in names + ("ticks_diff",)}
+        for name in names:
+            setattr(time, name, getattr(self, name))
+        time.ticks_diff = lambda new, old: new - old
+        return self
+
+    def uninstall(self):
+        for name, fn in self._saved.items():
+            setattr(time, name, fn)
+        self._saved = None
+
+
+class SimPin(hostshim.MockPin):
+    """MockPin that tells its owner about level changes"""
+
+    def __init__(self, value=0, on_change=None):
+        super().__init__(value=value)
+        self.on_change = on_change
+        self.trigger = None
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        old = self._value
+        self._value = 1 if v else 0
+        if self.on_change is not None and old != self._value:
+            self.on_change(self._value)
+
+    def irq(self, handler=None, trigger=None):
+        self.handler = handler
+        self.trigger = trigger
+
+    def drive(self, level):
+        """Set the level from the chip side, firing the IRQ handler on a matching edge"""
+        level = 1 if level else 0
+        if level == self._value:
+            return
+        self._value = level
+        if self.handler is not None:
+            edge = hostshim.MockPin.IRQ_RISING if level else hostshim.MockPin.IRQ_FALLING
+            if self.trigger is None or self.trigger & edge:
+                self.handler(self)
+
+
+class SimBus:
+    """SPI bus shared by simulated chips, routed by whichever CS is low"""
+
+    def __init__(self, clock, spi_hz=10000000):
+        self.clock = clock
+        self.frame_us = 24 * 1000000 / spi_hz
+        self.devices = []
+        self.writes = 0
+        self.reads = 0
+        self.orphan_frames = 0  # Frames clocked with no CS low
+
+    def write(self, buf):
+        self.write_readinto(buf, None)
+
+    def write_readinto(self, tx, rx):
+        self.clock.advance(self.frame_us * len(tx) / 3)
+        selected = [dev for dev in self.devices if dev.cs.value() == 0]
+        if len(selected) != 1:
+            self.orphan_frames += 1
+            if rx is not None:
+                for i in range(len(rx)):
+                    rx[i] = 0
+            return
+        if tx[0] & 0x80:
+            self.reads += 1
+        else:
+            self.writes += 1
+        selected[0].frame(tx, rx)
+
+
+class LMX2572Sim:
+    """One simulated LMX2572; hand spi, cs, en and muxout to the driver"""
+
+    def __init__(self, clock, bus=None, ref_freq=100e6, fcal_us=250, fcal_assist_us=50, reset_us=20):
+        self.clock = clock
+        clock.devices.append(self)
+        self.bus = bus if bus is not None else SimBus(clock)
+        self.bus.devices.append(self)
+        self.ref_freq = ref_freq
+        self.fcal_us = fcal_us
+        self.fcal_assist_us = fcal_assist_us
+        self.reset_us = reset_us
+
+        self.cs = SimPin(value=1)
+        self.en = SimPin(on_change=self._en_changed)
+        self.muxout = SimPin()
+        self.regs = [0] * 128
+
+        self.powered = False
+        self.locked = False
+        self.core = 0  # rb_VCO_SEL of the last calibration, 0 = none
+        self.capctrl = 0
+        self.daciset = 0
+        self.fcal_count = 0
+        self.reset_count = 0
+        self._reset_done = None
+        self._fcal_done = None
+        self._load_defaults()
+
+    @property
+    def spi(self):
+        return self.bus
+
+    def _load_defaults(self):
+        for reg_data in lmx2572_registers_default:
+            self.regs[(reg_data >> 16) & 0x7F] = reg_data & 0xFFFF
+        self.regs[125] = R125_POWER_ON
+        self.locked = False
+        self.core = 0
+        self._fcal_done = None
+
+    def _en_changed(self, level):
+        self.powered = bool(level)
+        self._load_defaults()
+        self._update_muxout()
+
+    def image(self, regs=range(126)):
+        """Register file as a list of (addr << 16) | value"""
+        return [(addr << 16) | self.regs[addr] for addr in regs]
+
+    def vco_freq(self):
+        """VCO frequency programmed in the N, NUM and DEN registers (Hz)"""
+        regs = self.regs
+        mult = (regs[10] >> 7) & 0x1F
+        pre_r = regs[12] & 0xFFF
+        r = (regs[11] >> 4) & 0xFF
+        if not mult or not pre_r or not r:
+            return 0
+        pfd = self.ref_freq * (2 if regs[9] & 0x1000 else 1) * mult / (pre_r * r)
+        n = ((regs[34] & 0x7) << 16) | regs[36]
+        num = (regs[42] << 16) | regs[43]
+        den = (regs[38] << 16) | regs[39]
+        return pfd * (n + (num / den if den else 0))
+
+    def tick(self):
+        """Complete a pending reset or FCAL once its time has come"""
+        now = self.clock.now_us
+        if (self._reset_done is not None and now >= self._reset_done) or \
+                (self._fcal_done is not None and now >= self._fcal_done):
+            self._update()
+
+    def _update(self):
+        now = self.clock.now_us
+        if self._reset_done is not None and now >= self._reset_done:
+            self._reset_done = None
+            self._load_defaults()
+        if self._fcal_done is not None and now >= self._fcal_done:
+            self._fcal_done = None
+            self._calibrate()
+        elif self.locked and self.core:
+            lo, hi = VCO_CORES[self.core - 1]
+            if not lo * 1e6 <= self.vco_freq() <= hi * 1e6:
+                self.locked = False
+        self._update_muxout()
+
+    def _calibrate(self):
+        vco = self.vco_freq() / 1e6
+        self.core = 0
+        for i, (lo, hi) in enumerate(VCO_CORES):
+            if lo <= vco <= hi:
+                self.core = i + 1
+                self.capctrl = int(183 * (hi - vco) / (hi - lo))
+                self.daciset = 100 + 40 * i
+        self.locked = self.core != 0
+        self.fcal_count += 1
+
+    def _update_muxout(self):
+        level = self.powered and self.locked and self.regs[0] & MUXOUT_LD_SEL
+        self.muxout.drive(level)
+
+    def _status(self, addr):
+        if addr == 110:
+            ld = LD_LOCKED if self.locked else LD_UNLOCKED_LOW
+            return (ld << 9) | (self.core << 5)
+        if addr == 111:
+            return self.capctrl
+        return self.daciset
+
+    def frame(self, tx, rx):
+        if not self.powered:
+            if rx is not None:
+                for i in range(len(rx)):
+                    rx[i] = 0
+            return
+        self._update()
+        addr = tx[0] & 0x7F
+        if tx[0] & 0x80:
+            if self.regs[0] & MUXOUT_LD_SEL:
+                # SDO carries lock detect, not register data
+                fill = 0xFF if self.locked else 0
+                value = (fill << 8) | fill
+            elif addr in (110, 111, 112):
+                value = self._status(addr)
+            else:
+                value = self.regs[addr]
+            if rx is not None:
+                rx[0] = 0
+                rx[1] = value >> 8
+                rx[2] = value & 0xFF
+            return
+        self._write(addr, (tx[1] << 8) | tx[2])
+
+    def _write(self, addr, value):
+        self.regs[addr] = value
+        if addr != 0:
+            return
+        if value & RESET:
+            self.reset_count += 1
+            self.locked = False
+            self._reset_done = self.clock.now_us + self.reset_us
+        elif value & POWERDOWN:
+            self.locked = False
+            self._fcal_done = None
+        elif value & FCAL_EN:
+            self.locked = False
+            forced = self.regs[20] & (1 << 4)  # VCO_SEL_FORCE as programmed by the driver
+            self._fcal_done = self.clock.now_us + (self.fcal_assist_us if forced else self.fcal_us)
+        self._update_muxout()
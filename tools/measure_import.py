@@ -0,0 +1,60 @@
+"""
+Import time and heap cost of the LMX2572 driver and its lazily loaded modules
+
+Runs on the board (copy firmware/ over first) or on the host:
+
+    mpremote run tools/measure_import.py
+    python tools/measure_import.py
+
+On MicroPython heap use is gc.mem_free() before and after each import;
+on CPython it is the tracemalloc delta, so only compare numbers from the
+same interpreter.
+"""
+
+import gc
+import sys
+import time
+
+try:
+    import hostshim  # noqa: F401  (host: machine shims and firmware/ on sys.path)
+except ImportError:
+    pass
+
+ON_TARGET = hasattr(gc, "mem_free")
+if ON_TARGET:
+    mem_free = gc.mem_free
+else:
+    import tracemalloc
+
+    tracemalloc.start()
+
+    def mem_free():
+        return -tracemalloc.get_traced_memory()[0]
+
+
+def measure(name):
+    if name in sys.modules:
+        print("{:<16s} already imported".format(name))
+        return
+    gc.collect()
+    free = mem_free()
+    start = time.ticks_us()
+    __import__(name)
+    elapsed = time.ticks_diff(time.ticks_us(), start)
+    gc.collect()
+    used = free - mem_free()
+    line = "{:<16s} {:>8d} us {:>8d} bytes".format(name, elapsed, used)
+    if ON_TARGET:
+        line += "  (mem_free {} -> {})".format(free, mem_free())
+    print(line)
+
+
+def main():
+    print("module           import time  heap")
+    # Dependencies first, so the lmx2572 line is the driver module alone; then
+    # what describe_register, configure_ramp and configure_fsk load on first use
+    for name in ("diag", "fracn", "lmx2572_fast", "lmx2572", "lmx2572_meta", "lmx2572_ramp", "lmx2572_fsk"):
+        measure(name)
+
+
+main()
@@ -0,0 +1,151 @@
+"""
+Host check of the LMX2572 FSK planner and level switching
+
+Runs firmware/lmx2572_fsk.fsk_plan() over in-band plans and the errors it
+must raise (level leaving the VCO core, carrier outside every core,
+deviation overflowing FSK_DEV, too many levels), then configure_fsk() on
+the tools/lmxsim.py simulator in SPI and pin mode: every level decoded
+from the chip registers has to land within one numerator count of its
+requested frequency, an SPI level switch has to be one R114 write and a
+pin switch no SPI traffic:
+
+    python tools/sim_fsk.py     # exits 1 on any failed check
+"""
+
+import sys
+
+import hostshim
+import lmx2572_fsk
+from lmxsim import LMX2572Sim, SimClock, SimPin
+from lmx2572 import LMX2572, ASSIST_TBL, FIELDS
+
+PFD = 100e6
+CENTER = 5.8e9
+LEVELS = (CENTER - 50e3, CENTER, CENTER + 50e3, CENTER + 100e3)
+
+
+def raises(func, *args, **kwargs):
+    """True if func(*args, **kwargs) raises ValueError"""
+    try:
+        func(*args, **kwargs)
+    except ValueError:
+        return True
+    return False
+
+
+def check_planner():
+    """Planner rows: [(name, ok)]"""
+    plan = lmx2572_fsk.fsk_plan
+    rows = []
+
+    # 100 Hz per numerator count
+    words, info = plan(CENTER, LEVELS, PFD, 1000000, bands=ASSIST_TBL)
+    expected = [((lmx2572_fsk.R_FSK_DEV0 + i) << 16) | (dev & 0xFFFF) for i, dev in enumerate((-500, 0, 500, 1000))]
+    rows.append(("plan, spi levels", words == expected and info['freqs'] == list(LEVELS) and info['band'] == 5))
+
+    # Output divider 2: the same VCO core, half the output step
+    words, info = plan(CENTER / 2, [CENTER / 2 + 25e3], PFD, 1000000, out_div=2, bands=ASSIST_TBL)
+    rows.append(("plan, out_div 2", info['devs'] == [500] and info['band'] == 5))
+
+    rows.append(("level leaves VCO core", raises(plan, 5.74e9, [5.76e9], PFD, 1000000, bands=ASSIST_TBL)))
+    rows.append(("carrier outside VCO cores", raises(plan, 7e9, [7e9], PFD, 1000000, bands=ASSIST_TBL)))
+    # 1 Hz per count puts 40 kHz above FSK_DEV_MAX; the edge value still fits
+    rows.append(("deviation overflow", raises(plan, CENTER, [CENTER + 40e3], PFD, 100000000)))
+    _, info = plan(CENTER, [CENTER + lmx2572_fsk.FSK_DEV_MAX, CENTER + lmx2572_fsk.FSK_DEV_MIN], PFD, 100000000)
+    rows.append(("deviation at FSK_DEV limits", info['devs'] == [lmx2572_fsk.FSK_DEV_MAX, lmx2572_fsk.FSK_DEV_MIN]))
+    rows.append(("level count", raises(plan, CENTER, [CENTER] * 5, PFD, 1000000, mode='pin')
+                 and raises(plan, CENTER, [CENTER] * 9, PFD, 1000000)
+                 and raises(plan, CENTER, [], PFD, 1000000)
+                 and raises(plan, CENTER, [CENTER], PFD, 1000000, mode='fm')))
+    return rows
+
+
+def field(chip, name):
+    """Value of an lmx2572.FIELDS field in the chip's register file"""
+    reg, shift, mask = FIELDS[name]
+    return (chip.regs[reg] & mask) >> shift
+
+
+def on_levels(chip, info, freqs):
+    """
+    True if every FSK level decoded from the chip registers is the planned
+    frequency and within one numerator count of the requested one
+    """
+    den = (chip.regs[38] << 16) | chip.regs[39]
+    step = PFD / den
+    for level, f in enumerate(freqs):
+        dev = chip.regs[lmx2572_fsk.R_FSK_DEV0 + level]
+        if dev & 0x8000:
+            dev -= 0x10000
+        got = chip.vco_freq() + dev * step
+        if abs(got - info['freqs'][level]) > 1e-3 or abs(got - f) > step:
+            return False
+    return True
+
+
+def run():
+    """Run the checks; returns [(name, ok)]"""
+    rows = check_planner()
+    clock = SimClock().install()
+    try:
+        ramp_clk = SimPin()
+        ramp_dir = SimPin()
+        chip = LMX2572Sim(clock)
+        pll = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout,
+                      ramp_clk=ramp_clk, ramp_dir=ramp_dir)
+        pll.enable()
+        pll.setup(freq=CENTER)
+
+        info = pll.configure_fsk(CENTER, LEVELS)
+        rows.append(("configure_fsk spi", on_levels(chip, info, LEVELS) and field(chip, "FSK_EN")
+                     and field(chip, "FSK_MODE_SEL") == lmx2572_fsk.MODES['spi']
+                     and field(chip, "FSK_SPI_LEVEL") == 0))
+
+        writes = chip.bus.writes
+        pll.fsk_select(3)
+        rows.append(("fsk_select, one write", field(chip, "FSK_SPI_LEVEL") == 3 and chip.bus.writes - writes == 1))
+
+        # A deviation too wide for the default PLL_DEN lowers PLL_DEN instead of failing
+        wide = (CENTER - 20e6, CENTER + 20e6)
+        info = pll.configure_fsk(CENTER, wide)
+        rows.append(("configure_fsk, 20 MHz deviation", on_levels(chip, info, wide)))
+
+        pll.configure_fsk(CENTER, LEVELS, mode='pin')
+        rows.append(("configure_fsk pin", field(chip, "FSK_MODE_SEL") == lmx2572_fsk.MODES['pin']
+                     and field(chip, "FSK_EN")))
+
+        writes = chip.bus.writes
+        pins = []
+        for level in range(lmx2572_fsk.FSK_PIN_LEVELS):
+            pll.fsk_pins(level)
+            pins.append(ramp_dir.value() << 1 | ramp_clk.value())
+        rows.append(("fsk_pins, no SPI", pins == [0, 1, 2, 3] and chip.bus.writes == writes))
+
+        pll.disable_fsk()
+        rows.append(("disable_fsk", not field(chip, "FSK_EN")))
+
+        rows.append(("configure_fsk out of core", raises(pll.configure_fsk, 5.74e9, [5.76e9])))
+        no_pins = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout)
+        rows.append(("pin mode without pins", raises(no_pins.configure_fsk, CENTER, LEVELS, mode='pin')))
+
+        if chip.bus.orphan_frames:
+            rows.append(("frames without CS", False))
+        return rows
+    finally:
+        clock.uninstall()
+
+
+def main():
+    rows = run()
+    failed = 0
+    for name, ok in rows:
+        print("{:<32s} {}".format(name, "ok" if ok else "FAILED"))
+        failed += not ok
+    if failed:
+        print("FAILED: {} check(s)".format(failed))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
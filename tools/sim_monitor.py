@@ -0,0 +1,109 @@
+"""
+Fault injection run of firmware/monitor.py on the LMX2572 simulator
+
+Drives HealthMonitor.poll() on the tools/lmxsim.py virtual clock and
+injects the faults it is meant to catch:
+
+    * loss of lock with a cached calibration (full assist relock)
+    * loss of lock with an empty cache (FCAL relock)
+    * single-register upsets on the chip side (scrubbed from the shadow);
+      the R11 upset moves the PFD and drops lock until it is scrubbed
+    * loss of lock right after a flashstore restore, which has to take
+      the full assist path from the restored calibration cache
+
+    python tools/sim_monitor.py     # exits 1 if a fault is not handled
+
+Recovery times are simulated microseconds.
+"""
+
+import os
+import sys
+import tempfile
+
+import hostshim
+import flashstore
+from lmxsim import LMX2572Sim, SimClock
+from lmx2572 import LMX2572, RELOCK_ASSIST
+from monitor import HealthMonitor, CRITICAL_REGISTERS
+from vcocal import VcoCalCache
+
+UPSETS = ((43, 0x0100), (36, 0x0001), (19, 0x0004), (11, 0x0010))
+
+
+def run():
+    """Run the fault scenario; returns [(name, ok)] and the monitor stats"""
+    clock = SimClock().install()
+    try:
+        chip = LMX2572Sim(clock)
+        pll = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout, cal_cache=VcoCalCache())
+        pll.enable()
+        pll.setup(freq=5.8e9)
+        pll.capture_calibration()
+        monitor = HealthMonitor(pll, verify_every=2, batch=8)
+        full_pass = 2 * len(monitor._batches)
+
+        def ticks(n):
+            ok = True
+            for _ in range(n):
+                clock.advance(monitor.period_ms * 1000)
+                ok = monitor.poll() and ok
+            return ok
+
+        def drop_lock():
+            chip.locked = False
+            chip._update_muxout()
+
+        rows = [("steady state", ticks(full_pass) and monitor.registers_corrected == 0)]
+
+        drop_lock()
+        rows.append(("unlock, cached assist", ticks(1) and monitor.relocks_assist == 1 and chip.locked))
+
+        pll.cal_cache.invalidate()
+        drop_lock()
+        rows.append(("unlock, empty cache", ticks(1) and monitor.relocks_fcal == 1 and chip.locked))
+
+        for reg, flip in UPSETS:
+            chip.regs[reg] ^= flip
+        ticks(full_pass)
+        clean = pll.verify_registers(CRITICAL_REGISTERS) == []
+        # A relock rewrites the VCO assist registers itself, so not every upset is counted as corrected
+        rows.append(("register upsets", monitor.registers_corrected > 0 and clean and chip.locked))
+
+        # Fast boot from the stored image, then lose lock before any set_freq()
+        path = os.path.join(tempfile.mkdtemp(), "lmx2572.bin")
+        flashstore.save(path, pll)
+        boot_chip = LMX2572Sim(clock)
+        boot_pll = LMX2572(spi=boot_chip.spi, cs=boot_chip.cs, en=boot_chip.en,
+                           ld_pin=boot_chip.muxout, cal_cache=VcoCalCache())
+        boot_pll.enable()
+        restored = flashstore.restore(boot_pll, flashstore.load(path))
+        state = (boot_pll.vco_freq == pll.vco_freq and boot_pll.last_vco_sel_freq == pll.last_vco_sel_freq
+                 and boot_pll.cal_cache.lookup(boot_pll.vco_freq) is not None)
+        boot_chip.locked = False
+        boot_chip._update_muxout()
+        relocked = boot_pll.relock() == RELOCK_ASSIST and boot_chip.locked
+        rows.append(("restore, cached assist", restored and state and relocked))
+
+        if chip.bus.orphan_frames or boot_chip.bus.orphan_frames:
+            rows.append(("frames without CS", False))
+        return rows, monitor.stats()
+    finally:
+        clock.uninstall()
+
+
+def main():
+    rows, stats = run()
+    failed = 0
+    for name, ok in rows:
+        print("{:<24s} {}".format(name, "ok" if ok else "FAILED"))
+        failed += not ok
+    for key in sorted(stats):
+        print("  {:<20s} {}".format(key, stats[key]))
+    if failed:
+        print("FAILED: {} check(s)".format(failed))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
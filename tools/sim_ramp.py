@@ -0,0 +1,150 @@
+"""
+Host check of the LMX2572 ramp (FMCW chirp) register plans
+
+Decodes the words of firmware/lmx2572_ramp.ramp_registers() for up, down
+and triangle chirps and checks that the programmed increments, lengths
+and limits land on the requested end frequency, and that RAMP_THRESH[32]
+goes out in R78 without touching the other R78 fields. Then runs
+configure_ramp() on the tools/lmxsim.py simulator for an automatic and a
+manually clocked (RAMPCLK) chirp:
+
+    python tools/sim_ramp.py     # exits 1 on any failed check
+"""
+
+import sys
+
+import hostshim
+import lmx2572_ramp
+from lmxsim import LMX2572Sim, SimClock, SimPin
+from lmx2572 import LMX2572, FIELDS
+
+PFD = 100e6
+DEN = 100000000
+CHIRP = (5.8e9, 5.9e9, 1e-3)  # f_low, f_high, duration
+
+
+def _signed(value, bits):
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+def decode(words):
+    """Ramp fields of a ramp_registers() word list"""
+    w = {word >> 16: word & 0xFFFF for word in words}
+    return {
+        'thresh': ((w[78] >> 11) & 1) << 32 | w[79] << 16 | w[80],
+        'r78': w[78],
+        'high': _signed((w[81] & 1) << 32 | w[82] << 16 | w[83], lmx2572_ramp.RAMP_LIMIT_BITS),
+        'low': _signed((w[84] & 1) << 32 | w[85] << 16 | w[86], lmx2572_ramp.RAMP_LIMIT_BITS),
+        'inc0': _signed((w[98] >> 2) << 16 | w[99], lmx2572_ramp.RAMP_INC_BITS),
+        'dly': w[98] & 1,
+        'len0': w[100],
+        'rst1': bool(w[101] & (1 << 5)),
+        'inc1': _signed((w[102] & 0x3FFF) << 16 | w[103], lmx2572_ramp.RAMP_INC_BITS),
+        'len1': w[104],
+        'manual': bool(w[105] & lmx2572_ramp.RAMP_MANUAL),
+    }
+
+
+def check_mode(mode, segments=None):
+    """Check one chirp plan; True if it ends on the requested frequency"""
+    f_low, f_high, duration = CHIRP
+    words, info = lmx2572_ramp.ramp_registers(f_low, f_high, duration, PFD, DEN, mode=mode, segments=segments)
+    f = decode(words)
+    travel = f['inc0'] * f['len0']
+    # Rounding the increment is at most half a numerator unit per step
+    tolerance = (f['len0'] / 2 + 1) * PFD / DEN
+    if mode == 'down':
+        ok = (info['start'] == f_high and f['inc0'] < 0 and f['low'] == travel and f['high'] == 0
+              and abs(f_high + travel * PFD / DEN - f_low) <= tolerance)
+    else:
+        ok = (info['start'] == f_low and f['inc0'] > 0 and f['high'] == travel and f['low'] == 0
+              and abs(f_low + travel * PFD / DEN - f_high) <= tolerance)
+    if mode == 'triangle':
+        ok = ok and f['inc1'] == -f['inc0'] and f['len1'] == f['len0'] and not f['rst1']
+    else:
+        ok = ok and f['len1'] == 1 and f['rst1']
+    if segments is None:
+        ok = ok and not f['manual'] and f['len0'] * (2 if f['dly'] else 1) == round(duration * PFD)
+    else:
+        ok = ok and f['manual'] and not f['dly'] and f['len0'] == segments
+    return ok and info['stop'] == info['start'] + travel * PFD / DEN
+
+
+def check_threshold():
+    """RAMP_THRESH[32] is emitted in R78 and the other R78 bits are kept"""
+    f_low, f_high, duration = CHIRP
+    r78 = 0x0001 | (0x5A << 1) | (1 << 9)
+    # 5 GHz of VCO travel at PLL_DEN = f_PFD is above 32 bits of numerator
+    words, _ = lmx2572_ramp.ramp_registers(f_low, f_high, duration, PFD, DEN, cal_threshold=5e9, r78=r78)
+    f = decode(words)
+    high = f['thresh'] == 5000000000 and f['r78'] == r78 | lmx2572_ramp.RAMP_THRESH_32
+    words, _ = lmx2572_ramp.ramp_registers(f_low, f_high, duration, PFD, DEN,
+                                           r78=r78 | lmx2572_ramp.RAMP_THRESH_32)
+    f = decode(words)
+    low = f['thresh'] == 100000000 and f['r78'] == r78
+    return high and low
+
+
+def run():
+    """Run the checks; returns [(name, ok)]"""
+    rows = []
+    for mode in lmx2572_ramp.MODES:
+        rows.append(("plan {}".format(mode), check_mode(mode)))
+        rows.append(("plan {}, manual".format(mode), check_mode(mode, segments=200)))
+    rows.append(("RAMP_THRESH[32] in R78", check_threshold()))
+
+    clock = SimClock().install()
+    try:
+        edges = []
+        ramp_clk = SimPin(on_change=edges.append)
+        chip = LMX2572Sim(clock)
+        pll = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout, ramp_clk=ramp_clk)
+        pll.enable()
+        pll.setup(freq=5.8e9)
+
+        f_low, f_high, duration = CHIRP
+        for mode in lmx2572_ramp.MODES:
+            info = pll.configure_ramp(f_low, f_high, duration, mode=mode)
+            programmed = chip.image(range(78, 107)) == [(reg << 16) | pll.shadow[reg] for reg in range(78, 107)]
+            start_ok = abs(chip.vco_freq() - info['start']) < 1
+            rows.append(("configure_ramp {}".format(mode), programmed and start_ok and not info['manual']))
+
+        pll.start_ramp()
+        ramp_en = FIELDS['RAMP_EN'][2]
+        running = bool(chip.regs[0] & ramp_en)
+        pll.stop_ramp()
+        rows.append(("start_ramp/stop_ramp", running and not chip.regs[0] & ramp_en))
+
+        info = pll.configure_ramp(f_low, f_high, duration, segments=100)
+        pll.ramp_step(10)
+        rows.append(("manual ramp, ramp_step", info['manual'] and chip.regs[105] & lmx2572_ramp.RAMP_MANUAL
+                     and edges.count(1) == 10 and ramp_clk.value() == 0))
+
+        no_clk = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout)
+        try:
+            no_clk.configure_ramp(f_low, f_high, duration, segments=100)
+            rows.append(("manual ramp without RAMPCLK", False))
+        except ValueError:
+            rows.append(("manual ramp without RAMPCLK", True))
+
+        if chip.bus.orphan_frames:
+            rows.append(("frames without CS", False))
+        return rows
+    finally:
+        clock.uninstall()
+
+
+def main():
+    rows = run()
+    failed = 0
+    for name, ok in rows:
+        print("{:<30s} {}".format(name, "ok" if ok else "FAILED"))
+        failed += not ok
+    if failed:
+        print("FAILED: {} check(s)".format(failed))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Benchmark and regression check of the LMX2572 driver on the simulator
+
+Runs setup(), a series of set_freq() hops, trigger_calibration() and
+verify_registers() against tools/lmxsim.py, prints SPI reads/writes and
+simulated latency per call, and compares the register file after each
+step with the golden images in tools/golden/lmx2572_sim.json:
+
+    python tools/sim_regress.py            # exits 1 on any mismatch
+    python tools/sim_regress.py --update   # rewrite the golden images
+
+Latencies are simulated microseconds (10 MHz SPI, FCAL 250 us, 50 us with
+forced VCO), so they are stable across hosts and usable in CI.
+"""
+
+import argparse
+import binascii
+import json
+import os
+import sys
+import tempfile
+from array import array
+
+import hostshim
+import flashstore
+import lmx2572_fast
+from lmxsim import LMX2572Sim, SimClock, SimPin
+from phasesync import PhaseSync
+from lmx2572 import LMX2572
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "lmx2572_sim.json")
+HOPS = (5.7e9, 5.75e9, 3.3e9, 1.2e9, 6.3e9, 5.8e9)
+
+
+class Step:
+    """Measures bus traffic and simulated time of one driver call"""
+
+    def __init__(self, chip):
+        self.chip = chip
+
+    def __enter__(self):
+        bus = self.chip.bus
+        self.start = (bus.writes, bus.reads, self.chip.clock.now_us)
+        return self
+
+    def __exit__(self, *exc):
+        bus = self.chip.bus
+        writes, reads, start_us = self.start
+        self.writes = bus.writes - writes
+        self.reads = bus.reads - reads
+        self.us = self.chip.clock.now_us - start_us
+
+
+def run():
+    """Run the scenario; returns ([(name, Step, ok)], {name: image})"""
+    clock = SimClock().install()
+    try:
+        chip = LMX2572Sim(clock)
+        pll = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout)
+        rows = []
+        images = {}
+
+        with Step(chip) as step:
+            pll.enable()
+        rows.append(("enable", step, chip.regs[125] == 0x2288))
+
+        with Step(chip) as step:
+            locked = pll.setup(freq=5.8e9)
+        rows.append(("setup 5.8 GHz", step, locked))
+        images["setup"] = chip.image()
+
+        for freq in HOPS:
+            with Step(chip) as step:
+                status = pll.set_freq(freq)
+                locked = pll.wait_lock(5)
+            rows.append(("set_freq {:.3f} GHz".format(freq / 1e9), step, status == 0 and locked))
+            images["set_freq_{}".format(int(freq))] = chip.image()
+
+        with Step(chip) as step:
+            cal = pll.trigger_calibration(timeout_ms=5)
+        rows.append(("trigger_calibration", step, cal["success"] and cal["vco_num"] == chip.core))
+        images["trigger_calibration"] = chip.image()
+
+        with Step(chip) as step:
+            mismatches = pll.verify_registers()
+        rows.append(("verify_registers", step, not mismatches and chip.locked))
+
+        chip.regs[43] ^= 0x0100  # Upset PLL_NUM on the chip side only
+        with Step(chip) as step:
+            mismatches = pll.verify_registers(repair=True)
+        # R0 is left with FCAL_EN clear by the readback switch
+        repaired = chip.image()[1:] == images["trigger_calibration"][1:]
+        rows.append(("verify_registers, R43 upset", step, [m[0] for m in mismatches] == [43] and repaired))
+
+        # ld_pin is the SDO line: readback must not show up as lock edges
+        pll.enable_lock_irq()
+        with Step(chip) as step:
+            pll.read_registers()
+            pll.read_register(110)
+        masked = pll.lock_events == 0 and pll.unlock_events == 0 and chip.muxout.handler is not None
+        pll.disable_lock_irq()
+        rows.append(("lock IRQ masked in readback", step, masked and chip.locked))
+
+        # A reset longer than the default load: setup() has to wait it out
+        chip.reset_us = 500
+        with Step(chip) as step:
+            locked = pll.setup(freq=5.8e9)
+        rows.append(("setup again, 500 us reset", step, locked and pll.boot_report["reset"] >= 500))
+
+        with Step(chip) as step:
+            cal = pll.capture_calibration()
+        rows.append(("capture_calibration", step, cal[0] == chip.core and chip.locked and pll.is_locked()))
+
+        # Arming must not restart FCAL on a locked part; a hop arms with FCAL and fires after lock
+        sync = PhaseSync(SimPin(), pll)
+        fcal_count = chip.fcal_count
+        with Step(chip) as step:
+            result = sync.sync()
+        rows.append(("PhaseSync.sync", step, result["fired"] and chip.fcal_count == fcal_count and chip.locked))
+        with Step(chip) as step:
+            result = sync.hop([5.81e9])
+        rows.append(("PhaseSync.hop", step, result["fired"] and result["locked"] and chip.locked))
+        sync.disarm()
+
+        # Boot from a stored image onto a chip whose reset outlasts the burst
+        path = os.path.join(tempfile.mkdtemp(), "lmx2572.bin")
+        flashstore.save(path, pll)
+        boot_chip = LMX2572Sim(clock, reset_us=500)
+        boot_pll = LMX2572(spi=boot_chip.spi, cs=boot_chip.cs, en=boot_chip.en, ld_pin=boot_chip.muxout)
+        boot_pll.enable()
+        with Step(boot_chip) as step:
+            locked = flashstore.restore(boot_pll, flashstore.load(path))
+        restored = boot_chip.image(range(1, 110)) == chip.image(range(1, 110))
+        rows.append(("flashstore restore, 500 us reset", step, locked and restored))
+        # Ports without binascii.crc32 checksum the blob with the bitwise fallback
+        with Step(boot_chip) as step, open(path, "rb") as f:
+            raw = f.read()
+        rows.append(("flashstore bitwise CRC32", step, flashstore._crc32(raw) == binascii.crc32(raw)
+                     and flashstore._crc32(raw[40:], flashstore._crc32(raw[:40])) == binascii.crc32(raw)))
+
+        # Oversized bursts are refused before packing; only array('I') reaches the viper packer
+        with Step(chip) as step:
+            try:
+                pll.write_registers([0x7F0000] * 129)
+                refused = False
+            except ValueError:
+                refused = True
+        routed = (lmx2572_fast.is_word_array(array('I', [0])) and not lmx2572_fast.is_word_array(array('H', [0]))
+                  and not lmx2572_fast.is_word_array(array('L', [0])) and not lmx2572_fast.is_word_array([0]))
+        rows.append(("write_registers, 129 words", step, refused and routed and step.writes == 0))
+
+        # Lock polled over SPI: the readback switches must not restart FCAL
+        spi_chip = LMX2572Sim(clock)
+        spi_pll = LMX2572(spi=spi_chip.spi, cs=spi_chip.cs, en=spi_chip.en)
+        spi_pll.enable()
+        with Step(spi_chip) as step:
+            locked = spi_pll.setup(freq=5.8e9)
+        rows.append(("setup without ld_pin", step, locked and spi_chip.locked))
+
+        if chip.bus.orphan_frames or spi_chip.bus.orphan_frames or boot_chip.bus.orphan_frames:
+            rows.append(("frames without CS", step, False))
+        return rows, images
+    finally:
+        clock.uninstall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="rewrite the golden images")
+    args = parser.parse_args()
+
+    rows, images = run()
+    failed = 0
+    print("{:<32s} {:>7s} {:>6s} {:>10s}  ok".format("call", "writes", "reads", "sim us"))
+    for name, step, ok in rows:
+        print("{:<32s} {:>7d} {:>6d} {:>10.1f}  {}".format(name, step.writes, step.reads, step.us, "yes" if ok else "NO"))
+        failed += not ok
+
+    hex_images = {name: ["0x{:06X}".format(word) for word in image] for name, image in images.items()}
+    if args.update:
+        os.makedirs(os.path.dirname(GOLDEN), exist_ok=True)
+        with open(GOLDEN, "w") as f:
+            json.dump(hex_images, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print("wrote {}".format(GOLDEN))
+    else:
+        with open(GOLDEN) as f:
+            golden = json.load(f)
+        for name in sorted(hex_images):
+            expected = golden.get(name)
+            if expected is None:
+                print("{}: no golden image".format(name))
+                failed += 1
+                continue
+            diffs = [(want, got) for want, got in zip(expected, hex_images[name]) if want != got]
+            if diffs:
+                failed += 1
+                print("{}: {} registers differ".format(name, len(diffs)))
+                for want, got in diffs[:8]:
+                    print("    golden {}  now {}".format(want, got))
+
+    if failed:
+        print("FAILED: {} check(s)".format(failed))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
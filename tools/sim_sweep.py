@@ -0,0 +1,106 @@
+"""
+Host run of the firmware/sweep.py scheduler on the LMX2572 simulator
+
+Sweeps a compiled FreqPlan with Sweep.simulate() on a FakeClock and
+checks the tick log and jitter statistics, that each tick leaves the
+chip on its plan entry, that a finite sweep stops after its loops, and
+how start() programs the Timer for millisecond and sub-millisecond
+dwells:
+
+    python tools/sim_sweep.py     # exits 1 on any failed check
+"""
+
+import sys
+
+import hostshim
+from machine import Timer
+from lmxsim import LMX2572Sim, SimClock
+from lmx2572 import LMX2572
+from sweep import FakeClock, Sweep
+
+FREQS = (5.70e9, 5.72e9, 5.74e9, 5.76e9, 5.78e9)
+
+
+def run():
+    """Run the sweep scenario; returns [(name, ok)]"""
+    clock = SimClock().install()
+    try:
+        chip = LMX2572Sim(clock)
+        pll = LMX2572(spi=chip.spi, cs=chip.cs, en=chip.en, ld_pin=chip.muxout)
+        pll.enable()
+        pll.setup(freq=FREQS[0])
+        plan = pll.compile_freq_plan(FREQS)
+        rows = []
+
+        # Every tick retunes the chip to its entry
+        fake = FakeClock()
+        sweep = Sweep(pll, plan, 500, clock=fake)
+        tuned = []
+        set_plan_entry = pll.set_plan_entry
+
+        def traced(plan, index):
+            status = set_plan_entry(plan, index)
+            tuned.append(abs(chip.vco_freq() - FREQS[index]) < 1)
+            return status
+
+        pll.set_plan_entry = traced
+        sweep.simulate(2 * len(FREQS))
+        del pll.set_plan_entry
+        stats = sweep.jitter()
+        rows.append(("ticks tune plan entries", len(tuned) == 2 * len(FREQS) and all(tuned)))
+        rows.append(("steady dwell", stats['ticks'] == 2 * len(FREQS) - 1 and stats['mean_us'] == 500
+                     and stats['jitter_us'] == 0 and fake.now == (2 * len(FREQS) - 1) * 500))
+
+        # Latency injected every third tick shows up as peak jitter
+        sweep = Sweep(pll, plan, 500, clock=FakeClock(), log_size=8)
+        sweep.simulate(20, jitter=lambda k: 40 if k % 3 == 0 else 0)
+        stats = sweep.jitter()
+        rows.append(("injected jitter, log wraps", stats['ticks'] == 7 and stats['max_us'] == 540
+                     and stats['min_us'] == 500 and stats['jitter_us'] == 40))
+
+        sweep = Sweep(pll, plan, 1000, clock=FakeClock(), loops=2)
+        sweep.simulate(100)
+        rows.append(("loops=2 stops", not sweep.running and sweep.ticks == 2 * len(FREQS)
+                     and sweep.index == 0))
+
+        # start() paces whole milliseconds by period and shorter dwells by frequency
+        timer = Timer(0)
+        sweep = Sweep(pll, plan, 2000, timer=timer)
+        sweep.start()
+        by_period = timer.period == 2 and timer.freq is None
+        timer.fire()
+        sweep.stop()
+        rows.append(("timer, 2 ms dwell", by_period and sweep.ticks == 2 and timer.callback is None))
+
+        sweep = Sweep(pll, plan, 250, timer=timer)
+        sweep.start()
+        rows.append(("timer, 250 us dwell", timer.freq == 4000))
+        sweep.stop()
+
+        try:
+            Sweep(pll, plan, 300, timer=timer)
+            rows.append(("300 us dwell rejected", False))
+        except ValueError:
+            rows.append(("300 us dwell rejected", True))
+
+        if chip.bus.orphan_frames:
+            rows.append(("frames without CS", False))
+        return rows
+    finally:
+        clock.uninstall()
+
+
+def main():
+    rows = run()
+    failed = 0
+    for name, ok in rows:
+        print("{:<28s} {}".format(name, "ok" if ok else "FAILED"))
+        failed += not ok
+    if failed:
+        print("FAILED: {} check(s)".format(failed))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
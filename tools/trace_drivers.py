@@ -0,0 +1,49 @@
+"""
+Bus cost of the main driver calls, traced with firmware/bustrace.py
+
+Runs LMX2572 and Si570 against the hostshim mock buses wrapped in
+TracedSPI/TracedI2C and prints transactions, bytes and time per call:
+
+    python tools/trace_drivers.py [runs]
+
+The mock LMX2572 never reports lock, so setup() and trigger_calibration()
+include their lock wait timeouts.
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+
+import hostshim
+from bustrace import BusTracer, TracedI2C, TracedSPI
+from lmx2572 import LMX2572
+from si570 import Si570
+
+
+def main(runs):
+    tracer = BusTracer(bus_time=True)
+
+    pll = LMX2572(spi=TracedSPI(hostshim.MockSPI(), tracer), cs=hostshim.MockPin(), en=hostshim.MockPin())
+    tracer.instrument(pll, ("enable", "setup", "set_freq", "trigger_calibration", "dump_registers", "verify_registers", "read_register"), "lmx.")
+
+    i2c = hostshim.MockI2C()
+    i2c.writeto_mem(0x55, 7, b'\xe2\xc2\xbc\x01\x1e\xb8')
+    si = Si570(TracedI2C(i2c, tracer), 0x55)
+    tracer.instrument(si, ("read_startup_configuration", "set_freq"), "si570.")
+
+    si.read_startup_configuration()
+    pll.enable()
+    pll.setup(freq=5.8e9, lock_timeout_ms=1)
+    with redirect_stdout(io.StringIO()):
+        pll.dump_registers()
+    pll.verify_registers()
+    for i in range(runs):
+        pll.set_freq(5.7e9 + 1e6 * i)
+        si.set_freq(100e6 + 1e3 * (i & 1) + 1e6 * (i & 2))
+    pll.trigger_calibration(timeout_ms=5)
+
+    tracer.report()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)